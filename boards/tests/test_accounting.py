@@ -0,0 +1,61 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import boto3
+from botocore.stub import Stubber
+from kanban_backend.boards import accounting
+
+class TestDynamoDBAccounting(unittest.TestCase):
+    def setUp(self):
+        self.client = boto3.client(
+            'dynamodb', region_name='us-west-2', aws_access_key_id='local', aws_secret_access_key='local'
+        )
+        accounting.install(self.client)
+        accounting.install(self.client)
+        self.stubber = Stubber(self.client)
+        self.stubber.activate()
+        # Parámetros finales (el Stubber los valida antes de que se añada ReturnConsumedCapacity)
+        self.sent = []
+        self.client.meta.events.register_last(
+            'before-parameter-build.dynamodb', lambda params, **kwargs: self.sent.append(dict(params))
+        )
+
+    def tearDown(self):
+        self.stubber.deactivate()
+
+    def test_calls_are_aggregated_per_request(self):
+        """Test that tracked calls ask for capacity and are summed by operation and index"""
+        self.stubber.add_response(
+            'query',
+            {'Items': [], 'Count': 3, 'ConsumedCapacity': {'TableName': 'kanban', 'CapacityUnits': 0.5}}
+        )
+        self.stubber.add_response(
+            'batch_write_item',
+            {'UnprocessedItems': {'kanban': [{'DeleteRequest': {'Key': {'id': {'S': 'b'}}}}]},
+             'ConsumedCapacity': [{'TableName': 'kanban', 'CapacityUnits': 1.0}]}
+        )
+        with accounting.track() as calls:
+            self.client.query(
+                TableName='kanban', IndexName='ColumnIdIndex', KeyConditionExpression='column_id = :c',
+                ExpressionAttributeValues={':c': {'S': 'c1'}}
+            )
+            # Las llamadas de los hilos del pool cuentan con propagate
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                executor.submit(accounting.propagate(self.client.batch_write_item), RequestItems={'kanban': [
+                    {'DeleteRequest': {'Key': {'id': {'S': 'a'}}}},
+                    {'DeleteRequest': {'Key': {'id': {'S': 'b'}}}},
+                ]}).result()
+        summary = calls.summary(detail=True)
+        self.assertEqual([params['ReturnConsumedCapacity'] for params in self.sent], ['INDEXES', 'INDEXES'])
+        self.assertEqual(summary['calls'], 2)
+        self.assertEqual(summary['by_index']['ColumnIdIndex']['items'], 3)
+        self.assertEqual(summary['by_operation']['Query']['read_capacity'], 0.5)
+        self.assertEqual(summary['by_operation']['BatchWriteItem']['write_capacity'], 1.0)
+        self.assertEqual(summary['by_operation']['BatchWriteItem']['items'], 1)
+        self.assertEqual([call['operation'] for call in summary['call_log']], ['Query', 'BatchWriteItem'])
+
+    def test_untracked_calls_are_left_alone(self):
+        """Test that without an active log no capacity is requested and nothing is recorded"""
+        self.stubber.add_response('get_item', {})
+        self.client.get_item(TableName='kanban', Key={'id': {'S': 'x'}})
+        self.assertIsNone(accounting.current())
+        self.assertNotIn('ReturnConsumedCapacity', self.sent[0])
@@ -0,0 +1,109 @@
+import unittest
+from unittest import mock
+from django.test import override_settings
+from kanban_backend.boards.cache import BoardCache, check_board_cache, get_board_trees
+from kanban_backend.boards.shared_cache import SharedBoardCache
+
+def make_tree(column_id, card_id):
+    return {'columns': [{'id': column_id}], 'cards': {column_id: [{'id': card_id}]}}
+
+class TestBoardCache(unittest.TestCase):
+    def test_lru_eviction_and_ttl(self):
+        """Test that the least recently used board is evicted and entries expire"""
+        cache = BoardCache(max_entries=2, ttl=30, shared=None)
+        for board_id in ('b1', 'b2'):
+            cache.set(board_id, make_tree(f'{board_id}-col', f'{board_id}-card'), cache.generation)
+        self.assertIsNotNone(cache.get('b1'))
+        cache.set('b3', make_tree('b3-col', 'b3-card'), cache.generation)
+        self.assertIsNone(cache.get('b2'))
+        self.assertIsNotNone(cache.get('b1'))
+        with mock.patch('kanban_backend.boards.cache.time.monotonic', return_value=float('inf')):
+            self.assertIsNone(cache.get('b1'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual(cache.stats()['expirations'], 1)
+
+    def test_invalidation_by_card_and_stale_load(self):
+        """Test that a card id invalidates its board and a load started before a write is not stored"""
+        cache = BoardCache(max_entries=10, ttl=30, shared=None)
+        cache.set('b1', make_tree('col', 'card'), cache.generation)
+        cache.invalidate_card('card')
+        self.assertIsNone(cache.get('b1'))
+
+        generation = cache.generation
+        cache.invalidate_column('other')
+        cache.set('b1', make_tree('col', 'card'), generation)
+        self.assertIsNone(cache.get('b1'))
+
+    def test_get_board_trees_reads_through(self):
+        """Test that only missing boards are loaded from the adapter"""
+        cache = BoardCache(max_entries=10, ttl=30, shared=None)
+        db = mock.Mock()
+        db.get_board_trees.return_value = {
+            'b1': {'columns': [{'id': 'col'}], 'cards': {'col': [{'id': 'card'}]}}
+        }
+        first = get_board_trees(db, ['b1'], cache=cache)
+        second = get_board_trees(db, ['b1'], cache=cache)
+        self.assertEqual(first, second)
+        self.assertEqual(db.get_board_trees.call_count, 1)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_get_board_trees_projects_and_reuses_wider_entries(self):
+        """Test that a miss reads only the requested attributes and a narrower query reuses the entry"""
+        cache = BoardCache(max_entries=10, ttl=30, shared=None)
+        db = mock.Mock()
+        db.get_board_trees.return_value = {
+            'b1': {'columns': [{'id': 'col'}], 'cards': {'col': [{'id': 'card'}]}}
+        }
+        get_board_trees(db, ['b1'], cache=cache, column_fields={'id', 'name'}, card_fields={'id', 'title'})
+        db.get_board_trees.assert_called_once_with(
+            ['b1'], column_fields={'id', 'name'}, card_fields={'id', 'title'}
+        )
+        get_board_trees(db, ['b1'], cache=cache, column_fields={'id'}, card_fields={'id', 'title'})
+        self.assertEqual(db.get_board_trees.call_count, 1)
+        get_board_trees(db, ['b1'], cache=cache, column_fields={'id'}, card_fields={'id', 'description'})
+        self.assertEqual(db.get_board_trees.call_count, 2)
+
+class TestSharedBoardCache(unittest.TestCase):
+    def setUp(self):
+        from django.core.cache.backends.locmem import LocMemCache
+        self.backend = LocMemCache('test-boards', {})
+        self.backend.clear()
+        self.db = mock.Mock()
+        self.db.get_board_trees.return_value = {
+            'b1': {'columns': [{'id': 'col'}], 'cards': {'col': [{'id': 'card'}]}}
+        }
+
+    def make_worker(self, fresh_ttl=30):
+        shared = SharedBoardCache(self.backend, fresh_ttl=fresh_ttl, stale_ttl=300)
+        return BoardCache(max_entries=10, ttl=30, shared=shared)
+
+    def test_write_in_one_worker_invalidates_the_other(self):
+        """Test that a version bump from another worker discards the local copy"""
+        worker_a, worker_b = self.make_worker(), self.make_worker()
+        get_board_trees(self.db, ['b1'], cache=worker_a)
+        get_board_trees(self.db, ['b1'], cache=worker_b)
+        self.assertEqual(self.db.get_board_trees.call_count, 1)
+
+        worker_b.invalidate_card('card')
+        get_board_trees(self.db, ['b1'], cache=worker_a)
+        self.assertEqual(self.db.get_board_trees.call_count, 2)
+
+    def test_stale_entry_is_served_while_one_refresh_runs(self):
+        """Test that an expired shared entry is returned and refreshed only once"""
+        worker = self.make_worker(fresh_ttl=0)
+        get_board_trees(self.db, ['b1'], cache=worker)
+        with mock.patch.object(SharedBoardCache, '_get_executor') as get_executor:
+            for _ in range(3):
+                other = self.make_worker(fresh_ttl=0)
+                trees = get_board_trees(self.db, ['b1'], cache=other)
+                self.assertEqual(trees['b1']['columns'], [{'id': 'col'}])
+        self.assertEqual(self.db.get_board_trees.call_count, 1)
+        self.assertEqual(get_executor.return_value.submit.call_count, 1)
+
+class TestBoardCacheChecks(unittest.TestCase):
+    def test_local_tier_without_shared_tier_warns(self):
+        """Test that an in-process cache without a shared tier is flagged, and off by default is not"""
+        with override_settings(BOARD_SHARED_CACHE_ALIAS='', BOARD_CACHE_TTL=30):
+            self.assertEqual([warning.id for warning in check_board_cache()], ['boards.W002'])
+        with override_settings(BOARD_SHARED_CACHE_ALIAS='', BOARD_CACHE_TTL=0):
+            self.assertEqual(check_board_cache(), [])
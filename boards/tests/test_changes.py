@@ -0,0 +1,28 @@
+import time
+import unittest
+from kanban_backend.boards.changes import CHANGE_SHARDS, change_attributes, tombstone_item
+from kanban_backend.boards.layout import without_layout_keys
+
+class TestChangeTracking(unittest.TestCase):
+    def test_change_bucket_is_day_and_stable_shard(self):
+        """Test that an item always lands in the same shard of the day it was written"""
+        first = change_attributes('k1', '2026-10-18T09:12:44.123456')
+        second = change_attributes('k1', '2026-10-18T23:59:59')
+        day, shard = first['change_bucket'].split('#')
+        self.assertEqual(day, '2026-10-18')
+        self.assertIn(int(shard), range(CHANGE_SHARDS))
+        self.assertEqual(first['change_bucket'], second['change_bucket'])
+        self.assertEqual(first['changed_at'], '2026-10-18T09:12:44.123456')
+
+    def test_tombstone_is_tracked_and_expires(self):
+        """Test that a tombstone points at the deleted item and carries its own change keys"""
+        tombstone = tombstone_item({'id': 'k1', 'type': 'card'}, ttl_days=1, timestamp='2026-10-18T10:00:00')
+        self.assertEqual(tombstone['id'], 'tombstone#k1')
+        self.assertEqual((tombstone['item_id'], tombstone['item_type']), ('k1', 'card'))
+        self.assertTrue(tombstone['change_bucket'].startswith('2026-10-18#'))
+        self.assertAlmostEqual(tombstone['expires_at'], time.time() + 86400, delta=60)
+
+    def test_change_keys_are_not_part_of_the_model(self):
+        """Test that the change-tracking attributes are stripped like the layout keys"""
+        item = {'id': 'k1', 'title': 'x', **change_attributes('k1')}
+        self.assertEqual(without_layout_keys(item), {'id': 'k1', 'title': 'x'})
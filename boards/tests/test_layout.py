@@ -0,0 +1,27 @@
+import unittest
+from kanban_backend.boards.layout import assemble_board, layout_keys
+
+class TestBoardLayout(unittest.TestCase):
+    def test_layout_keys_group_cards_under_their_column(self):
+        """Test that every item of a board shares the partition and cards sort after their column"""
+        board = layout_keys({'id': 'b1', 'type': 'board'}, 'b1')
+        column = layout_keys({'id': 'c1', 'type': 'column', 'board_id': 'b1'}, 'b1')
+        card = layout_keys({'id': 'k1', 'type': 'card', 'column_id': 'c1'}, 'b1')
+        self.assertEqual({board['pk'], column['pk'], card['pk']}, {'BOARD#b1'})
+        self.assertTrue(card['sk'].startswith(column['sk'] + '#'))
+
+    def test_assemble_board_orders_by_rank(self):
+        """Test that the partition items are rebuilt into an ordered tree"""
+        items = [
+            {'id': 'b1', 'type': 'board', 'name': 'A'},
+            {'id': 'c2', 'type': 'column', 'rank': 'a1'},
+            {'id': 'c1', 'type': 'column', 'rank': 'a0'},
+            {'id': 'k2', 'type': 'card', 'column_id': 'c1', 'rank': 'a1'},
+            {'id': 'k1', 'type': 'card', 'column_id': 'c1', 'rank': 'a0'},
+            {'id': 'k3', 'type': 'card', 'column_id': 'gone', 'rank': 'a0'},
+        ]
+        tree = assemble_board(items)
+        self.assertEqual(tree['board']['name'], 'A')
+        self.assertEqual([column['id'] for column in tree['columns']], ['c1', 'c2'])
+        self.assertEqual([card['id'] for card in tree['cards']['c1']], ['k1', 'k2'])
+        self.assertEqual(tree['cards']['c2'], [])
@@ -0,0 +1,26 @@
+import asyncio
+import unittest
+from kanban_backend.boards.loaders import AsyncBatchLoader
+
+async def run_inline(fn, *args):
+    return fn(*args)
+
+class TestAsyncBatchLoader(unittest.TestCase):
+    def test_concurrent_loads_share_one_batch(self):
+        """Test that sibling loads awaited together are fetched in a single batch"""
+        batches = []
+
+        def batch_fn(keys):
+            batches.append(list(keys))
+            return {key: [key.upper()] for key in keys}
+
+        async def main():
+            loader = AsyncBatchLoader(batch_fn, run_inline)
+            first = await asyncio.gather(*(loader.load(key) for key in ['a', 'b', 'c', 'a']))
+            second = await loader.load('b')
+            return first, second
+
+        first, second = asyncio.run(main())
+        self.assertEqual(first, [['A'], ['B'], ['C'], ['A']])
+        self.assertEqual(second, ['B'])
+        self.assertEqual(batches, [['a', 'b', 'c']])
@@ -0,0 +1,64 @@
+import random
+import unittest
+from kanban_backend.boards.memory import InMemoryBoardRepository
+from kanban_backend.boards.seeding import card_items
+
+class TestInMemoryRepository(unittest.TestCase):
+    def setUp(self):
+        self.db = InMemoryBoardRepository()
+        self.board_id = self.db.create_board("Test Board")
+        self.column_id, self.other_id = [column['id'] for column in self.db.get_columns(self.board_id)[:2]]
+
+    def test_cards_keep_rank_order_and_pages(self):
+        """Test that inserts and moves are reflected in both the list and the rank pages"""
+        first = self.db.create_card(self.column_id, "A")
+        last = self.db.create_card(self.column_id, "C")
+        middle = self.db.create_card(self.column_id, "B", order=1)
+        self.db.move_card(first, self.column_id, 2)
+        expected = [middle, last, first]
+        self.assertEqual([card['id'] for card in self.db.get_cards(self.column_id)], expected)
+        page, more = self.db.get_cards_page(self.column_id, 2)
+        self.assertTrue(more)
+        rest, more = self.db.get_cards_page(self.column_id, 2, after=page[-1])
+        self.assertFalse(more)
+        self.assertEqual([card['id'] for card in page + rest], expected)
+
+    def test_duplicate_title_follows_the_card(self):
+        """Test that a title is only taken while a card with it stays in the column"""
+        card_id = self.db.create_card(self.column_id, "Tarea")
+        with self.assertRaises(Exception):
+            self.db.create_card(self.column_id, "Tarea")
+        self.db.move_card(card_id, self.other_id, 0)
+        self.assertTrue(self.db.create_card(self.column_id, "Tarea"))
+
+    def test_title_reservations_are_released(self):
+        """Test that deleting, renaming, moving and deleting the column drop the old reservations"""
+        renamed = self.db.create_card(self.column_id, "A")
+        moved = self.db.create_card(self.column_id, "B")
+        deleted = self.db.create_card(self.other_id, "C")
+        self.db.update_card(renamed, "A2")
+        self.db.move_card(moved, self.other_id, 0)
+        self.db.delete_card(deleted)
+        self.assertEqual(
+            set(self.db._title_owners),
+            {(self.column_id, "A2"), (self.other_id, "B")}
+        )
+        self.db.delete_column(self.column_id)
+        self.assertEqual(set(self.db._title_owners), {(self.other_id, "A2"), (self.other_id, "B")})
+
+    def test_delete_column_appends_cards_to_first_remaining(self):
+        """Test that deleting a column moves its cards to the end of the first other column"""
+        existing = self.db.create_card(self.other_id, "X")
+        moved = self.db.create_card(self.column_id, "Y")
+        self.db.delete_column(self.column_id)
+        self.assertIsNone(self.db.get_column(self.column_id))
+        self.assertEqual([card['id'] for card in self.db.get_cards(self.other_id)], [existing, moved])
+        self.assertEqual(self.db.get_card(moved)['order'], 1)
+
+    def test_load_items_keeps_ranks_and_titles(self):
+        """Test that loaded cards are listed by their rank and reserve their titles"""
+        cards = card_items(random.Random(1), self.column_id, 3)
+        self.assertEqual(self.db.load_items(cards), 3)
+        self.assertEqual([card['id'] for card in self.db.get_cards(self.column_id)], [card['id'] for card in cards])
+        with self.assertRaises(Exception):
+            self.db.create_card(self.column_id, cards[0]['title'])
@@ -1,28 +1,35 @@
 import unittest
+from unittest import mock
+import django
+django.setup()
 from graphene.test import Client
+from kanban_backend.boards.memory import InMemoryBoardRepository
 from kanban_backend.schema import schema
-from boards.dynamodb import DynamoDBAdapter
 
 class TestMutations(unittest.TestCase):
     def setUp(self):
         self.client = Client(schema)
-        self.db = DynamoDBAdapter()
+        self.db = InMemoryBoardRepository()
+        self.patcher = mock.patch('kanban_backend.schema.db', self.db)
+        self.patcher.start()
         self.board_id = self.db.create_board("Test Board")
         self.column_id = self.db.create_column(self.board_id, "Test Column", 1)
         self.card_id = self.db.create_card(self.column_id, "Test Card", "Test Description", 1)
 
     def test_create_board(self):
         """Test that a board can be created"""
-        executed = self.client.execute('''
-            mutation {
-                createBoard(name: "New Board") {
-                    board {
-                        id
-                        name
+        # Con un tablero ya creado, createBoard devuelve ese mismo tablero
+        with mock.patch('kanban_backend.schema.db', InMemoryBoardRepository()):
+            executed = self.client.execute('''
+                mutation {
+                    createBoard(name: "New Board", type: "board") {
+                        board {
+                            id
+                            name
+                        }
                     }
                 }
-            }
-        ''')
+            ''')
         assert executed['data']['createBoard']['board']['name'] == "New Board"
 
     def test_create_column(self):
@@ -64,7 +71,7 @@ class TestMutations(unittest.TestCase):
         new_column_id = self.db.create_column(self.board_id, "New Column", 2)
         executed = self.client.execute('''
             mutation {
-                moveCard(id: "%s", columnId: "%s", order: 1) {
+                moveCard(cardId: "%s", columnId: "%s", cardOrder: 1) {
                     success
                 }
             }
@@ -75,7 +82,7 @@ class TestMutations(unittest.TestCase):
         """Test that a column can be moved to a different position"""
         executed = self.client.execute('''
             mutation {
-                moveColumn(id: "%s", order: 2) {
+                moveColumn(columnId: "%s", order: 2) {
                     success
                 }
             }
@@ -84,7 +91,4 @@ class TestMutations(unittest.TestCase):
 
     def tearDown(self):
         """Clean up after each test"""
-        try:
-            self.db.delete_board(self.board_id)
-        except Exception:
-            pass  # El board ya pudo haber sido eliminado por un test 
\ No newline at end of file
+        self.patcher.stop() 
\ No newline at end of file
@@ -0,0 +1,70 @@
+from unittest import mock
+import django
+django.setup()
+from django.core.management import call_command
+from django.db import connections
+from django.db.utils import ConnectionHandler
+from django.test import TestCase
+from kanban_backend.boards.orm import DjangoBoardRepository
+
+# SQLite en memoria (compartida entre conexiones del proceso), sea cual sea
+# BOARD_STORAGE_BACKEND: los tests no escriben en kanban.sqlite3
+TEST_DATABASES = ConnectionHandler({
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': 'file:boards_orm_tests?mode=memory&cache=shared',
+    }
+})
+
+class TestDjangoRepository(TestCase):
+    databases = {'default'}
+
+    @classmethod
+    def setUpClass(cls):
+        settings = mock.patch.dict(connections.settings, {'default': TEST_DATABASES.settings['default']})
+        settings.start()
+        cls.addClassCleanup(settings.stop)
+        original = connections['default']
+        connections['default'] = TEST_DATABASES['default']
+        cls.addClassCleanup(connections.__setitem__, 'default', original)
+        cls.addClassCleanup(TEST_DATABASES['default'].close)
+        call_command('migrate', 'boards', verbosity=0)
+        # Cada test se deshace al terminar (TestCase)
+        super().setUpClass()
+
+    def setUp(self):
+        self.db = DjangoBoardRepository()
+        self.board_id = self.db.create_board("Test Board")
+        self.column_id, self.other_id = [column['id'] for column in self.db.get_columns(self.board_id)[:2]]
+
+    def test_cards_keep_rank_order_and_pages(self):
+        """Test that inserts and moves are reflected in both the list and the rank pages"""
+        # Sin descripción (createCard sin ese argumento): la columna es NOT NULL
+        first = self.db.create_card(self.column_id, "A", None)
+        self.assertEqual(self.db.get_card(first)['description'], '')
+        last = self.db.create_card(self.column_id, "C")
+        middle = self.db.create_card(self.column_id, "B", order=1)
+        self.db.move_card(first, self.column_id, 2)
+        expected = [middle, last, first]
+        self.assertEqual([card['id'] for card in self.db.get_cards(self.column_id)], expected)
+        page, more = self.db.get_cards_page(self.column_id, 2)
+        self.assertTrue(more)
+        rest, more = self.db.get_cards_page(self.column_id, 2, after=page[-1])
+        self.assertFalse(more)
+        self.assertEqual([card['id'] for card in page + rest], expected)
+
+    def test_board_tree_matches_lists(self):
+        """Test that a board tree holds the same ordered columns and cards as the single-list reads"""
+        self.db.create_card(self.other_id, "X")
+        self.db.create_card(self.other_id, "Y", order=0)
+        tree = self.db.get_board_trees([self.board_id])[self.board_id]
+        self.assertEqual(tree['columns'], self.db.get_columns(self.board_id))
+        self.assertEqual(tree['cards'][self.other_id], self.db.get_cards(self.other_id))
+
+    def test_delete_column_appends_cards_to_first_remaining(self):
+        """Test that deleting a column moves its cards to the end of the first other column"""
+        existing = self.db.create_card(self.other_id, "X")
+        moved = self.db.create_card(self.column_id, "Y")
+        self.db.delete_column(self.column_id)
+        self.assertIsNone(self.db.get_column(self.column_id))
+        self.assertEqual([card['id'] for card in self.db.get_cards(self.other_id)], [existing, moved])
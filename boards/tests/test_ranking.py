@@ -0,0 +1,59 @@
+import random
+import unittest
+from kanban_backend.boards.ranking import (
+    MAX_RANK_LENGTH,
+    initial_ranks,
+    needs_rebalance,
+    rank_between,
+    ranks_before,
+    sort_by_rank,
+)
+
+class TestRanking(unittest.TestCase):
+    def test_initial_ranks_are_sorted_and_unique(self):
+        """Test that consecutive ranks keep their order across integer lengths"""
+        ranks = initial_ranks(5000)
+        self.assertEqual(ranks, sorted(ranks))
+        self.assertEqual(len(set(ranks)), len(ranks))
+
+    def test_rank_between_random_inserts(self):
+        """Test that inserting at random positions always yields a rank between the neighbours"""
+        rng = random.Random(42)
+        ranks = []
+        for _ in range(2000):
+            position = rng.randint(0, len(ranks))
+            before = ranks[position - 1] if position > 0 else None
+            after = ranks[position] if position < len(ranks) else None
+            rank = rank_between(before, after)
+            if before is not None:
+                self.assertLess(before, rank)
+            if after is not None:
+                self.assertLess(rank, after)
+            ranks.insert(position, rank)
+        self.assertTrue(max(len(rank) for rank in ranks) < MAX_RANK_LENGTH)
+
+    def test_rank_between_rejects_duplicates(self):
+        """Test that equal neighbours are reported so the list can be rebalanced"""
+        with self.assertRaises(ValueError):
+            rank_between('a1', 'a1')
+
+    def test_sort_by_rank_sets_positions(self):
+        """Test that items are sorted by rank, legacy items last, with order set to the position"""
+        items = sort_by_rank([
+            {'id': 'legacy', 'order': 0},
+            {'id': 'second', 'rank': 'a1'},
+            {'id': 'first', 'rank': 'a0'},
+        ])
+        self.assertEqual([item['id'] for item in items], ['first', 'second', 'legacy'])
+        self.assertEqual([item['order'] for item in items], [0, 1, 2])
+        self.assertTrue(needs_rebalance(items))
+
+    def test_ranks_before_keep_partial_rebalances_ordered(self):
+        """Test that a rebalance written only up to any prefix leaves the list in the same order"""
+        current = sorted(rank_between('a0', 'a1') + str(index).zfill(3) for index in range(1, 251))
+        ranks = ranks_before(current[0], len(current))
+        self.assertEqual(ranks, sorted(set(ranks)))
+        self.assertTrue(max(len(rank) for rank in ranks) < MAX_RANK_LENGTH)
+        for written in (1, 99, 199, 250):
+            mixed = ranks[:written] + current[written:]
+            self.assertEqual(mixed, sorted(mixed))
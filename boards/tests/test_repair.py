@@ -0,0 +1,68 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from kanban_backend.boards.repair import Checkpoint, detect_issues
+
+class TestRepairDetection(unittest.TestCase):
+    def test_consistent_list_has_no_issues(self):
+        """Test that ranks and orders that agree are left alone"""
+        items = [
+            {'id': 'a', 'rank': 'a0', 'order': 0},
+            {'id': 'b', 'rank': 'a1', 'order': 1},
+        ]
+        issues, ordered = detect_issues(items)
+        self.assertEqual(issues, set())
+        self.assertEqual([item['id'] for item in ordered], ['a', 'b'])
+
+    def test_detects_rank_problems(self):
+        """Test that missing, duplicate and overlong ranks are reported"""
+        self.assertEqual(
+            detect_issues([{'id': 'a', 'rank': 'a0', 'order': 0}, {'id': 'b', 'order': 1}])[0],
+            {'missing_rank'}
+        )
+        self.assertEqual(
+            detect_issues([{'id': 'a', 'rank': 'a0', 'order': 0}, {'id': 'b', 'rank': 'a0', 'order': 1}])[0],
+            {'duplicate_rank'}
+        )
+        self.assertEqual(
+            detect_issues([{'id': 'a', 'rank': 'a0' + 'V' * 80, 'order': 0}])[0],
+            {'long_rank'}
+        )
+
+    def test_stale_stored_orders_are_not_issues(self):
+        """Test that null, duplicate or gapped stored orders left by single-item moves are ignored"""
+        issues, ordered = detect_issues([
+            {'id': 'a', 'rank': 'a0', 'order': 3},
+            {'id': 'b', 'rank': 'a1', 'order': 3},
+            {'id': 'c', 'rank': 'a2', 'order': None},
+        ])
+        self.assertEqual(issues, set())
+        self.assertEqual([item['order'] for item in ordered], [0, 1, 2])
+
+class TestRepairCheckpoint(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'repair_checkpoint.json')
+
+    def test_resume_skips_checked_parents(self):
+        """Test that a resumed checkpoint keeps the found and checked lists out of the JSON state"""
+        checkpoint = Checkpoint(self.path, segments=2)
+        checkpoint.scan_page(0, [{'id': 'b1', 'type': 'board'}, {'id': 'c1', 'type': 'column'}], {'id': 'c1'})
+        checkpoint.scan_page(1, [{'id': 'c2', 'type': 'column'}], None)
+        checkpoint.parent_done('b1', set())
+        checkpoint.parent_done('c1', {'duplicate_rank'})
+        checkpoint.close()
+        with open(self.path) as f:
+            self.assertEqual(set(json.load(f)), {'segments', 'scan', 'started_at', 'completed'})
+
+        resumed = Checkpoint.load(self.path, segments=2)
+        self.assertEqual(resumed.segment(0), {'last_key': {'id': 'c1'}, 'done': False})
+        self.assertTrue(resumed.segment(1)['done'])
+        self.assertEqual(resumed.pending_parents(), [('column', 'c2')])
+        self.assertEqual((resumed.checked, resumed.issues['duplicate_rank']), (2, 1))
+        resumed.parent_done('c2', set())
+        resumed.close()
+        self.assertEqual(Checkpoint.load(self.path, segments=2).pending_parents(), [])
@@ -0,0 +1,57 @@
+import gzip
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from restore_dynamodb import BatchWriter, Checkpoint, restore_file
+
+class FlakyClient:
+    """Cliente falso que registra las peticiones y falla al llegar a los borrados"""
+
+    def __init__(self, fail_on_delete=False):
+        self.fail_on_delete = fail_on_delete
+        self.puts = []
+        self.deletes = []
+
+    def batch_write_item(self, RequestItems, **kwargs):
+        (requests,) = RequestItems.values()
+        if 'DeleteRequest' in requests[0]:
+            if self.fail_on_delete:
+                raise RuntimeError('caída simulada')
+            self.deletes.extend(request['DeleteRequest']['Key']['id']['S'] for request in requests)
+        else:
+            self.puts.extend(request['PutRequest']['Item']['id']['S'] for request in requests)
+        return {}
+
+class TestRestoreResume(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.backup_file = os.path.join(directory, 'dynamodb_backup_incremental.ndjson.gz')
+        with gzip.open(self.backup_file, 'wt', encoding='utf-8') as f:
+            for index in range(30):
+                f.write(json.dumps({'Item': {'id': {'S': f'item{index}'}, 'type': {'S': 'card'}}}) + '\n')
+            for index in range(5):
+                f.write(json.dumps({'Key': {'id': {'S': f'deleted{index}'}}}) + '\n')
+
+    def test_resume_applies_deletes_after_partial_put_batch(self):
+        """Test that a crash during the deletes of an incremental does not skip them on resume"""
+        checkpoint = Checkpoint(None, self.backup_file)
+        crashed = FlakyClient(fail_on_delete=True)
+        with self.assertRaises(RuntimeError):
+            restore_file(BatchWriter(crashed, workers=1), self.backup_file, 0,
+                         lambda done: checkpoint.update(done=done))
+        self.assertEqual(len(crashed.puts), 30)
+        # El último lote de escrituras es parcial: el checkpoint no puede pasar de 30
+        self.assertEqual(checkpoint.state['done'], 30)
+
+        resumed = FlakyClient()
+        counts, deleted = restore_file(BatchWriter(resumed, workers=1), self.backup_file, checkpoint.state['done'])
+        self.assertEqual(resumed.puts, [])
+        self.assertEqual(resumed.deletes, [f'deleted{index}' for index in range(5)])
+        self.assertEqual((sum(counts.values()), deleted), (30, 5))
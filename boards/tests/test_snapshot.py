@@ -0,0 +1,39 @@
+import unittest
+from decimal import Decimal
+from kanban_backend.boards.snapshot import apply_changes, decode_tree, encode_tree
+
+class TestBoardSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tree = {
+            'board': {'id': 'b1', 'type': 'board', 'version': Decimal(3)},
+            'columns': [
+                {'id': 'c1', 'type': 'column', 'rank': 'a0', 'pk': 'BOARD#b1'},
+                {'id': 'c2', 'type': 'column', 'rank': 'a1'},
+            ],
+            'cards': {
+                'c1': [
+                    {'id': 'k1', 'type': 'card', 'column_id': 'c1', 'rank': 'a0'},
+                    {'id': 'k2', 'type': 'card', 'column_id': 'c1', 'rank': 'a1'},
+                ],
+                'c2': [],
+            },
+        }
+
+    def test_encode_round_trip(self):
+        """Test that the compressed snapshot keeps the tree and drops index keys"""
+        tree = decode_tree(encode_tree(self.tree))
+        self.assertEqual(tree['board']['version'], 3)
+        self.assertNotIn('pk', tree['columns'][0])
+        self.assertEqual([card['id'] for card in tree['cards']['c1']], ['k1', 'k2'])
+
+    def test_apply_changes_moves_and_removes(self):
+        """Test that a moved card leaves its old column and a deleted column disappears"""
+        moved = {'id': 'k1', 'type': 'card', 'column_id': 'c2', 'rank': 'a0'}
+        tree = apply_changes(self.tree, upserts=[moved])
+        self.assertEqual([card['id'] for card in tree['cards']['c1']], ['k2'])
+        self.assertEqual([card['id'] for card in tree['cards']['c2']], ['k1'])
+        self.assertEqual(tree['cards']['c1'][0]['order'], 0)
+
+        tree = apply_changes(tree, removals=['c1'])
+        self.assertEqual([column['id'] for column in tree['columns']], ['c2'])
+        self.assertNotIn('c1', tree['cards'])
@@ -145,8 +145,8 @@ export const UPDATE_CARD = gql`
 `;
 
 export const FIX_CARD_ORDERS = gql`
-  mutation FixCardOrders {
-    fixCardOrders {
+  mutation FixCardOrders($boardId: ID!) {
+    fixCardOrders(boardId: $boardId) {
       success
       error
       __typename
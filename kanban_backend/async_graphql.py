@@ -0,0 +1,123 @@
+"""
+Endpoint GraphQL asíncrono para servir desde ASGI.
+
+Los resolvers de primer nivel (queries y mutations) se ejecutan en el pool
+acotado del AsyncDynamoDBAdapter y los anidados usan cargadores asíncronos, de
+modo que las columnas y tarjetas de todos los tableros se resuelven a la vez y
+un proceso puede atender cientos de cargas de tablero sin un hilo por petición.
+"""
+import inspect
+import json
+import logging
+import time
+
+from django.http import HttpResponseNotAllowed, JsonResponse
+from django.views import View
+from graphql import OperationType, get_operation_ast, parse
+
+from kanban_backend.boards import accounting
+from kanban_backend.boards.async_dynamodb import AsyncDynamoDBAdapter
+from kanban_backend.boards.loaders import CONTEXT_ATTRIBUTE, AsyncBoardLoaders
+from .schema import db, schema
+
+logger = logging.getLogger(__name__)
+
+async_db = AsyncDynamoDBAdapter(db)
+
+
+class ExecutorMiddleware:
+    """Ejecuta los resolvers de primer nivel (bloqueantes) fuera del event loop."""
+
+    def __init__(self, async_db):
+        self.async_db = async_db
+
+    def resolve(self, next, root, info, **args):
+        if info.parent_type not in (info.schema.query_type, info.schema.mutation_type):
+            return next(root, info, **args)
+        return self._resolve_in_executor(next, root, info, args)
+
+    async def _resolve_in_executor(self, next, root, info, args):
+        result = await self.async_db.run(next, root, info, **args)
+        # Un resolver puede devolver el awaitable de un cargador asíncrono
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+
+class AsyncGraphQLView(View):
+    schema = schema
+
+    async def get(self, request, *args, **kwargs):
+        return await self.execute(request, request.GET.dict(), allow_mutations=False)
+
+    async def post(self, request, *args, **kwargs):
+        try:
+            params = self.parse_body(request)
+        except ValueError as e:
+            return JsonResponse({'errors': [{'message': str(e)}]}, status=400)
+        return await self.execute(request, params, allow_mutations=True)
+
+    def parse_body(self, request):
+        content_type = request.content_type
+        if content_type == 'application/graphql':
+            return {'query': request.body.decode('utf-8')}
+        if content_type == 'application/json':
+            try:
+                params = json.loads(request.body.decode('utf-8'))
+            except json.JSONDecodeError:
+                raise ValueError('El body no es un JSON válido')
+            if not isinstance(params, dict):
+                raise ValueError('Las peticiones por lotes no están soportadas')
+            return params
+        return request.POST.dict()
+
+    async def execute(self, request, params, allow_mutations):
+        query = params.get('query')
+        if not query:
+            return JsonResponse({'errors': [{'message': 'Falta la query'}]}, status=400)
+        variables = params.get('variables') or None
+        if isinstance(variables, str):
+            try:
+                variables = json.loads(variables)
+            except json.JSONDecodeError:
+                return JsonResponse({'errors': [{'message': 'Variables inválidas'}]}, status=400)
+        operation_name = params.get('operationName') or None
+
+        if not allow_mutations:
+            try:
+                operation = get_operation_ast(parse(query), operation_name)
+            except Exception:
+                operation = None
+            if operation is not None and operation.operation != OperationType.QUERY:
+                return HttpResponseNotAllowed(
+                    ['POST'], 'Solo se pueden ejecutar queries con GET'
+                )
+
+        # Cargadores por petición cuyos lotes se ejecutan en el pool asíncrono
+        setattr(request, CONTEXT_ATTRIBUTE, AsyncBoardLoaders(async_db))
+        started = time.monotonic()
+        with accounting.track() as calls:
+            result = await self.schema.execute_async(
+                query,
+                variable_values=variables,
+                operation_name=operation_name,
+                context_value=request,
+                middleware=[ExecutorMiddleware(async_db)],
+            )
+        elapsed = (time.monotonic() - started) * 1000
+        logger.info(
+            f"GraphQL asíncrono {operation_name or 'anónima'} en {elapsed:.1f} ms "
+            f"({len(result.errors or [])} errores)"
+        )
+
+        response = {}
+        if result.errors:
+            for error in result.errors:
+                logger.error(f"Error en solicitud GraphQL: {error.message}")
+            response['errors'] = [error.formatted for error in result.errors]
+        if result.data is not None or not result.errors:
+            response['data'] = result.data
+        if accounting.wants_extensions(request):
+            response['extensions'] = {'dynamodb': calls.summary(detail=True)}
+        accounting.log_request(request, calls, operation_name)
+        return JsonResponse(response, status=200 if result.data is not None else 400)
@@ -0,0 +1,252 @@
+"""
+Contabilidad de las llamadas a DynamoDB por petición.
+
+Los manejadores de eventos de botocore instalados en el cliente compartido
+(ver connection.py) anotan cada llamada (operación, índice, items,
+latencia, capacidad de lectura y escritura consumida, reintentos) en el
+registro activo del contexto, un ``contextvars``. Mientras hay un registro
+activo se pide ``ReturnConsumedCapacity=INDEXES``; sin él los manejadores
+no hacen nada.
+
+Las vistas GraphQL abren un registro por petición con ``track``. Si la
+petición trae la cabecera DYNAMODB_ACCOUNTING_HEADER el resumen se devuelve
+en ``extensions.dynamodb`` de la respuesta; si no, se escribe en una línea
+de log JSON. Las funciones que se ejecutan en los pools de hilos del
+adaptador heredan el registro con ``propagate``.
+"""
+import contextvars
+import functools
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar('dynamodb_calls', default=None)
+
+READ_OPERATIONS = {'GetItem', 'BatchGetItem', 'Query', 'Scan', 'TransactGetItems'}
+WRITE_OPERATIONS = {'PutItem', 'UpdateItem', 'DeleteItem', 'BatchWriteItem', 'TransactWriteItems'}
+
+# Detalle por llamada en extensions; por encima solo se devuelven los agregados
+MAX_DETAILED_CALLS = 200
+
+# Clave del contexto de botocore donde viaja la llamada entre eventos
+CONTEXT_KEY = 'kanban_dynamodb_call'
+
+
+class CallLog:
+    """Llamadas a DynamoDB de una petición, seguro entre hilos."""
+
+    def __init__(self):
+        self.calls = []
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, call):
+        with self._lock:
+            self.calls.append(call)
+
+    def summary(self, detail=False):
+        """
+        Totales, y agregados por operación y por índice (``table`` si la
+        llamada no usa ninguno). ``latency_ms`` suma las latencias: con
+        llamadas en paralelo supera al tiempo de la petición.
+        """
+        with self._lock:
+            calls = list(self.calls)
+        totals = _empty_totals()
+        by_operation = {}
+        by_index = {}
+        for call in calls:
+            for group in (
+                totals,
+                by_operation.setdefault(call['operation'], _empty_totals()),
+                by_index.setdefault(call['index'] or 'table', _empty_totals()),
+            ):
+                group['calls'] += 1
+                group['items'] += call['items']
+                group['latency_ms'] += call['latency_ms']
+                group['read_capacity'] += call['read_capacity']
+                group['write_capacity'] += call['write_capacity']
+                group['retries'] += call['retries']
+                group['errors'] += 1 if call['error'] else 0
+        summary = {
+            **_rounded(totals),
+            'elapsed_ms': round((time.perf_counter() - self.started) * 1000, 3),
+            'by_operation': {name: _rounded(group) for name, group in sorted(by_operation.items())},
+            'by_index': {name: _rounded(group) for name, group in sorted(by_index.items())},
+        }
+        if detail:
+            summary['call_log'] = calls[:MAX_DETAILED_CALLS]
+            summary['truncated'] = len(calls) > MAX_DETAILED_CALLS
+        return summary
+
+
+def _empty_totals():
+    return {
+        'calls': 0, 'items': 0, 'latency_ms': 0.0, 'read_capacity': 0.0,
+        'write_capacity': 0.0, 'retries': 0, 'errors': 0,
+    }
+
+
+def _rounded(group):
+    return {name: round(value, 3) if isinstance(value, float) else value for name, value in group.items()}
+
+
+@contextmanager
+def track():
+    """Registra las llamadas a DynamoDB hechas dentro del bloque (y de ``propagate``)."""
+    log = CallLog()
+    token = _current.set(log)
+    try:
+        yield log
+    finally:
+        _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+def propagate(fn):
+    """``fn`` con el registro activo, para ejecutarla en otro hilo."""
+    log = _current.get()
+    if log is None:
+        return fn
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        token = _current.set(log)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    return run
+
+
+# Eventos de botocore
+
+def _requested_items(operation, params):
+    if operation == 'BatchWriteItem':
+        return sum(len(requests) for requests in params.get('RequestItems', {}).values())
+    if operation == 'BatchGetItem':
+        return sum(len(request.get('Keys', [])) for request in params.get('RequestItems', {}).values())
+    if operation in ('TransactWriteItems', 'TransactGetItems'):
+        return len(params.get('TransactItems', []))
+    return 1
+
+
+def _returned_items(operation, parsed, requested):
+    if operation in ('Query', 'Scan'):
+        return parsed.get('Count', 0)
+    if operation == 'GetItem':
+        return 1 if 'Item' in parsed else 0
+    if operation == 'BatchGetItem':
+        return sum(len(items) for items in parsed.get('Responses', {}).values())
+    if operation == 'TransactGetItems':
+        return len(parsed.get('Responses', []))
+    if operation == 'BatchWriteItem':
+        unprocessed = sum(len(requests) for requests in parsed.get('UnprocessedItems', {}).values())
+        return requested - unprocessed
+    return requested
+
+
+def _capacity(operation, parsed):
+    """(lectura, escritura) consumidas según ConsumedCapacity."""
+    consumed = parsed.get('ConsumedCapacity') or []
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    read = write = 0.0
+    for entry in consumed:
+        if 'ReadCapacityUnits' in entry or 'WriteCapacityUnits' in entry:
+            read += entry.get('ReadCapacityUnits', 0)
+            write += entry.get('WriteCapacityUnits', 0)
+        elif operation in READ_OPERATIONS:
+            read += entry.get('CapacityUnits', 0)
+        else:
+            write += entry.get('CapacityUnits', 0)
+    return read, write
+
+
+def _before_call(params, model, context, **kwargs):
+    log = _current.get()
+    if log is None:
+        return
+    operation = model.name
+    if operation in READ_OPERATIONS or operation in WRITE_OPERATIONS:
+        params.setdefault('ReturnConsumedCapacity', 'INDEXES')
+    table = params.get('TableName') or ','.join(sorted(params.get('RequestItems', {})))
+    context[CONTEXT_KEY] = (log, time.perf_counter(), {
+        'operation': operation,
+        'table': table or None,
+        'index': params.get('IndexName'),
+        'items': _requested_items(operation, params),
+    })
+
+
+def _record(context, parsed=None, error=None):
+    entry = context.pop(CONTEXT_KEY, None)
+    if entry is None:
+        return
+    log, started, call = entry
+    parsed = parsed or {}
+    read, write = _capacity(call['operation'], parsed)
+    if parsed.get('Error'):
+        error = parsed['Error'].get('Code') or 'Error'
+    call.update(
+        items=0 if error else _returned_items(call['operation'], parsed, call['items']),
+        latency_ms=round((time.perf_counter() - started) * 1000, 3),
+        read_capacity=read,
+        write_capacity=write,
+        retries=parsed.get('ResponseMetadata', {}).get('RetryAttempts', 0),
+        error=error,
+    )
+    log.add(call)
+
+
+def _after_call(parsed, context, **kwargs):
+    _record(context, parsed=parsed)
+
+
+def _after_call_error(exception, context, **kwargs):
+    _record(context, error=type(exception).__name__)
+
+
+def install(client):
+    """Instala los manejadores en ``client``; instalarlos otra vez no los duplica."""
+    events = client.meta.events
+    events.register('before-parameter-build.dynamodb', _before_call, unique_id='kanban-accounting-before')
+    events.register('after-call.dynamodb', _after_call, unique_id='kanban-accounting-after')
+    events.register('after-call-error.dynamodb', _after_call_error, unique_id='kanban-accounting-error')
+
+
+# Vistas GraphQL
+
+def wants_extensions(request):
+    """Si la petición pide el detalle en la respuesta (cabecera DYNAMODB_ACCOUNTING_HEADER)."""
+    from kanban_backend.boards.connection import dynamodb_setting
+    header = dynamodb_setting('DYNAMODB_ACCOUNTING_HEADER')
+    return bool(header) and bool(request.headers.get(header))
+
+
+def extend_response(request, response):
+    """Añade ``extensions.dynamodb`` a la respuesta GraphQL si la petición lo pide."""
+    log = _current.get()
+    if log is not None and wants_extensions(request):
+        response.setdefault('extensions', {})['dynamodb'] = log.summary(detail=True)
+    return response
+
+
+def log_request(request, log, operation_name=None):
+    """Línea de log JSON con el resumen, salvo si ya va en la respuesta."""
+    if wants_extensions(request) or not logger.isEnabledFor(logging.INFO):
+        return
+    logger.info(json.dumps({
+        'event': 'dynamodb_calls',
+        'path': request.path,
+        'operation': operation_name,
+        **log.summary(),
+    }, separators=(',', ':')))
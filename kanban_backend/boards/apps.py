@@ -2,4 +2,17 @@ from django.apps import AppConfig
 
 class BoardsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'boards' 
\ No newline at end of file
+    name = 'kanban_backend.boards'
+    label = 'boards'
+
+    def ready(self):
+        # El almacenamiento 'orm' usa SQLite en modo WAL (ver orm.py)
+        from django.db.backends.signals import connection_created
+        from kanban_backend.boards.orm import configure_sqlite
+        connection_created.connect(configure_sqlite)
+
+        # Avisa si la caché de tableros puede servir datos desactualizados
+        # entre workers
+        from django.core import checks
+        from kanban_backend.boards.cache import check_board_cache
+        checks.register(check_board_cache, checks.Tags.caches)
@@ -0,0 +1,65 @@
+"""
+Variante asíncrona del adaptador de DynamoDB.
+
+boto3 no tiene cliente asíncrono, así que cada llamada se ejecuta en un pool de
+hilos acotado mientras el event loop sigue atendiendo otras peticiones. El
+tamaño del pool limita las llamadas a DynamoDB en vuelo, no el número de
+cargas de tablero concurrentes: las que esperan turno son corrutinas, no hilos.
+"""
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from kanban_backend.boards.accounting import propagate
+from kanban_backend.boards.connection import dynamodb_setting
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDynamoDBAdapter:
+    """
+    Envuelve un DynamoDBAdapter: ``await async_db.get_boards()`` ejecuta
+    ``db.get_boards()`` en el pool y devuelve su resultado.
+    """
+
+    def __init__(self, adapter, max_workers=None):
+        self.adapter = adapter
+        self.max_workers = max_workers or int(dynamodb_setting('DYNAMODB_ASYNC_WORKERS'))
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix='dynamodb-async'
+                    )
+        return self._executor
+
+    async def run(self, fn, *args, **kwargs):
+        """Ejecuta una función bloqueante en el pool sin bloquear el event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(propagate(fn), *args, **kwargs)
+        )
+
+    def __getattr__(self, name):
+        attribute = getattr(self.adapter, name)
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+
+        async def call(*args, **kwargs):
+            return await self.run(attribute, *args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
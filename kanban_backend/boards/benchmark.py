@@ -0,0 +1,452 @@
+"""
+Benchmark de las rutas calientes del schema GraphQL por tamaño de tablero.
+
+Para cada tamaño se prepara un almacenamiento vacío (una tabla temporal en
+DynamoDB, un InMemoryBoardRepository o una transacción del ORM que se deshace
+al terminar), se siembra un tablero sintético con ``load_items`` y se
+ejecutan los mismos documentos que el frontend (frontend/src/graphql/
+queries.js) a través de ``kanban_backend.schema.schema``. El informe JSON
+incluye por operación:
+
+- percentiles de latencia en milisegundos;
+- llamadas a la API de DynamoDB, contadas con los eventos de botocore;
+- pico de memoria de Python (tracemalloc) en una ejecución aparte, para no
+  penalizar las latencias medidas.
+
+La caché de tableros se desactiva salvo con ``cache=True``: así se mide el
+almacenamiento y no la caché. ``compare_reports`` contrasta dos informes
+para detectar regresiones entre versiones.
+"""
+import logging
+import platform
+import random
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+from kanban_backend import schema as schema_module
+from kanban_backend.boards.cache import DEFAULT_TTL, board_cache
+from kanban_backend.boards.seeding import card_items, description
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Documentos del frontend (frontend/src/graphql/queries.js)
+GET_BOARD = '''
+query GetBoard {
+  boards {
+    id type name
+    columns {
+      id type name order
+      cards { id type title description order columnId }
+    }
+  }
+}
+'''
+CREATE_CARD = '''
+mutation CreateCard($columnId: ID!, $title: String!, $description: String, $order: Int) {
+  createCard(columnId: $columnId, title: $title, description: $description, order: $order) {
+    card { id type title description order columnId }
+  }
+}
+'''
+MOVE_CARD = '''
+mutation MoveCard($cardId: String!, $columnId: String!, $cardOrder: Int!) {
+  moveCard(cardId: $cardId, columnId: $columnId, cardOrder: $cardOrder) { success message }
+}
+'''
+MOVE_COLUMN = '''
+mutation MoveColumn($columnId: ID!, $order: Int!) {
+  moveColumn(columnId: $columnId, order: $order) { success error }
+}
+'''
+DELETE_COLUMN = '''
+mutation DeleteColumn($columnId: String!) {
+  deleteColumn(columnId: $columnId) { success error columnId }
+}
+'''
+FIX_CARD_ORDERS = '''
+mutation FixCardOrders($boardId: ID!) {
+  fixCardOrders(boardId: $boardId) { success error }
+}
+'''
+
+BACKENDS = ('memory', 'dynamodb', 'orm')
+SCENARIOS = ('get_board', 'create_card', 'move_card', 'move_column', 'delete_column', 'fix_card_orders')
+# Recorren o reescriben listas completas: menos iteraciones y sin calentamiento
+HEAVY_SCENARIOS = {'delete_column', 'fix_card_orders'}
+DEFAULT_SIZES = (10, 100, 1000, 10000, 50000)
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(values, p):
+    """Percentil ``p`` (rango más cercano) de ``values`` ya ordenados."""
+    if not values:
+        return None
+    index = max(0, min(len(values) - 1, round(p / 100 * len(values) + 0.5) - 1))
+    return values[index]
+
+
+def summarize(latencies):
+    values = sorted(latencies)
+    if not values:
+        return {}
+    summary = {'min': values[0], 'mean': sum(values) / len(values), 'max': values[-1]}
+    summary.update({f'p{p}': percentile(values, p) for p in PERCENTILES})
+    return {name: round(value, 3) for name, value in summary.items()}
+
+
+class DynamoDBCallCounter:
+    """Cuenta las llamadas a la API de DynamoDB de ``client`` por operación."""
+
+    def __init__(self, client):
+        self.client = client
+        self._lock = threading.Lock()
+        self._counts = Counter()
+
+    def __enter__(self):
+        self.client.meta.events.register('before-parameter-build.dynamodb', self._count)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.client.meta.events.unregister('before-parameter-build.dynamodb', self._count)
+
+    def _count(self, model, **kwargs):
+        with self._lock:
+            self._counts[model.name] += 1
+
+    def take(self):
+        """Devuelve las llamadas contadas desde la anterior y reinicia la cuenta."""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        return counts
+
+
+class _NoCounter:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def take(self):
+        return None
+
+
+class BoardBenchmark:
+    """
+    Ejecuta SCENARIOS sobre un tablero de cada tamaño de ``sizes`` (tarjetas
+    repartidas entre ``columns`` columnas) y devuelve el informe con run().
+    """
+
+    def __init__(self, backend='memory', sizes=DEFAULT_SIZES, columns=5, iterations=20,
+                 heavy_iterations=3, warmup=2, seed=42, scenarios=SCENARIOS, cache=False,
+                 trace_memory=True, keep_tables=False, progress=None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Almacenamiento inválido: {backend} (opciones: {', '.join(BACKENDS)})")
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise ValueError(f"Escenarios desconocidos: {', '.join(sorted(unknown))}")
+        self.backend = backend
+        self.sizes = [int(size) for size in sizes]
+        self.columns = max(2, int(columns))
+        self.iterations = max(1, int(iterations))
+        self.heavy_iterations = max(1, int(heavy_iterations))
+        self.warmup = max(0, int(warmup))
+        self.seed = seed
+        self.scenarios = [name for name in SCENARIOS if name in scenarios]
+        self.cache = cache
+        self.trace_memory = trace_memory
+        self.keep_tables = keep_tables
+        self.progress = progress or (lambda message: logger.info(message))
+
+    def run(self):
+        started_at = datetime.utcnow().isoformat()
+        results = []
+        with self._cache_mode():
+            for size in self.sizes:
+                self.progress(f"Tablero de {size} tarjetas ({self.backend})")
+                with self._fresh_store() as db:
+                    results.append(self._run_size(db, size))
+        return {
+            'benchmark': 'boards',
+            'started_at': started_at,
+            'finished_at': datetime.utcnow().isoformat(),
+            'backend': self.backend,
+            'environment': self._environment(),
+            'parameters': {
+                'sizes': self.sizes,
+                'columns': self.columns,
+                'iterations': self.iterations,
+                'heavy_iterations': self.heavy_iterations,
+                'warmup': self.warmup,
+                'seed': self.seed,
+                'cache': self.cache,
+            },
+            'results': results,
+            'max_rss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None,
+        }
+
+    def _environment(self):
+        environment = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        }
+        if self.backend == 'dynamodb':
+            from kanban_backend.boards.connection import dynamodb_setting
+            environment.update(
+                endpoint=dynamodb_setting('DYNAMODB_ENDPOINT_URL'),
+                layout=dynamodb_setting('DYNAMODB_BOARD_LAYOUT'),
+                snapshots=bool(dynamodb_setting('DYNAMODB_BOARD_SNAPSHOTS')),
+            )
+        elif self.backend == 'orm':
+            from django.db import connection
+            environment['database'] = connection.vendor
+        return environment
+
+    # Almacenamiento
+
+    @contextmanager
+    def _cache_mode(self):
+        # Sin caché las lecturas llegan siempre al almacenamiento. Con ella se
+        # activa aunque esté apagada por falta de nivel compartido: el
+        # benchmark es un único proceso.
+        ttl, shared = board_cache.ttl, board_cache._shared
+        if not self.cache:
+            board_cache.ttl, board_cache._shared = 0, None
+        elif not board_cache.ttl:
+            board_cache.ttl = DEFAULT_TTL
+        board_cache.clear()
+        try:
+            yield
+        finally:
+            board_cache.ttl, board_cache._shared = ttl, shared
+            board_cache.clear()
+
+    @contextmanager
+    def _fresh_store(self):
+        if self.backend == 'memory':
+            from kanban_backend.boards.memory import InMemoryBoardRepository
+            yield from self._serving(InMemoryBoardRepository())
+        elif self.backend == 'orm':
+            from django.db import connection, transaction
+            from kanban_backend.boards.models import Board
+            from kanban_backend.boards.orm import DjangoBoardRepository
+            if connection.vendor == 'dummy':
+                raise ValueError("El almacenamiento 'orm' necesita BOARD_STORAGE_BACKEND=orm (base de datos de Django)")
+            # Los datos existentes se borran dentro de la transacción y vuelven al deshacerla
+            with transaction.atomic():
+                Board.objects.all().delete()
+                yield from self._serving(DjangoBoardRepository())
+                transaction.set_rollback(True)
+        else:
+            from kanban_backend.boards.dynamodb import DynamoDBAdapter
+            from kanban_backend.boards.provisioning import ensure_table
+            db = DynamoDBAdapter()
+            db.table_name = f'{db.table_name}-bench-{uuid.uuid4().hex[:8]}'
+            client = db.dynamodb.meta.client
+            ensure_table(client, db.table_name)
+            try:
+                yield from self._serving(db)
+            finally:
+                if db._executor is not None:
+                    db._executor.shutdown(wait=False)
+                if not self.keep_tables:
+                    client.delete_table(TableName=db.table_name)
+
+    def _serving(self, db):
+        previous = schema_module.db
+        schema_module.db = db
+        try:
+            yield db
+        finally:
+            schema_module.db = previous
+            board_cache.clear()
+
+    # Tamaños y escenarios
+
+    def _run_size(self, db, size):
+        rng = random.Random(f'{self.seed}-{size}')
+        started = time.perf_counter()
+        state = self._seed(db, size, rng)
+        seed_seconds = time.perf_counter() - started
+        client = db.dynamodb.meta.client if self.backend == 'dynamodb' else None
+        scenarios = {}
+        with (DynamoDBCallCounter(client) if client else _NoCounter()) as counter:
+            for name in self.scenarios:
+                prepare, execute = getattr(self, f'_scenario_{name}')(db, state, rng)
+                heavy = name in HEAVY_SCENARIOS
+                scenarios[name] = self._measure(
+                    prepare, execute, counter,
+                    iterations=self.heavy_iterations if heavy else self.iterations,
+                    warmup=0 if heavy else self.warmup
+                )
+                self.progress(f"  {name}: p50={scenarios[name]['latency_ms'].get('p50')} ms")
+        return {
+            'cards': size,
+            'columns': self.columns,
+            'seed_seconds': round(seed_seconds, 3),
+            'scenarios': scenarios,
+        }
+
+    def _seed(self, db, size, rng):
+        board_id = db.create_board('Benchmark')
+        column_ids = [column['id'] for column in db.get_columns(board_id, fields={'id'})]
+        while len(column_ids) < self.columns:
+            column_ids.append(db.create_column(board_id, f'Columna {len(column_ids) + 1}'))
+        column_ids = column_ids[:self.columns]
+        cards = []
+        per_column, remainder = divmod(size, len(column_ids))
+        for index, column_id in enumerate(column_ids):
+            count = per_column + (1 if index < remainder else 0)
+            cards.extend(card_items(rng, column_id, count, first_number=len(cards)))
+        db.load_items(cards)
+        return {
+            'board_id': board_id,
+            'column_ids': column_ids,
+            'card_ids': [card['id'] for card in cards],
+            'per_column': max(1, per_column),
+            'next_title': len(cards),
+        }
+
+    def _measure(self, prepare, execute, counter, iterations, warmup):
+        latencies = []
+        errors = 0
+        calls = Counter()
+        counted = False
+        for attempt in range(warmup + iterations):
+            variables = prepare()
+            counter.take()
+            started = time.perf_counter()
+            ok = execute(variables)
+            elapsed = (time.perf_counter() - started) * 1000
+            used = counter.take()
+            if attempt < warmup:
+                continue
+            latencies.append(elapsed)
+            errors += 0 if ok else 1
+            if used is not None:
+                counted = True
+                calls.update(used)
+
+        result = {
+            'iterations': iterations,
+            'errors': errors,
+            'latency_ms': summarize(latencies),
+            'dynamodb_calls': {
+                'per_operation': round(sum(calls.values()) / iterations, 2),
+                'by_api': dict(sorted(calls.items())),
+            } if counted else None,
+            'memory_peak_kib': None,
+        }
+        if self.trace_memory:
+            variables = prepare()
+            tracemalloc.start()
+            try:
+                execute(variables)
+                result['memory_peak_kib'] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+            finally:
+                tracemalloc.stop()
+        return result
+
+    def _execute(self, document, field=None, variables=None):
+        # Contexto nuevo por operación, como una petición HTTP (cargadores propios)
+        result = schema_module.schema.execute(document, variable_values=variables, context_value={})
+        if result.errors:
+            logger.warning(f"Error en {field or 'la consulta'}: {result.errors[0]}")
+            return False
+        if field is None:
+            return True
+        payload = (result.data or {}).get(field)
+        return bool(payload) and payload.get('success') is not False and not payload.get('error')
+
+    def _scenario_get_board(self, db, state, rng):
+        return (lambda: None), (lambda variables: self._execute(GET_BOARD))
+
+    def _scenario_create_card(self, db, state, rng):
+        def prepare():
+            state['next_title'] += 1
+            return {
+                'columnId': rng.choice(state['column_ids']),
+                'title': f"Tarea {state['next_title']}",
+                'description': description(rng),
+                'order': rng.randint(0, state['per_column']),
+            }
+        return prepare, (lambda variables: self._execute(CREATE_CARD, 'createCard', variables))
+
+    def _scenario_move_card(self, db, state, rng):
+        def prepare():
+            return {
+                'cardId': rng.choice(state['card_ids']),
+                'columnId': rng.choice(state['column_ids']),
+                'cardOrder': rng.randint(0, state['per_column']),
+            }
+        return prepare, (lambda variables: self._execute(MOVE_CARD, 'moveCard', variables))
+
+    def _scenario_move_column(self, db, state, rng):
+        def prepare():
+            return {
+                'columnId': rng.choice(state['column_ids']),
+                'order': rng.randrange(len(state['column_ids'])),
+            }
+        return prepare, (lambda variables: self._execute(MOVE_COLUMN, 'moveColumn', variables))
+
+    def _scenario_delete_column(self, db, state, rng):
+        # Cada iteración borra una columna nueva con tantas tarjetas como las
+        # demás; sus tarjetas pasan a la primera columna del tablero
+        def prepare():
+            column_id = db.create_column(state['board_id'], f"Temporal {uuid.uuid4().hex[:6]}")
+            cards = card_items(rng, column_id, state['per_column'], first_number=state['next_title'] + 1)
+            state['next_title'] += len(cards)
+            db.load_items(cards)
+            state['card_ids'].extend(card['id'] for card in cards)
+            return {'columnId': column_id}
+        return prepare, (lambda variables: self._execute(DELETE_COLUMN, 'deleteColumn', variables))
+
+    def _scenario_fix_card_orders(self, db, state, rng):
+        return (
+            (lambda: {'boardId': state['board_id']}),
+            (lambda variables: self._execute(FIX_CARD_ORDERS, 'fixCardOrders', variables))
+        )
+
+
+def compare_reports(baseline, current, metric='p95', tolerance=0.2):
+    """
+    Regresiones de ``current`` frente a ``baseline``: escenarios cuyo
+    ``metric`` de latencia ha crecido más de ``tolerance`` (fracción), o que
+    hacen más llamadas a DynamoDB por operación. Devuelve una lista de dicts.
+    """
+    previous = {
+        (result['cards'], name): scenario
+        for result in baseline.get('results', [])
+        for name, scenario in result['scenarios'].items()
+    }
+    regressions = []
+    for result in current.get('results', []):
+        for name, scenario in result['scenarios'].items():
+            before = previous.get((result['cards'], name))
+            if not before:
+                continue
+            old = before['latency_ms'].get(metric)
+            new = scenario['latency_ms'].get(metric)
+            if old and new and new > old * (1 + tolerance):
+                regressions.append({
+                    'cards': result['cards'], 'scenario': name, 'metric': metric,
+                    'baseline': old, 'current': new,
+                })
+            old_calls = (before.get('dynamodb_calls') or {}).get('per_operation')
+            new_calls = (scenario.get('dynamodb_calls') or {}).get('per_operation')
+            if old_calls is not None and new_calls is not None and new_calls > old_calls:
+                regressions.append({
+                    'cards': result['cards'], 'scenario': name, 'metric': 'dynamodb_calls',
+                    'baseline': old_calls, 'current': new_calls,
+                })
+    return regressions
@@ -0,0 +1,381 @@
+"""
+Caché en proceso de tableros ya montados (columnas y tarjetas de cada board).
+
+El frontend vuelve a pedir el tablero completo tras cada mutación y casi
+siempre nada ha cambiado, así que el árbol se guarda con expulsión LRU y un
+TTL. Las mutaciones de ``schema.py`` invalidan solo el tablero afectado: un
+índice inverso traduce los ids de columnas y tarjetas al board que las
+contiene.
+
+Si hay una caché compartida configurada (``BOARD_SHARED_CACHE_ALIAS``), esta
+caché actúa como primer nivel: cada entrada recuerda la versión compartida con
+la que se montó y se descarta si otro worker la ha incrementado. Sin ella, las
+invalidaciones no salen del proceso y por defecto la caché está apagada
+(BOARD_CACHE_TTL=0; ver settings.py y la comprobación boards.W002).
+
+Las entradas guardan también su proyección (los atributos con que se leyeron
+los items, None si son completos): solo sirven a consultas que no piden más
+atributos, y en un fallo se lee de la base de datos solo lo que se pide.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from kanban_backend.boards.shared_cache import SharedBoardCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL = 30
+DEFAULT_STALE_TTL = 300
+
+_UNSET = object()
+
+
+def _setting(name, default):
+    try:
+        return getattr(settings, name, default)
+    except ImproperlyConfigured:
+        return default
+
+
+def build_shared_cache():
+    """Crea el nivel compartido a partir de los settings, o None si no hay."""
+    alias = _setting('BOARD_SHARED_CACHE_ALIAS', None)
+    if not alias:
+        return None
+    from django.core.cache import caches
+    return SharedBoardCache(
+        caches[alias],
+        fresh_ttl=_setting('BOARD_SHARED_CACHE_TTL', DEFAULT_TTL),
+        stale_ttl=_setting('BOARD_SHARED_CACHE_STALE_TTL', DEFAULT_STALE_TTL)
+    )
+
+
+def _projection(*field_sets):
+    """Proyección normalizada: una tupla de frozensets (None: item completo)."""
+    return tuple(None if fields is None else frozenset(fields) for fields in field_sets)
+
+
+def _covers(stored, requested):
+    """Si una entrada leída con ``stored`` sirve a una consulta de ``requested``."""
+    return all(
+        have is None or (want is not None and want <= have)
+        for have, want in zip(stored, requested)
+    )
+
+
+def check_board_cache(app_configs=None, **kwargs):
+    """
+    Comprobaciones de sistema de la caché de tableros. Un nivel compartido
+    en LocMemCache es local a cada proceso, así que ni comparte entradas ni
+    propaga las invalidaciones entre workers (W001). Sin nivel compartido,
+    el primer nivel de cada worker no se entera de las escrituras de los
+    demás y puede servir un tablero anterior durante BOARD_CACHE_TTL (W002).
+    """
+    from django.core.cache import caches
+    from django.core.cache.backends.locmem import LocMemCache
+    from django.core.checks import Warning
+
+    alias = _setting('BOARD_SHARED_CACHE_ALIAS', None)
+    if alias and isinstance(caches[alias], LocMemCache):
+        return [Warning(
+            f"La caché compartida de tableros ('{alias}') usa LocMemCache, que no se comparte entre procesos",
+            hint='Configura Redis o Memcached en BOARD_SHARED_CACHE_BACKEND, o deja BOARD_SHARED_CACHE_ALIAS vacío',
+            id='boards.W001',
+        )]
+    if not alias and float(_setting('BOARD_CACHE_TTL', 0)) > 0:
+        return [Warning(
+            "La caché de tableros en proceso está activa sin nivel compartido: con varios workers, "
+            "un tablero modificado en otro puede servirse desactualizado durante BOARD_CACHE_TTL",
+            hint='Configura BOARD_SHARED_CACHE_BACKEND, o BOARD_CACHE_TTL=0 si hay más de un worker',
+            id='boards.W002',
+        )]
+    return []
+
+
+class BoardCache:
+    """
+    Árboles ``{'columns': [...], 'cards': {column_id: [...]}}`` por board_id,
+    más la lista de boards. Los valores se comparten entre peticiones: quien
+    los lea no debe modificarlos.
+    """
+
+    def __init__(self, max_entries=None, ttl=None, shared=_UNSET):
+        self.max_entries = int(max_entries if max_entries is not None
+                               else _setting('BOARD_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+        self.ttl = float(ttl if ttl is not None else _setting('BOARD_CACHE_TTL', DEFAULT_TTL))
+        self._shared = shared
+        self._lock = threading.Lock()
+        self._trees = OrderedDict()
+        self._board_list = None
+        # id de columna o tarjeta -> board_id, para invalidar con precisión
+        self._owners = {}
+        # Se incrementa con cada invalidación; una carga que empezó antes no
+        # puede guardar su resultado (podría no incluir la escritura)
+        self._generation = 0
+        self._counters = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0,
+        }
+
+    @property
+    def enabled(self):
+        return self.ttl > 0 and self.max_entries > 0
+
+    @property
+    def generation(self):
+        return self._generation
+
+    @property
+    def shared(self):
+        """Nivel compartido (SharedBoardCache) o None; se crea en el primer uso."""
+        if self._shared is _UNSET:
+            self._shared = build_shared_cache()
+        return self._shared
+
+    def get(self, board_id, token=None, fields=(None, None)):
+        with self._lock:
+            entry = self._trees.get(board_id)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._drop(board_id)
+                self._counters['expirations'] += 1
+                entry = None
+            elif entry is not None and entry[2] != token:
+                # Otro worker ha modificado el tablero
+                self._drop(board_id)
+                self._counters['invalidations'] += 1
+                entry = None
+            elif entry is not None and not _covers(entry[3], fields):
+                # Leído con menos atributos de los que se piden: la nueva
+                # carga sustituirá la entrada
+                entry = None
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+            self._trees.move_to_end(board_id)
+            self._counters['hits'] += 1
+            return entry[1]
+
+    def set(self, board_id, tree, generation, token=None, fields=(None, None)):
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._drop(board_id)
+            self._trees[board_id] = (time.monotonic() + self.ttl, tree, token, fields)
+            for column in tree['columns']:
+                self._owners[column['id']] = board_id
+            for cards in tree['cards'].values():
+                for card in cards:
+                    self._owners[card['id']] = board_id
+            while len(self._trees) > self.max_entries:
+                oldest = next(iter(self._trees))
+                self._drop(oldest)
+                self._counters['evictions'] += 1
+
+    def get_board_list(self, token=None, fields=(None,)):
+        with self._lock:
+            entry = self._board_list
+            if (entry is not None and entry[0] > time.monotonic() and entry[2] == token
+                    and _covers(entry[3], fields)):
+                self._counters['hits'] += 1
+                return entry[1]
+            self._board_list = None
+            self._counters['misses'] += 1
+            return None
+
+    def set_board_list(self, boards, generation, token=None, fields=(None,)):
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation == self._generation:
+                self._board_list = (time.monotonic() + self.ttl, boards, token, fields)
+
+    def invalidate_board(self, board_id):
+        with self._lock:
+            self._generation += 1
+            if self._drop(board_id):
+                self._counters['invalidations'] += 1
+                logger.debug(f"Tablero {board_id} invalidado en caché")
+        if self.shared is not None:
+            self.shared.bump_board(board_id)
+
+    def invalidate_column(self, column_id):
+        """Invalida el tablero que contiene la columna."""
+        self._invalidate_owner(column_id)
+
+    def invalidate_card(self, card_id):
+        """Invalida el tablero que contiene la tarjeta."""
+        self._invalidate_owner(card_id)
+
+    def invalidate_board_list(self):
+        with self._lock:
+            self._generation += 1
+            self._board_list = None
+        if self.shared is not None:
+            self.shared.bump_board_list()
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._trees.clear()
+            self._owners.clear()
+            self._board_list = None
+        if self.shared is not None:
+            self.shared.bump_all()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['size'] = len(self._trees)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        if self.shared is not None:
+            stats['shared'] = self.shared.stats()
+        return stats
+
+    def _invalidate_owner(self, item_id):
+        with self._lock:
+            self._generation += 1
+            board_id = self._owners.get(item_id)
+            if board_id is not None and self._drop(board_id):
+                self._counters['invalidations'] += 1
+                logger.debug(f"Tablero {board_id} invalidado en caché por {item_id}")
+        if self.shared is None:
+            return
+        if board_id is None:
+            board_id = self.shared.owner(item_id)
+        if board_id is not None:
+            self.shared.bump_board(board_id)
+        else:
+            # Ningún worker sabe a qué tablero pertenece: invalidarlos todos
+            self.shared.bump_all()
+
+    def _drop(self, board_id):
+        # Llamar con el lock adquirido
+        entry = self._trees.pop(board_id, None)
+        if entry is None:
+            return False
+        tree = entry[1]
+        for column in tree['columns']:
+            if self._owners.get(column['id']) == board_id:
+                del self._owners[column['id']]
+        for cards in tree['cards'].values():
+            for card in cards:
+                if self._owners.get(card['id']) == board_id:
+                    del self._owners[card['id']]
+        return True
+
+
+board_cache = BoardCache()
+
+
+def get_boards(db, cache=board_cache, fields=None):
+    """
+    Lista de boards, desde la caché si está vigente y tiene los atributos
+    ``fields`` (None: todos); si no, se leen solo esos.
+    """
+    projection = _projection(fields)
+    generation = cache.generation
+    shared = cache.shared
+    if not cache.enabled and shared is None:
+        return db.get_boards(fields=fields)
+    token = shared.list_token() if shared is not None else None
+    boards = cache.get_board_list(token, projection)
+    if boards is not None:
+        return boards
+
+    if shared is not None:
+        boards = shared.get_board_list(
+            token,
+            refresh=lambda: _refresh_board_list(db, shared, fields),
+            fields=projection
+        )
+        if boards is not None:
+            cache.set_board_list(boards, generation, token, projection)
+            return boards
+
+    boards = db.get_boards(fields=fields)
+    cache.set_board_list(boards, generation, token, projection)
+    if shared is not None:
+        shared.set_board_list(boards, token, projection)
+    return boards
+
+
+def _refresh_board_list(db, shared, fields=None):
+    # La versión se lee antes de consultar DynamoDB
+    token = shared.list_token()
+    shared.set_board_list(db.get_boards(fields=fields), token, _projection(fields))
+
+
+def get_board_trees(db, board_ids, cache=board_cache, column_fields=None, card_fields=None):
+    """
+    Devuelve ``{board_id: árbol}``. Los tableros que no están en caché se
+    cargan juntos con ``db.get_board_trees``, leyendo solo los atributos
+    ``column_fields`` y ``card_fields`` (None: todos). Una entrada sirve si
+    se leyó con al menos esos atributos.
+    """
+    projection = _projection(column_fields, card_fields)
+    generation = cache.generation
+    shared = cache.shared
+    if not cache.enabled and shared is None:
+        return _load_trees(db, board_ids, column_fields, card_fields)
+    tokens = shared.tokens(board_ids) if shared is not None else {}
+    trees = {}
+    missing = []
+    for board_id in board_ids:
+        tree = cache.get(board_id, tokens.get(board_id), projection)
+        if tree is None:
+            missing.append(board_id)
+        else:
+            trees[board_id] = tree
+
+    if missing and shared is not None:
+        fresh, stale = shared.get_trees(
+            missing,
+            tokens,
+            refresh=lambda refresh_ids: _refresh_trees(db, refresh_ids, shared, column_fields, card_fields),
+            fields=projection
+        )
+        for board_id, tree in fresh.items():
+            cache.set(board_id, tree, generation, tokens[board_id], projection)
+        # Las entradas caducadas se sirven tal cual mientras se recargan,
+        # pero no pasan al primer nivel
+        trees.update(fresh)
+        trees.update(stale)
+        missing = [board_id for board_id in missing if board_id not in trees]
+
+    if not missing:
+        return trees
+
+    loaded = _load_trees(db, missing, column_fields, card_fields)
+    for board_id, tree in loaded.items():
+        cache.set(board_id, tree, generation, tokens.get(board_id), projection)
+    if shared is not None:
+        shared.set_trees(loaded, tokens, projection)
+    trees.update(loaded)
+    return trees
+
+
+def _refresh_trees(db, board_ids, shared, column_fields=None, card_fields=None):
+    # La versión se lee antes de consultar DynamoDB: si hay una escritura
+    # mientras tanto, el resultado queda bajo una clave que ya nadie lee
+    tokens = shared.tokens(board_ids)
+    shared.set_trees(
+        _load_trees(db, board_ids, column_fields, card_fields),
+        tokens,
+        _projection(column_fields, card_fields)
+    )
+
+
+def _load_trees(db, board_ids, column_fields=None, card_fields=None):
+    return db.get_board_trees(board_ids, column_fields=column_fields, card_fields=card_fields)
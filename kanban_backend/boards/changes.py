@@ -0,0 +1,61 @@
+"""
+Seguimiento de cambios para los backups incrementales.
+
+Cada escritura del adaptador marca el item con ``changed_at`` (instante de la
+escritura) y ``change_bucket`` (día + shard del id), que indexa ChangesIndex.
+``updated_at`` no basta: las reservas de título, los incrementos de versión y
+las migraciones no lo tocan. Un backup incremental consulta los buckets de los
+días desde el backup anterior en lugar de recorrer toda la tabla::
+
+    change_bucket = 2026-10-18#3    changed_at = 2026-10-18T09:12:44.123456
+
+El shard reparte las escrituras de un mismo día entre CHANGE_SHARDS
+particiones del índice. Los borrados no dejan item que indexar, así que cada
+uno escribe una lápida (``tombstone#<id>``) en la misma transacción; DynamoDB
+la elimina por TTL (``expires_at``) pasados DYNAMODB_TOMBSTONE_TTL_DAYS días.
+
+scripts/backup_dynamodb.py repite CHANGE_SHARDS y el formato del bucket: si
+cambian aquí hay que cambiarlos allí.
+"""
+import time
+import zlib
+from datetime import datetime
+
+CHANGES_INDEX = 'ChangesIndex'
+CHANGE_SHARDS = 8
+
+# Atributos de seguimiento: no forman parte del modelo que ve la API
+CHANGE_ATTRIBUTES = {'change_bucket', 'changed_at'}
+
+TOMBSTONE_TYPE = 'tombstone'
+TOMBSTONE_TTL_ATTRIBUTE = 'expires_at'
+
+
+def change_bucket(item_id, timestamp):
+    shard = zlib.crc32(item_id.encode('utf-8')) % CHANGE_SHARDS
+    return f'{timestamp[:10]}#{shard}'
+
+
+def change_attributes(item_id, timestamp=None):
+    """``{'change_bucket', 'changed_at'}`` para una escritura de ``item_id``."""
+    timestamp = timestamp or datetime.utcnow().isoformat()
+    return {'change_bucket': change_bucket(item_id, timestamp), 'changed_at': timestamp}
+
+
+def tombstone_id(item_id):
+    return f'tombstone#{item_id}'
+
+
+def tombstone_item(item, ttl_days, timestamp=None):
+    """Lápida que registra el borrado de ``item`` para el siguiente incremental."""
+    timestamp = timestamp or datetime.utcnow().isoformat()
+    tombstone = {
+        'id': tombstone_id(item['id']),
+        'type': TOMBSTONE_TYPE,
+        'item_id': item['id'],
+        'item_type': item.get('type'),
+        'deleted_at': timestamp,
+        TOMBSTONE_TTL_ATTRIBUTE: int(time.time() + ttl_days * 86400),
+    }
+    tombstone.update(change_attributes(tombstone['id'], timestamp))
+    return tombstone
@@ -0,0 +1,109 @@
+"""
+Conexión compartida con DynamoDB.
+
+Se crea un único recurso (y por tanto un único cliente con su pool de
+conexiones) por proceso, configurado a partir de los ajustes ``DYNAMODB_*`` de
+Django. Los clientes de botocore son seguros entre hilos, así que todos los
+hilos del worker comparten el mismo pool.
+"""
+import logging
+import os
+import threading
+
+import boto3
+from botocore.config import Config
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from kanban_backend.boards import accounting
+
+logger = logging.getLogger(__name__)
+
+# Valores por defecto cuando no hay settings de Django (scripts, tests)
+DEFAULTS = {
+    'DYNAMODB_TABLE_NAME': os.getenv('DYNAMODB_TABLE_NAME', 'kanban_board'),
+    'DYNAMODB_REGION': os.getenv('AWS_DEFAULT_REGION', 'us-west-2'),
+    'DYNAMODB_ENDPOINT_URL': os.getenv('DYNAMODB_ENDPOINT', 'http://localhost:8002'),
+    'DYNAMODB_ACCESS_KEY_ID': os.getenv('AWS_ACCESS_KEY_ID', 'local'),
+    'DYNAMODB_SECRET_ACCESS_KEY': os.getenv('AWS_SECRET_ACCESS_KEY', 'local'),
+    'DYNAMODB_MAX_POOL_CONNECTIONS': 50,
+    'DYNAMODB_CONNECT_TIMEOUT': 2,
+    'DYNAMODB_READ_TIMEOUT': 5,
+    'DYNAMODB_TCP_KEEPALIVE': True,
+    'DYNAMODB_RETRY_MODE': 'standard',
+    'DYNAMODB_MAX_ATTEMPTS': 5,
+    'DYNAMODB_MAX_PARALLEL_QUERIES': 10,
+    'DYNAMODB_CONFLICT_RETRIES': 3,
+    'DYNAMODB_ASYNC_WORKERS': 50,
+    'DYNAMODB_PAGE_SIZE': 1000,
+    'DYNAMODB_BOARD_LAYOUT': os.getenv('DYNAMODB_BOARD_LAYOUT', 'index'),
+    'DYNAMODB_BOARD_SNAPSHOTS': os.getenv('DYNAMODB_BOARD_SNAPSHOTS', 'False') == 'True',
+    'DYNAMODB_TOMBSTONE_TTL_DAYS': int(os.getenv('DYNAMODB_TOMBSTONE_TTL_DAYS', '35')),
+    'DYNAMODB_ACCOUNTING_HEADER': os.getenv('DYNAMODB_ACCOUNTING_HEADER', 'X-Debug-DynamoDB'),
+}
+
+_lock = threading.Lock()
+_resource = None
+
+
+def dynamodb_setting(name):
+    """Lee un ajuste DYNAMODB_* de Django, o su valor por defecto."""
+    try:
+        return getattr(settings, name, DEFAULTS[name])
+    except ImproperlyConfigured:
+        return DEFAULTS[name]
+
+
+def build_client_config():
+    retry_mode = dynamodb_setting('DYNAMODB_RETRY_MODE')
+    if retry_mode not in ('legacy', 'standard', 'adaptive'):
+        raise ImproperlyConfigured(f"DYNAMODB_RETRY_MODE inválido: {retry_mode}")
+    return Config(
+        max_pool_connections=int(dynamodb_setting('DYNAMODB_MAX_POOL_CONNECTIONS')),
+        connect_timeout=float(dynamodb_setting('DYNAMODB_CONNECT_TIMEOUT')),
+        read_timeout=float(dynamodb_setting('DYNAMODB_READ_TIMEOUT')),
+        tcp_keepalive=bool(dynamodb_setting('DYNAMODB_TCP_KEEPALIVE')),
+        retries={
+            'mode': retry_mode,
+            'total_max_attempts': int(dynamodb_setting('DYNAMODB_MAX_ATTEMPTS')),
+        },
+    )
+
+
+def get_dynamodb_resource():
+    """Devuelve el recurso de DynamoDB del proceso, creándolo la primera vez."""
+    global _resource
+    if _resource is None:
+        with _lock:
+            if _resource is None:
+                config = build_client_config()
+                # Sesión propia: la sesión por defecto de boto3 no es segura entre hilos
+                session = boto3.session.Session()
+                resource = session.resource(
+                    'dynamodb',
+                    endpoint_url=dynamodb_setting('DYNAMODB_ENDPOINT_URL'),
+                    region_name=dynamodb_setting('DYNAMODB_REGION'),
+                    aws_access_key_id=dynamodb_setting('DYNAMODB_ACCESS_KEY_ID'),
+                    aws_secret_access_key=dynamodb_setting('DYNAMODB_SECRET_ACCESS_KEY'),
+                    config=config
+                )
+                # Contabilidad por petición (kanban_backend.boards.accounting)
+                accounting.install(resource.meta.client)
+                _resource = resource
+                logger.info(
+                    f"Cliente de DynamoDB creado (pool={config.max_pool_connections}, "
+                    f"reintentos={config.retries['mode']})"
+                )
+    return _resource
+
+
+def reset_dynamodb_resource():
+    """Descarta el recurso compartido; el siguiente uso crea uno nuevo."""
+    global _resource
+    _resource = None
+
+
+# Los sockets del pool no deben compartirse entre procesos tras un fork
+# (p. ej. workers de gunicorn con preload)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset_dynamodb_resource)
@@ -1,160 +1,221 @@
-import boto3
-import os
+import hashlib
 import uuid
 from datetime import datetime
 import logging
+import random
 import time
-from typing import Optional, Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Optional, Dict, Iterable, List
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
+
+from kanban_backend.boards.accounting import propagate
+from kanban_backend.boards.changes import change_attributes, tombstone_item
+from kanban_backend.boards.connection import dynamodb_setting, get_dynamodb_resource
+from kanban_backend.boards.layout import (
+    ASSEMBLY_ATTRIBUTES,
+    BOARD_ITEMS_INDEX,
+    LAYOUTS,
+    assemble_board,
+    board_id_from_partition,
+    card_sort_key,
+    layout_keys,
+    partition_key,
+)
+from kanban_backend.boards.ranking import (
+    MAX_RANK_LENGTH,
+    clamp_position,
+    initial_ranks,
+    rank_at,
+    rank_between,
+    ranks_before,
+    sort_by_rank,
+)
+from kanban_backend.boards.repair import RepairEngine
+from kanban_backend.boards.repository import (
+    PROJECTION_REQUIRED,
+    BoardRepository,
+    ConcurrentModificationError,
+)
+from kanban_backend.boards.snapshot import (
+    SNAPSHOT_MAX_BYTES,
+    SNAPSHOT_TYPE,
+    apply_changes,
+    decode_tree,
+    encode_tree,
+    snapshot_id,
+)
 
 logger = logging.getLogger(__name__)
 
-class DynamoDBAdapter:
+# Límite de elementos por llamada a TransactWriteItems
+TRANSACTION_MAX_ITEMS = 100
+
+# Límite de claves por llamada a BatchGetItem
+BATCH_GET_MAX_KEYS = 100
+
+# Espera base (con jitter exponencial) entre reintentos por conflicto de versión
+CONFLICT_BACKOFF_SECONDS = 0.05
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def _is_conflict(error):
+    code = error.response.get('Error', {}).get('Code')
+    if code == 'ConditionalCheckFailedException':
+        return True
+    if code == 'TransactionCanceledException':
+        reasons = error.response.get('CancellationReasons') or []
+        return any(
+            reason.get('Code') in ('ConditionalCheckFailed', 'TransactionConflict')
+            for reason in reasons
+        )
+    return False
+
+
+def _deserialize_item(item):
+    return {key: _deserializer.deserialize(value) for key, value in item.items()}
+
+
+# Item que reserva un título dentro de una columna: comprobar si está libre es
+# un GetItem, sin leer las tarjetas de la columna
+TITLE_KEY_TYPE = 'card_title'
+
+
+def _title_key_id(column_id, title):
+    # Hash para acotar el tamaño de la clave con títulos largos
+    digest = hashlib.sha256(title.encode('utf-8')).hexdigest()
+    return f'title#{column_id}#{digest}'
+
+
+def _projection_arguments(fields, names):
+    """
+    Devuelve los argumentos de proyección para leer solo ``fields``, o un
+    diccionario vacío para leer el item completo. Todos los atributos van con
+    alias porque varios (type, order, name...) son palabras reservadas.
+    """
+    if not fields:
+        return {}
+    attributes = sorted(set(fields) | set(PROJECTION_REQUIRED))
+    placeholders = []
+    for index, attribute in enumerate(attributes):
+        placeholder = f'#p{index}'
+        names[placeholder] = attribute
+        placeholders.append(placeholder)
+    return {'ProjectionExpression': ', '.join(placeholders)}
+
+class DynamoDBAdapter(BoardRepository):
     def __init__(self):
-        self.table_name = os.getenv('DYNAMODB_TABLE_NAME', 'kanban_board')
-        self.endpoint_url = os.getenv('DYNAMODB_ENDPOINT', 'http://localhost:8002')
-        self.region = os.getenv('AWS_DEFAULT_REGION', 'us-west-2')
-        self.access_key = os.getenv('AWS_ACCESS_KEY_ID', 'local')
-        self.secret_key = os.getenv('AWS_SECRET_ACCESS_KEY', 'local')
+        self.table_name = dynamodb_setting('DYNAMODB_TABLE_NAME')
+        # Número máximo de queries concurrentes al cargar un nivel del árbol
+        # (no tiene sentido que supere el pool de conexiones)
+        self.max_parallel_queries = min(
+            int(dynamodb_setting('DYNAMODB_MAX_PARALLEL_QUERIES')),
+            int(dynamodb_setting('DYNAMODB_MAX_POOL_CONNECTIONS'))
+        )
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        # Reintentos automáticos ante conflictos de versión
+        self.max_conflict_retries = int(dynamodb_setting('DYNAMODB_CONFLICT_RETRIES'))
+        # Items por página en los Query (0: lo que quepa en 1 MB)
+        self.page_size = int(dynamodb_setting('DYNAMODB_PAGE_SIZE'))
+        # 'index': un Query por nivel (GSIs por board_id y column_id);
+        # 'partition': todo el tablero en un Query (ver layout.py)
+        self.layout = dynamodb_setting('DYNAMODB_BOARD_LAYOUT')
+        if self.layout not in LAYOUTS:
+            raise ValueError(f"DYNAMODB_BOARD_LAYOUT inválido: {self.layout}")
+        # Instantánea materializada por tablero (ver snapshot.py)
+        self.snapshots = bool(dynamodb_setting('DYNAMODB_BOARD_SNAPSHOTS'))
+        # Retención de las lápidas de borrado (ver changes.py)
+        self.tombstone_ttl_days = int(dynamodb_setting('DYNAMODB_TOMBSTONE_TTL_DAYS'))
 
-        try:
-            self.dynamodb = boto3.resource(
-                'dynamodb',
-                endpoint_url=self.endpoint_url,
-                region_name=self.region,
-                aws_access_key_id=self.access_key,
-                aws_secret_access_key=self.secret_key
-            )
+        # La conexión y la tabla se crean en el primer uso: construir el
+        # adaptador no hace I/O, así que importar el schema es inmediato. La
+        # tabla se prepara con "python manage.py ensure_dynamodb_table".
+        self._dynamodb = None
+        self._table = None
 
-            self.table = self.dynamodb.Table(self.table_name)
-            self._create_table_if_not_exists()
-        except Exception as e:
-            logger.error(f"Error al inicializar DynamoDB: {str(e)}")
-            raise
+    @property
+    def dynamodb(self):
+        if self._dynamodb is None:
+            # Recurso compartido por todo el proceso (un único pool de conexiones)
+            self._dynamodb = get_dynamodb_resource()
+        return self._dynamodb
 
-    def _create_table_if_not_exists(self):
-        try:
-            self.table.load()
-            logger.info(f"Tabla {self.table_name} ya existe")
-        except self.dynamodb.meta.client.exceptions.ResourceNotFoundException:
-            logger.info(f"Creando tabla {self.table_name}")
-            try:
-                # Crear la tabla
-                self.dynamodb.create_table(
-                    TableName=self.table_name,
-                    KeySchema=[
-                        {'AttributeName': 'id', 'KeyType': 'HASH'}
-                    ],
-                    AttributeDefinitions=[
-                        {'AttributeName': 'id', 'AttributeType': 'S'},
-                        {'AttributeName': 'type', 'AttributeType': 'S'},
-                        {'AttributeName': 'column_id', 'AttributeType': 'S'},
-                        {'AttributeName': 'board_id', 'AttributeType': 'S'}
-                    ],
-                    GlobalSecondaryIndexes=[
-                        {
-                            'IndexName': 'TypeIndex',
-                            'KeySchema': [
-                                {'AttributeName': 'type', 'KeyType': 'HASH'}
-                            ],
-                            'Projection': {
-                                'ProjectionType': 'ALL'
-                            },
-                            'ProvisionedThroughput': {
-                                'ReadCapacityUnits': 5,
-                                'WriteCapacityUnits': 5
-                            }
-                        },
-                        {
-                            'IndexName': 'ColumnIdIndex',
-                            'KeySchema': [
-                                {'AttributeName': 'column_id', 'KeyType': 'HASH'},
-                                {'AttributeName': 'type', 'KeyType': 'RANGE'}
-                            ],
-                            'Projection': {
-                                'ProjectionType': 'ALL'
-                            },
-                            'ProvisionedThroughput': {
-                                'ReadCapacityUnits': 5,
-                                'WriteCapacityUnits': 5
-                            }
-                        },
-                        {
-                            'IndexName': 'BoardIdIndex',
-                            'KeySchema': [
-                                {'AttributeName': 'board_id', 'KeyType': 'HASH'},
-                                {'AttributeName': 'type', 'KeyType': 'RANGE'}
-                            ],
-                            'Projection': {
-                                'ProjectionType': 'ALL'
-                            },
-                            'ProvisionedThroughput': {
-                                'ReadCapacityUnits': 5,
-                                'WriteCapacityUnits': 5
-                            }
-                        }
-                    ],
-                    ProvisionedThroughput={
-                        'ReadCapacityUnits': 5,
-                        'WriteCapacityUnits': 5
-                    }
-                )
-                
-                # Esperar a que la tabla esté completamente creada
-                max_attempts = 30  # 30 intentos de 1 segundo = 30 segundos máximo
-                for attempt in range(max_attempts):
-                    try:
-                        self.table.wait_until_exists()
-                        logger.info(f"Tabla {self.table_name} creada exitosamente")
-                        break
-                    except Exception as e:
-                        if attempt == max_attempts - 1:
-                            raise Exception(f"Timeout esperando a que la tabla {self.table_name} se cree: {str(e)}")
-                        logger.warning(f"Intento {attempt + 1} de esperar a que la tabla se cree: {str(e)}")
-                        time.sleep(1)
-                
-                # Verificar que los índices estén activos
-                for index_name in ['TypeIndex', 'ColumnIdIndex', 'BoardIdIndex']:
-                    for attempt in range(max_attempts):
-                        try:
-                            response = self.dynamodb.meta.client.describe_table(
-                                TableName=self.table_name
-                            )
-                            index_status = next(
-                                (idx['IndexStatus'] for idx in response['Table']['GlobalSecondaryIndexes']
-                                 if idx['IndexName'] == index_name),
-                                None
-                            )
-                            if index_status == 'ACTIVE':
-                                logger.info(f"Índice {index_name} está activo")
-                                break
-                            elif attempt == max_attempts - 1:
-                                raise Exception(f"Timeout esperando a que el índice {index_name} se active")
-                            else:
-                                logger.warning(f"Índice {index_name} aún no está activo, intento {attempt + 1}")
-                                time.sleep(1)
-                        except Exception as e:
-                            if attempt == max_attempts - 1:
-                                raise Exception(f"Error verificando el índice {index_name}: {str(e)}")
-                            logger.warning(f"Error verificando el índice {index_name}, intento {attempt + 1}: {str(e)}")
-                            time.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Error al crear tabla {self.table_name}: {str(e)}")
-                raise
+    @property
+    def table(self):
+        if self._table is None:
+            self._table = self.dynamodb.Table(self.table_name)
+        return self._table
+
+    def _iter_query(self, page_size=None, **kwargs):
+        """
+        Recorre un Query página a página siguiendo LastEvaluatedKey. Solo hay
+        en memoria una página de ``page_size`` items (DYNAMODB_PAGE_SIZE por
+        defecto; DynamoDB corta además cada página en 1 MB).
+        """
+        page_size = page_size or self.page_size
+        if page_size:
+            kwargs['Limit'] = page_size
+        while True:
+            response = self.table.query(**kwargs)
+            yield from response.get('Items', [])
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return
+            kwargs['ExclusiveStartKey'] = last_key
+
+    def _iter_index(self, index_name, key_condition, values, fields=None, page_size=None):
+        names = {
+            '#t': 'type'
+        }
+        projection = _projection_arguments(fields, names)
+        return self._iter_query(
+            page_size=page_size,
+            IndexName=index_name,
+            KeyConditionExpression=key_condition,
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+            **projection
+        )
+
+    def iter_items_by_type(self, item_type, fields=None, page_size=None):
+        """Itera todos los items de un tipo ('board', 'column' o 'card')."""
+        return self._iter_index(
+            'TypeIndex',
+            '#t = :type',
+            {':type': item_type},
+            fields,
+            page_size
+        )
+
+    def iter_columns(self, board_id, fields=None, page_size=None):
+        """Itera las columnas del board, sin ordenar."""
+        return self._iter_index(
+            'BoardIdIndex',
+            'board_id = :board_id AND #t = :type',
+            {':board_id': board_id, ':type': 'column'},
+            fields,
+            page_size
+        )
 
-    def get_boards(self):
+    def iter_cards(self, column_id, fields=None, page_size=None):
+        """Itera las tarjetas de la columna, sin ordenar."""
+        return self._iter_index(
+            'ColumnIdIndex',
+            'column_id = :column_id AND #t = :type',
+            {':column_id': column_id, ':type': 'card'},
+            fields,
+            page_size
+        )
+
+    def get_boards(self, fields=None):
         try:
-            response = self.table.query(
-                IndexName='TypeIndex',
-                KeyConditionExpression='#t = :type',
-                ExpressionAttributeNames={
-                    '#t': 'type'
-                },
-                ExpressionAttributeValues={
-                    ':type': 'board'
-                }
-            )
-            boards = response.get('Items', [])
+            boards = list(self.iter_items_by_type('board', fields))
             logger.info(f"Boards encontrados: {len(boards)}")
             for board in boards:
                 logger.info(f"Board: {board}")
@@ -178,17 +239,21 @@ class DynamoDBAdapter:
                 'id': board_id,
                 'type': type,
                 'name': name,
+                'version': 1,
                 'created_at': now,
                 'updated_at': now
             }
+            item.update(layout_keys(item, board_id))
             logger.info(f"Creando board con item: {item}")
+            stored = {**item, **change_attributes(board_id, now)}
             
             # Intentar crear el board hasta 3 veces si falla
             max_retries = 3
             for attempt in range(max_retries):
                 try:
                     response = self.table.put_item(
-                        Item=item,
+                        Item=stored,
+                        ConditionExpression='attribute_not_exists(id)',
                         ReturnConsumedCapacity='TOTAL'
                     )
                     logger.info(f"Board creado. Consumo de capacidad: {response['ConsumedCapacity']}")
@@ -198,6 +263,10 @@ class DynamoDBAdapter:
                         raise
                     logger.warning(f"Intento {attempt + 1} fallido al crear board: {str(e)}")
                     time.sleep(1)  # Esperar 1 segundo antes de reintentar
+
+            # Las columnas que se crean a continuación ya se añaden a la instantánea
+            if self.snapshots:
+                self.rebuild_board_snapshot(board_id)
             
             # Crear columnas por defecto
             columns = [
@@ -219,102 +288,723 @@ class DynamoDBAdapter:
             logger.error(f"Error al crear board: {str(e)}")
             raise
 
-    def get_columns(self, board_id):
+    def get_columns(self, board_id, fields=None):
+        """Columnas del board; con ``fields`` solo se leen esos atributos."""
         try:
-            response = self.table.query(
-                IndexName='BoardIdIndex',
-                KeyConditionExpression='board_id = :board_id AND #t = :type',
-                ExpressionAttributeNames={
-                    '#t': 'type'
-                },
-                ExpressionAttributeValues={
-                    ':board_id': board_id,
-                    ':type': 'column'
-                }
-            )
-            return response.get('Items', [])
+            return sort_by_rank(list(self.iter_columns(board_id, fields)))
         except Exception as e:
             logger.error(f"Error al obtener columns: {str(e)}")
             raise
 
+    def get_cards(self, column_id, fields=None):
+        """Tarjetas de la columna; con ``fields`` solo se leen esos atributos."""
+        try:
+            return sort_by_rank(list(self.iter_cards(column_id, fields)))
+        except Exception as e:
+            logger.error(f"Error al obtener cards: {str(e)}")
+            raise
+
+    def get_columns_page(self, board_id, limit, after=None, fields=None):
+        """
+        Página de columnas en orden de rank: ``(columnas, hay_más)``. ``after``
+        es la última columna de la página anterior (basta con id y rank).
+        """
+        return self._rank_page('BoardRankIndex', 'board_id', board_id, limit, after, fields)
+
+    def get_cards_page(self, column_id, limit, after=None, fields=None):
+        """Página de tarjetas en orden de rank; ver get_columns_page."""
+        return self._rank_page('ColumnRankIndex', 'column_id', column_id, limit, after, fields)
+
+    def _rank_page(self, index_name, key_name, key_value, limit, after, fields):
+        # Los índices por rank son dispersos: los items antiguos sin rank no
+        # aparecen hasta que fixCardOrders les asigna uno
+        try:
+            names = {
+                '#k': key_name
+            }
+            kwargs = {
+                'IndexName': index_name,
+                'KeyConditionExpression': '#k = :key',
+                'ExpressionAttributeNames': names,
+                'ExpressionAttributeValues': {':key': key_value},
+                **_projection_arguments(fields, names),
+            }
+            if after:
+                kwargs['ExclusiveStartKey'] = {
+                    'id': after['id'],
+                    key_name: key_value,
+                    'rank': after['rank']
+                }
+            # Un item de más para saber si hay otra página
+            items = list(islice(self._iter_query(page_size=limit + 1, **kwargs), limit + 1))
+            return items[:limit], len(items) > limit
+        except Exception as e:
+            logger.error(f"Error al obtener una página de {index_name}: {str(e)}")
+            raise
+
+    def get_columns_for_boards(self, board_ids: Iterable[str], fields=None) -> Dict[str, List[Dict]]:
+        """Obtiene las columnas de varios boards a la vez, agrupadas por board_id."""
+        return self._query_in_parallel(lambda board_id: self.get_columns(board_id, fields), board_ids)
+
+    def get_cards_for_columns(self, column_ids: Iterable[str], fields=None) -> Dict[str, List[Dict]]:
+        """Obtiene las tarjetas de varias columnas a la vez, agrupadas por column_id."""
+        return self._query_in_parallel(lambda column_id: self.get_cards(column_id, fields), column_ids)
+
+    def get_board_items(self, board_id, fields=None, page_size=None):
+        """Itera todos los items de la partición del tablero (board, columnas y tarjetas)."""
+        names = {}
+        projection = _projection_arguments(fields, names)
+        if names:
+            projection['ExpressionAttributeNames'] = names
+        return self._iter_query(
+            page_size=page_size,
+            IndexName=BOARD_ITEMS_INDEX,
+            KeyConditionExpression='pk = :pk',
+            ExpressionAttributeValues={':pk': partition_key(board_id)},
+            **projection
+        )
+
+    def get_board_tree(self, board_id, fields=None):
+        """Tablero completo en un único Query paginado: ``{'board', 'columns', 'cards'}``."""
+        try:
+            if fields:
+                fields = set(fields) | ASSEMBLY_ATTRIBUTES
+            return assemble_board(self.get_board_items(board_id, fields))
+        except Exception as e:
+            logger.error(f"Error al obtener el tablero {board_id}: {str(e)}")
+            raise
+
+    def get_board_trees(self, board_ids, column_fields=None, card_fields=None):
+        """
+        Devuelve ``{board_id: {'columns': [...], 'cards': {column_id: [...]}}}``
+        con columnas y tarjetas ya ordenadas. Con instantáneas activadas es un
+        BatchGetItem; si no, con la disposición 'partition' es un Query por
+        tablero y con 'index', una tanda de queries para las columnas de todos
+        los tableros y otra para sus tarjetas.
+        """
+        board_ids = list(dict.fromkeys(board_ids))
+        trees = {}
+        if self.snapshots:
+            # Los tableros sin instantánea se montan desde los índices
+            for board_id, tree in self.get_board_snapshots(board_ids).items():
+                trees[board_id] = {'columns': tree['columns'], 'cards': tree['cards']}
+            board_ids = [board_id for board_id in board_ids if board_id not in trees]
+            if not board_ids:
+                return trees
+        trees.update(self._build_board_trees(board_ids, column_fields, card_fields))
+        return trees
+
+    def _build_board_trees(self, board_ids, column_fields=None, card_fields=None):
+        if self.layout == 'partition':
+            fields = None
+            if column_fields and card_fields:
+                fields = set(column_fields) | set(card_fields)
+            trees = self._query_in_parallel(lambda board_id: self.get_board_tree(board_id, fields), board_ids)
+            return {
+                board_id: {'columns': tree['columns'], 'cards': tree['cards']}
+                for board_id, tree in trees.items()
+            }
+
+        # Un lote de queries en paralelo por nivel (ver get_columns_for_boards)
+        return super().get_board_trees(board_ids, column_fields, card_fields)
+
+    def get_board_snapshots(self, board_ids):
+        """
+        Árboles ``{'board', 'columns', 'cards'}`` de las instantáneas que
+        existan, con un BatchGetItem por cada 100 tableros.
+        """
+        trees = {}
+        board_ids = list(board_ids)
+        try:
+            for start in range(0, len(board_ids), BATCH_GET_MAX_KEYS):
+                keys = [{'id': snapshot_id(board_id)} for board_id in board_ids[start:start + BATCH_GET_MAX_KEYS]]
+                request = {self.table_name: {'Keys': keys}}
+                while request:
+                    response = self.dynamodb.batch_get_item(RequestItems=request)
+                    for item in response.get('Responses', {}).get(self.table_name, []):
+                        board_id = item['id'][len(snapshot_id('')):]
+                        trees[board_id] = decode_tree(item['data'])
+                    request = response.get('UnprocessedKeys') or None
+            return trees
+        except Exception as e:
+            # Sin instantáneas se puede seguir leyendo desde los índices
+            logger.error(f"Error al leer las instantáneas de {len(board_ids)} tableros: {str(e)}")
+            return trees
+
+    def rebuild_board_snapshot(self, board_id):
+        """
+        Regenera la instantánea del tablero a partir de los items. La escritura
+        se condiciona a la versión de la instantánea anterior: si una mutación
+        la actualiza mientras tanto, se vuelve a montar el árbol.
+
+        Devuelve el tamaño en bytes, o None si el tablero no existe o el árbol
+        no cabe en un item (en ese caso se elimina la instantánea).
+        """
+        def attempt():
+            current = self._get_item(snapshot_id(board_id), SNAPSHOT_TYPE)
+            board = self._get_item(board_id, 'board')
+            if not board:
+                if current:
+                    self._transact_write(self._delete_operations(current))
+                return None
+            tree = self._build_board_trees([board_id])[board_id]
+            data = encode_tree({**tree, 'board': board})
+            if len(data) > SNAPSHOT_MAX_BYTES:
+                logger.warning(f"La instantánea del tablero {board_id} ocupa {len(data)} bytes; no se guarda")
+                if current:
+                    self._transact_write(self._delete_operations(current))
+                return None
+            now = datetime.utcnow().isoformat()
+            if current:
+                self._transact_write([self._update_operation(current, {'data': data, 'updated_at': now})])
+            else:
+                self._transact_write([self._put_operation({
+                    'id': snapshot_id(board_id),
+                    'type': SNAPSHOT_TYPE,
+                    'data': data,
+                    'created_at': now,
+                    'updated_at': now
+                })])
+            return len(data)
+
+        try:
+            return self._retry_on_conflict(attempt, "regenerar la instantánea")
+        except Exception as e:
+            logger.error(f"Error al regenerar la instantánea del tablero {board_id}: {str(e)}")
+            raise
+
+    def rebuild_snapshots(self):
+        """Regenera las instantáneas de todos los tableros. Devuelve ``{'rebuilt', 'skipped'}``."""
+        counts = {'rebuilt': 0, 'skipped': 0}
+        for board in self.iter_items_by_type('board', fields={'id'}):
+            if self.rebuild_board_snapshot(board['id']) is None:
+                counts['skipped'] += 1
+            else:
+                counts['rebuilt'] += 1
+        return counts
+
+    def _snapshot_operations(self, board_id, upserts=(), removals=()):
+        """
+        Operaciones que reflejan una escritura en la instantánea del tablero,
+        para añadirlas a su misma transacción. ``upserts`` son los items con su
+        estado final y ``removals`` los ids eliminados. Si la instantánea no
+        existe (desactivadas o sin generar) no hay nada que mantener.
+        """
+        if not self.snapshots or not board_id:
+            return []
+        snapshot = self._get_item(snapshot_id(board_id), SNAPSHOT_TYPE)
+        if not snapshot:
+            return []
+        data = encode_tree(apply_changes(decode_tree(snapshot['data']), upserts, removals))
+        if len(data) > SNAPSHOT_MAX_BYTES:
+            # Las lecturas volverán a los índices
+            logger.warning(f"La instantánea del tablero {board_id} supera {SNAPSHOT_MAX_BYTES} bytes; se elimina")
+            return self._delete_operations(snapshot)
+        return [self._update_operation(snapshot, {'data': data, 'updated_at': datetime.utcnow().isoformat()})]
+
+    def _card_board_id(self, card):
+        """board_id de una tarjeta, solo si hace falta para su instantánea."""
+        if not self.snapshots:
+            return None
+        board_id = board_id_from_partition(card.get('pk'))
+        if board_id is None and card.get('column_id'):
+            column = self._get_item(card['column_id'], 'column')
+            board_id = column.get('board_id') if column else None
+        return board_id
+
+    def _title_owner(self, column_id, title):
+        """
+        Item que reserva ``title`` en la columna y si su tarjeta sigue usándolo.
+        Las reservas se borran cuando su tarjeta deja de usarlas (ver
+        _release_title_operations); una anterior a eso cuya tarjeta ya no está
+        en la columna con ese título se reutiliza.
+        """
+        title_key = self._get_item(_title_key_id(column_id, title), TITLE_KEY_TYPE)
+        if not title_key:
+            return None, False
+        owner = self._get_item(title_key['card_id'], 'card')
+        in_use = bool(owner) and owner.get('column_id') == column_id and owner.get('title') == title
+        return title_key, in_use
+
+    def _claim_title_operation(self, column_id, title, card_id):
+        """
+        Asigna la reserva del título a la tarjeta sin condición (movimientos y
+        renombrados, que no comprueban duplicados). La versión se incrementa
+        para que un alta que leyó la reserva anterior falle y la relea.
+        """
+        return {
+            'Update': {
+                'TableName': self.table_name,
+                'Key': {'id': _serializer.serialize(_title_key_id(column_id, title))},
+                'UpdateExpression': (
+                    'SET #t = :type, card_id = :card_id, change_bucket = :change_bucket, '
+                    'changed_at = :changed_at ADD #version :one'
+                ),
+                'ExpressionAttributeNames': {'#t': 'type', '#version': 'version'},
+                'ExpressionAttributeValues': {
+                    ':type': _serializer.serialize(TITLE_KEY_TYPE),
+                    ':card_id': _serializer.serialize(card_id),
+                    ':one': _serializer.serialize(1),
+                    **self._change_values(_title_key_id(column_id, title))
+                }
+            }
+        }
+
+    def _release_title_operations(self, column_id, title, card_id):
+        """
+        Borrado (con su lápida) de la reserva de ``title`` en la columna si es
+        de ``card_id``, para la transacción que borra la tarjeta, la renombra
+        o la saca de la columna. Si otra alta la reasigna entretanto, su
+        versión hace fallar la transacción y se repite.
+        """
+        if not column_id or not title:
+            return []
+        title_key = self._get_item(_title_key_id(column_id, title), TITLE_KEY_TYPE)
+        if not title_key or title_key.get('card_id') != card_id:
+            return []
+        return self._delete_operations(title_key)
+
+    def _drop_titles_operations(self, column_id, titles):
+        """
+        Borrado sin condición (con sus lápidas) de las reservas de ``titles``
+        en una columna que se elimina: ya no las usa nadie.
+        """
+        operations = []
+        for title in titles:
+            title_key = {'id': _title_key_id(column_id, title), 'type': TITLE_KEY_TYPE}
+            tombstone = tombstone_item(title_key, self.tombstone_ttl_days)
+            operations.append({
+                'Delete': {
+                    'TableName': self.table_name,
+                    'Key': {'id': _serializer.serialize(title_key['id'])}
+                }
+            })
+            operations.append({
+                'Put': {
+                    'TableName': self.table_name,
+                    'Item': {key: _serializer.serialize(value) for key, value in tombstone.items()}
+                }
+            })
+        return operations
+
+    def _insert_position(self, column_id, position):
+        """
+        Calcula ``(posición, rank)`` para insertar una tarjeta leyendo por
+        ColumnRankIndex solo hasta ``position``: al principio es un Query de
+        un item. Al final de la columna (sin posición) basta con la última
+        para el rank y la posición es None: no se conoce sin contar la
+        columna, y el ``order`` se deduce del rank al leer (sort_by_rank).
+        Devuelve un rank None si los vecinos no lo permiten y hay que
+        renumerar la columna.
+        """
+        names = {}
+        kwargs = {
+            'IndexName': 'ColumnRankIndex',
+            'KeyConditionExpression': 'column_id = :column_id',
+            'ExpressionAttributeValues': {':column_id': column_id},
+            **_projection_arguments({'id', 'rank'}, names),
+            'ExpressionAttributeNames': names
+        }
+        if position is None:
+            last = next(self._iter_query(page_size=1, ScanIndexForward=False, **kwargs), None)
+            before, after = last, None
+        else:
+            items = list(islice(self._iter_query(page_size=position + 1, **kwargs), position + 1))
+            position = self._clamp_position(position, items)
+            before = items[position - 1] if position > 0 else None
+            after = items[position] if position < len(items) else None
+        try:
+            rank = rank_between(before and before['rank'], after and after['rank'])
+        except ValueError:
+            return position, None
+        return position, rank if len(rank) <= MAX_RANK_LENGTH else None
+
+    def _query_in_parallel(self, query_fn, keys):
+        # DynamoDB no permite consultar varias claves de partición en un solo
+        # Query, así que lanzamos todas las consultas del nivel a la vez: el
+        # coste en latencia es el de una sola ida y vuelta.
+        keys = list(dict.fromkeys(keys))
+        if len(keys) <= 1:
+            return {key: query_fn(key) for key in keys}
+        return dict(zip(keys, self._get_executor().map(propagate(query_fn), keys)))
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_parallel_queries,
+                    thread_name_prefix='dynamodb-query'
+                )
+        return self._executor
+
+    @staticmethod
+    def _clamp_position(position, items):
+        return clamp_position(position, items)
+
+    @staticmethod
+    def _rank_at(items, position):
+        return rank_at(items, position)
+
+    def _rank_for_insert(self, items, position, parent):
+        rank = self._rank_at(items, position)
+        if rank is None:
+            # Caso ocasional: renumerar la lista completa y volver a calcular
+            logger.info(f"Reasignando ranks de {len(items)} elementos")
+            self._write_ranks(items, parent)
+            rank = self._rank_at(items, position)
+        return rank
+
+    def _write_ranks(self, items, parent):
+        """
+        Asigna ranks consecutivos a ``items`` (ordenados) respetando su orden
+        actual. La versión de ``parent`` (columna o board) se incrementa en la
+        misma transacción para que las escrituras concurrentes sobre la lista
+        fallen.
+
+        Con más de TRANSACTION_MAX_ITEMS operaciones la escritura se reparte en
+        varias transacciones y no es atómica. Por eso los ranks nuevos son
+        todos menores que el menor de la lista y se escriben en su orden: si
+        falla un bloque, los items ya escritos quedan delante de los demás y
+        la lista conserva el orden. Repetir la operación, releyendo la lista,
+        la completa.
+        """
+        now = datetime.utcnow().isoformat()
+        lowest = min((item['rank'] for item in items if item.get('rank') is not None), default=None)
+        try:
+            ranks = ranks_before(lowest, len(items))
+        except ValueError:
+            # Rank corrupto o sin hueco por debajo: en una sola transacción
+            # da igual; en varias, un fallo a medias puede desordenar la lista
+            logger.warning(f"No hay ranks libres antes de {lowest!r}; se renumera desde el principio")
+            ranks = initial_ranks(len(items))
+        operations = [self._touch_operation(parent)]
+        written = [self._after_write(parent)]
+        for index, (item, rank) in enumerate(zip(items, ranks)):
+            values = {'rank': rank, 'order': index, 'updated_at': now}
+            operations.append(self._update_operation(item, values))
+            written.append(self._after_write(item, values))
+        board_id = parent['id'] if parent.get('type') == 'board' else parent.get('board_id')
+        operations.extend(self._snapshot_operations(board_id, upserts=written))
+        self._transact_write(operations)
+        for index, (item, rank) in enumerate(zip(items, ranks)):
+            item['rank'] = rank
+            item['order'] = index
+            item['version'] = self._next_version(item)
+        parent['version'] = self._next_version(parent)
+
+    @staticmethod
+    def _next_version(item):
+        return (item.get('version') or 0) + 1
+
+    @classmethod
+    def _after_write(cls, item, values=None):
+        """Estado de ``item`` tras asignarle ``values`` con _update_operation."""
+        return {**item, **(values or {}), 'version': cls._next_version(item)}
+
+    def _version_condition(self, item, names, values):
+        # Los elementos anteriores a las versiones no tienen el atributo
+        names['#version'] = 'version'
+        if item.get('version') is None:
+            return 'attribute_exists(id) AND attribute_not_exists(#version)'
+        values[':expected_version'] = _serializer.serialize(item['version'])
+        return '#version = :expected_version'
+
+    def _update_operation(self, item, values):
+        """
+        Construye una operación Update para TransactWriteItems que asigna
+        ``values`` e incrementa la versión, solo si ``item`` no ha cambiado
+        desde que se leyó.
+        """
+        names = {}
+        expression_values = {}
+        assignments = []
+        for index, (attribute, value) in enumerate(values.items()):
+            names[f'#a{index}'] = attribute
+            expression_values[f':v{index}'] = _serializer.serialize(value)
+            assignments.append(f'#a{index} = :v{index}')
+        condition = self._version_condition(item, names, expression_values)
+        expression_values[':next_version'] = _serializer.serialize(self._next_version(item))
+        assignments.append('#version = :next_version')
+        expression_values.update(self._change_values(item['id']))
+        assignments.append('change_bucket = :change_bucket, changed_at = :changed_at')
+        return {
+            'Update': {
+                'TableName': self.table_name,
+                'Key': {'id': _serializer.serialize(item['id'])},
+                'UpdateExpression': 'SET ' + ', '.join(assignments),
+                'ConditionExpression': condition,
+                'ExpressionAttributeNames': names,
+                'ExpressionAttributeValues': expression_values
+            }
+        }
+
+    def _touch_operation(self, item):
+        """Incrementa solo la versión de ``item`` (una columna o un board)."""
+        return self._update_operation(item, {})
+
+    def _put_operation(self, item):
+        item['version'] = 1
+        stored = {**item, **change_attributes(item['id'])}
+        return {
+            'Put': {
+                'TableName': self.table_name,
+                'Item': {key: _serializer.serialize(value) for key, value in stored.items()},
+                'ConditionExpression': 'attribute_not_exists(id)'
+            }
+        }
+
+    @staticmethod
+    def _change_values(item_id):
+        """Valores ``:change_bucket`` y ``:changed_at`` para un UpdateExpression."""
+        return {
+            f':{name}': _serializer.serialize(value)
+            for name, value in change_attributes(item_id).items()
+        }
+
+    def _delete_operations(self, item):
+        """Borrado condicionado de ``item`` más su lápida para los backups incrementales."""
+        tombstone = tombstone_item(item, self.tombstone_ttl_days)
+        return [
+            self._delete_operation(item),
+            {
+                'Put': {
+                    'TableName': self.table_name,
+                    'Item': {key: _serializer.serialize(value) for key, value in tombstone.items()}
+                }
+            }
+        ]
+
+    def _delete_operation(self, item):
+        names = {}
+        values = {}
+        operation = {
+            'TableName': self.table_name,
+            'Key': {'id': _serializer.serialize(item['id'])},
+            'ConditionExpression': self._version_condition(item, names, values),
+            'ExpressionAttributeNames': names
+        }
+        if values:
+            operation['ExpressionAttributeValues'] = values
+        return {'Delete': operation}
+
+    def _transact_write(self, operations):
+        """
+        Ejecuta las operaciones en transacciones de hasta TRANSACTION_MAX_ITEMS
+        elementos. Cada bloque se aplica entero o no se aplica, en una sola ida
+        y vuelta.
+        """
+        client = self.dynamodb.meta.client
+        for start in range(0, len(operations), TRANSACTION_MAX_ITEMS):
+            chunk = operations[start:start + TRANSACTION_MAX_ITEMS]
+            try:
+                client.transact_write_items(TransactItems=chunk)
+            except ClientError as e:
+                if _is_conflict(e):
+                    # Lo gestiona _retry_on_conflict
+                    raise
+                logger.error(
+                    f"Error en la transacción de {len(chunk)} elementos "
+                    f"({start} de {len(operations)} ya aplicados): {str(e)}"
+                )
+                raise
+
+    def _transact_write_bulk(self, operations, progress=None, description='escritura masiva'):
+        """
+        Como _transact_write, pero con los bloques intermedios en paralelo en
+        el pool del adaptador. El primero (que lleva las comprobaciones de
+        versión del padre) y el último (el que hace visible el resultado, p.
+        ej. el borrado de una columna) se aplican en orden.
+        """
+        # Los bloques se alinean por el final: el último siempre está completo
+        # y contiene las últimas operaciones (p. ej. el borrado, su lápida y la
+        # instantánea), aunque no quepan en el resto del penúltimo
+        first = len(operations) % TRANSACTION_MAX_ITEMS or TRANSACTION_MAX_ITEMS
+        chunks = [operations[:first]] + [
+            operations[start:start + TRANSACTION_MAX_ITEMS]
+            for start in range(first, len(operations), TRANSACTION_MAX_ITEMS)
+        ]
+        total = len(operations)
+        done = 0
+        lock = threading.Lock()
+
+        def apply(chunk):
+            nonlocal done
+            self._transact_write(chunk)
+            with lock:
+                done += len(chunk)
+                current = done
+            if len(chunks) > 1:
+                logger.info(f"{description}: {current} de {total} operaciones aplicadas")
+            if progress:
+                progress(current, total)
+
+        apply(chunks[0])
+        if len(chunks) > 2:
+            # list() para propagar la primera excepción
+            list(self._get_executor().map(propagate(apply), chunks[1:-1]))
+        if len(chunks) > 1:
+            apply(chunks[-1])
+
+    def _retry_on_conflict(self, operation, description):
+        """
+        Ejecuta ``operation`` (que debe releer lo que necesite) y la repite si
+        falla por un conflicto de versión, hasta max_conflict_retries veces.
+
+        Las versiones se leen con GetItem consistente, pero las listas de
+        hermanos salen de índices secundarios, que no lo son: dos altas o
+        movimientos simultáneos entre los mismos vecinos pueden acabar con el
+        mismo rank. Las condiciones de versión evitan que se pierdan
+        escrituras, no ese empate. Un rank duplicado no rompe la lista (el
+        orden entre ambos es estable), la siguiente inserción entre ellos la
+        renumera (rank_at) y ``repair_card_orders`` lo detecta como
+        duplicate_rank.
+        """
+        for attempt in range(self.max_conflict_retries + 1):
+            try:
+                return operation()
+            except ClientError as e:
+                if not _is_conflict(e):
+                    raise
+                if attempt == self.max_conflict_retries:
+                    raise ConcurrentModificationError(
+                        f"No se pudo {description}: otro usuario modificó los mismos datos"
+                    ) from e
+                logger.warning(f"Conflicto de versión al {description}, reintento {attempt + 1}")
+                time.sleep(random.uniform(0, CONFLICT_BACKOFF_SECONDS * 2 ** attempt))
+
+    def _get_item(self, item_id, item_type):
+        # Lectura consistente: la versión leída se usa como condición de escritura
+        response = self.table.get_item(
+            Key={'id': item_id},
+            ConsistentRead=True
+        )
+        item = response.get('Item')
+        if item and item.get('type') == item_type:
+            return item
+        return None
+
+    def get_board(self, board_id: str) -> Optional[Dict]:
+        try:
+            return self._get_item(board_id, 'board')
+        except Exception as e:
+            logger.error(f"Error al obtener board {board_id}: {str(e)}")
+            return None
+
+    def get_column(self, column_id: str) -> Optional[Dict]:
+        try:
+            return self._get_item(column_id, 'column')
+        except Exception as e:
+            logger.error(f"Error al obtener column {column_id}: {str(e)}")
+            return None
+
     def create_column(self, board_id, name, order=None):
         try:
             column_id = str(uuid.uuid4())
-            now = datetime.utcnow().isoformat()
-            self.table.put_item(
-                Item={
+
+            def attempt():
+                # La versión del board protege el orden de sus columnas
+                board = self._get_item(board_id, 'board')
+                if not board:
+                    raise Exception(f"No se encontró el board con ID {board_id}")
+
+                # Sin orden explícito la columna se añade al final
+                columns = self.get_columns(board_id)
+                position = self._clamp_position(order, columns)
+                rank = self._rank_for_insert(columns, position, board)
+
+                now = datetime.utcnow().isoformat()
+                item = {
                     'id': column_id,
                     'type': 'column',
                     'board_id': board_id,
                     'name': name,
-                    'order': order or 0,
+                    'order': position,
+                    'rank': rank,
                     'created_at': now,
                     'updated_at': now
                 }
-            )
+                item.update(layout_keys(item, board_id))
+                self._transact_write([
+                    self._put_operation(item),
+                    self._touch_operation(board),
+                    *self._snapshot_operations(board_id, upserts=[item, self._after_write(board)])
+                ])
+
+            self._retry_on_conflict(attempt, "crear la columna")
             return column_id
         except Exception as e:
             logger.error(f"Error al crear column: {str(e)}")
             raise
 
-    def get_cards(self, column_id):
-        try:
-            response = self.table.query(
-                IndexName='ColumnIdIndex',
-                KeyConditionExpression='column_id = :column_id AND #t = :type',
-                ExpressionAttributeNames={
-                    '#t': 'type'
-                },
-                ExpressionAttributeValues={
-                    ':column_id': column_id,
-                    ':type': 'card'
-                }
-            )
-            return response.get('Items', [])
-        except Exception as e:
-            logger.error(f"Error al obtener cards: {str(e)}")
-            raise
-
     def create_card(self, column_id, title, description='', order=None):
         try:
-            # Verificar si ya existe una tarjeta con el mismo título en la columna
-            cards = self.get_cards(column_id)
-            for card in cards:
-                if card.get('title') == title:
+            card_id = str(uuid.uuid4())
+
+            def attempt():
+                # La versión de la columna serializa las altas y movimientos en
+                # ella: si otra escritura se adelanta, la transacción falla y se
+                # repite. Los vecinos salen de ColumnRankIndex, que es
+                # eventualmente consistente, así que el reintento puede no ver
+                # aún la tarjeta que causó el conflicto y calcular su mismo
+                # rank (ver _retry_on_conflict).
+                column = self._get_item(column_id, 'column')
+                if not column:
+                    raise Exception(f"No se encontró la columna con ID {column_id}")
+
+                # Verificar si ya existe una tarjeta con el mismo título en la columna
+                title_key, in_use = self._title_owner(column_id, title)
+                if in_use:
                     raise Exception(f"Ya existe una tarjeta con el título '{title}' en esta columna")
 
-            # Si no se proporciona un orden, usar el número de tarjetas existentes
-            if order is None:
-                order = len(cards)
+                # Si no se proporciona un orden, añadir al final de la columna.
+                # Solo se leen los vecinos; si sus ranks no admiten uno
+                # intermedio se renumera la columna completa.
+                position, rank = self._insert_position(column_id, order)
+                if rank is None:
+                    cards = self.get_cards(column_id)
+                    position = self._clamp_position(order, cards)
+                    rank = self._rank_for_insert(cards, position, column)
 
-            card_id = str(uuid.uuid4())
-            now = datetime.utcnow().isoformat()
-            item = {
-                'id': card_id,
-                'type': 'card',
-                'column_id': column_id,
-                'title': title,
-                'description': description,
-                'order': order,  # Asegurar que el orden siempre tenga un valor
-                'created_at': now,
-                'updated_at': now
-            }
-            
-            # Actualizar el orden de las tarjetas existentes
-            with self.table.batch_writer() as batch:
-                # Primero, actualizar el orden de las tarjetas existentes
-                for i, existing_card in enumerate(cards):
-                    if i >= order:
-                        batch.put_item(Item={
-                            **existing_card,
-                            'order': i + 1,
-                            'updated_at': now
-                        })
-                
-                # Luego, crear la nueva tarjeta
-                batch.put_item(Item=item)
-
-            logger.info(f"Tarjeta creada: {item}")
+                now = datetime.utcnow().isoformat()
+                item = {
+                    'id': card_id,
+                    'type': 'card',
+                    'column_id': column_id,
+                    'title': title,
+                    'description': description,
+                    'rank': rank,
+                    'created_at': now,
+                    'updated_at': now
+                }
+                if position is not None:
+                    item['order'] = position
+                if column.get('board_id'):
+                    item.update(layout_keys(item, column['board_id']))
+
+                # Reserva del título: si otra alta la toma entretanto, la
+                # transacción falla y el reintento detecta el duplicado
+                if title_key:
+                    claim = self._update_operation(title_key, {'card_id': card_id})
+                else:
+                    claim = self._put_operation({
+                        'id': _title_key_id(column_id, title),
+                        'type': TITLE_KEY_TYPE,
+                        'card_id': card_id
+                    })
+
+                # El rank sitúa la tarjeta sin tocar el resto de la columna
+                self._transact_write([
+                    self._put_operation(item),
+                    claim,
+                    self._touch_operation(column),
+                    *self._snapshot_operations(
+                        column.get('board_id'),
+                        upserts=[item, self._after_write(column)]
+                    )
+                ])
+                logger.info(f"Tarjeta creada: {item}")
+
+            self._retry_on_conflict(attempt, "crear la tarjeta")
             return card_id
         except Exception as e:
             logger.error(f"Error al crear tarjeta: {str(e)}")
@@ -322,45 +1012,34 @@ class DynamoDBAdapter:
 
     def update_card(self, card_id, title, description=None):
         try:
-            # Primero obtener el card existente
-            response = self.table.get_item(
-                Key={
-                    'id': card_id,
-                    'type': 'card'
-                }
-            )
-            card = response.get('Item')
-            if not card:
-                raise Exception(f"No se encontró el card con ID {card_id}")
+            def attempt():
+                # Primero obtener el card existente
+                card = self.get_card(card_id)
+                if not card:
+                    raise Exception(f"No se encontró el card con ID {card_id}")
 
-            # Actualizar los campos manteniendo todos los valores existentes
-            now = datetime.utcnow().isoformat()
-            update_expression = "SET title = :title, description = :description, updated_at = :updated_at"
-            expression_values = {
-                ':title': title,
-                ':description': description or '',
-                ':updated_at': now
-            }
-
-            # Mantener todos los campos existentes excepto type
-            for key, value in card.items():
-                if key not in ['title', 'description', 'updated_at', 'type']:
-                    update_expression += f", {key} = :{key}"
-                    expression_values[f':{key}'] = value
-
-            response = self.table.update_item(
-                Key={
-                    'id': card_id,
-                    'type': 'card'
-                },
-                UpdateExpression=update_expression,
-                ExpressionAttributeValues=expression_values,
-                ReturnValues='ALL_NEW'
-            )
+                values = {
+                    'title': title,
+                    'description': description or '',
+                    'updated_at': datetime.utcnow().isoformat()
+                }
+                extra_operations = self._snapshot_operations(
+                    self._card_board_id(card),
+                    upserts=[self._after_write(card, values)]
+                )
+                if title != card.get('title') and card.get('column_id'):
+                    extra_operations.extend(
+                        self._release_title_operations(card['column_id'], card.get('title'), card_id)
+                    )
+                    extra_operations.append(self._claim_title_operation(card['column_id'], title, card_id))
+                if extra_operations:
+                    self._transact_write([self._update_operation(card, values), *extra_operations])
+                    return self._after_write(card, values)
+                update = self._update_operation(card, values)['Update']
+                response = self.dynamodb.meta.client.update_item(ReturnValues='ALL_NEW', **update)
+                return _deserialize_item(response['Attributes'])
 
-            updated_card = response.get('Attributes')
-            # Asegurarnos de que el type se mantiene
-            updated_card['type'] = 'card'
+            updated_card = self._retry_on_conflict(attempt, "actualizar la tarjeta")
             logger.info(f"Card actualizado: {updated_card}")
             return updated_card
         except Exception as e:
@@ -369,92 +1048,41 @@ class DynamoDBAdapter:
 
     def move_column(self, column_id, new_order):
         try:
-            # Obtener la columna actual
-            response = self.table.get_item(
-                Key={
-                    'id': column_id,
-                    'type': 'column'
-                }
-            )
-            column = response.get('Item')
-            if not column:
-                raise Exception(f"No se encontró la columna con ID {column_id}")
-
-            # Obtener el board_id de la columna
-            board_id = column.get('board_id')
-            if not board_id:
-                raise Exception(f"La columna {column_id} no tiene un board_id asociado")
-
-            # Obtener todas las columnas del board
-            columns = self.get_columns(board_id)
-            current_order = column.get('order', 0)
-
-            # Preparar las actualizaciones para todas las columnas
-            updates = []
-            for col in columns:
-                col_order = col.get('order', 0)
-                if col['id'] == column_id:
-                    # La columna que se está moviendo
-                    updates.append({
-                        'id': col['id'],
-                        'type': 'column',
-                        'order': new_order
-                    })
-                elif current_order < new_order:  # Moviendo hacia abajo
-                    if current_order < col_order <= new_order:
-                        updates.append({
-                            'id': col['id'],
-                            'type': 'column',
-                            'order': col_order - 1
-                        })
-                else:  # Moviendo hacia arriba
-                    if new_order <= col_order < current_order:
-                        updates.append({
-                            'id': col['id'],
-                            'type': 'column',
-                            'order': col_order + 1
-                        })
-
-            # Ejecutar todas las actualizaciones en una transacción
-            with self.table.batch_writer() as batch:
-                now = datetime.utcnow().isoformat()
-                for update in updates:
-                    batch.put_item(Item={
-                        'id': update['id'],
-                        'type': update['type'],
-                        'order': update['order'],
-                        'updated_at': now,
-                        'board_id': board_id,
-                        'name': next((col['name'] for col in columns if col['id'] == update['id']), '')
-                    })
+            def attempt():
+                # Obtener la columna actual
+                column = self._get_item(column_id, 'column')
+                if not column:
+                    raise Exception(f"No se encontró la columna con ID {column_id}")
 
-            # Obtener todas las tarjetas de la columna
-            cards = self.get_cards(column_id)
-            logger.info(f"Tarjetas encontradas en la columna: {len(cards)}")
+                # Obtener el board_id de la columna
+                board_id = column.get('board_id')
+                board = self._get_item(board_id, 'board') if board_id else None
+                if not board:
+                    raise Exception(f"La columna {column_id} no tiene un board_id asociado")
 
-            # Actualizar las tarjetas para mantener su orden
-            for index, card in enumerate(cards):
-                try:
-                    self.table.update_item(
-                        Key={
-                            'id': card['id'],
-                            'type': 'card'
-                        },
-                        UpdateExpression="SET #o = :order, updated_at = :updated_at",
-                        ExpressionAttributeValues={
-                            ':order': index,
-                            ':updated_at': now
-                        },
-                        ExpressionAttributeNames={
-                            '#o': 'order'
-                        }
+                # Resto de columnas del board, ya ordenadas
+                columns = [col for col in self.get_columns(board_id) if col['id'] != column_id]
+                position = self._clamp_position(new_order, columns)
+                rank = self._rank_for_insert(columns, position, board)
+
+                # Solo se escribe la columna que se mueve (y la versión del board)
+                values = {
+                    'rank': rank,
+                    'order': position,
+                    'updated_at': datetime.utcnow().isoformat()
+                }
+                self._transact_write([
+                    self._update_operation(column, values),
+                    self._touch_operation(board),
+                    *self._snapshot_operations(
+                        board_id,
+                        upserts=[self._after_write(column, values), self._after_write(board)]
                     )
-                    logger.info(f"Tarjeta {card['id']} actualizada con orden {index}")
-                except Exception as e:
-                    logger.error(f"Error al actualizar tarjeta {card['id']}: {str(e)}")
-                    raise
+                ])
+                logger.info(f"Columna {column_id} movida a la posición {position} con rank {rank}")
+                return {'id': column_id, 'type': 'column', 'order': position, 'board_id': board_id}
 
-            return {'id': column_id, 'type': 'column', 'order': new_order, 'board_id': board_id}
+            return self._retry_on_conflict(attempt, "mover la columna")
         except Exception as e:
             logger.error(f"Error al mover columna: {str(e)}")
             raise
@@ -464,242 +1092,352 @@ class DynamoDBAdapter:
         Elimina una tarjeta por su ID.
         """
         try:
-            # Primero verificar que la tarjeta existe
-            response = self.table.get_item(
-                Key={
-                    'id': card_id
-                }
-            )
-            card = response.get('Item')
-            if not card or card.get('type') != 'card':
-                raise Exception(f"No se encontró la tarjeta con ID {card_id}")
-
-            # Eliminar la tarjeta
-            response = self.table.delete_item(
-                Key={
-                    'id': card_id
-                },
-                ReturnValues='ALL_OLD'
-            )
-            
-            deleted_card = response.get('Attributes')
-            logger.info(f"Tarjeta eliminada: {deleted_card}")
+            def attempt():
+                # Primero verificar que la tarjeta existe
+                card = self.get_card(card_id)
+                if not card:
+                    raise Exception(f"No se encontró la tarjeta con ID {card_id}")
+
+                # Eliminar la tarjeta solo si nadie la ha modificado entretanto,
+                # junto con su reserva de título
+                snapshot_operations = self._snapshot_operations(self._card_board_id(card), removals=[card_id])
+                release_operations = self._release_title_operations(
+                    card.get('column_id'), card.get('title'), card_id
+                )
+                self._transact_write([*self._delete_operations(card), *release_operations, *snapshot_operations])
+                logger.info(f"Tarjeta eliminada: {card}")
+
+            self._retry_on_conflict(attempt, "eliminar la tarjeta")
             return True
         except Exception as e:
             logger.error(f"Error al eliminar tarjeta: {str(e)}")
             raise
 
-    def delete_column(self, column_id):
+    def delete_column(self, column_id, progress=None):
+        """
+        Elimina la columna y traslada sus tarjetas al final de la primera de
+        las restantes. ``progress(hechas, total)`` recibe el avance en
+        operaciones escritas, útil con columnas muy grandes.
+        """
         try:
-            # Verificar si la columna existe
-            response = self.table.get_item(
-                Key={'id': column_id}
-            )
-            column = response.get('Item')
-            if not column or column.get('type') != 'column':
-                raise Exception(f"No se encontró la columna con ID {column_id}")
-
-            # Obtener el board_id de la columna
-            board_id = column.get('board_id')
-            if not board_id:
-                raise Exception(f"La columna {column_id} no tiene un board_id asociado")
-
-            # Obtener todas las columnas del board
-            columns = self.get_columns(board_id)
-            if not columns:
-                raise Exception(f"No se encontraron columnas para el board {board_id}")
-
-            # Encontrar la primera columna disponible (diferente a la que se va a eliminar)
-            target_column = next((col for col in columns if col['id'] != column_id), None)
-            if not target_column:
-                raise Exception("No hay columnas disponibles para mover las tarjetas")
-
-            # Obtener todas las tarjetas de la columna a eliminar
-            cards = self.get_cards(column_id)
-            logger.info(f"Tarjetas encontradas en la columna: {len(cards)}")
-
-            # Mover cada tarjeta a la columna destino
-            for card in cards:
-                try:
-                    # Obtener el número de tarjetas en la columna destino
-                    target_cards = self.get_cards(target_column['id'])
-                    new_order = len(target_cards)
-
-                    # Actualizar la tarjeta con la nueva columna y orden
-                    self.table.update_item(
-                        Key={'id': card['id']},
-                        UpdateExpression="SET column_id = :column_id, #o = :order, updated_at = :updated_at",
-                        ExpressionAttributeValues={
-                            ':column_id': target_column['id'],
-                            ':order': new_order,
-                            ':updated_at': datetime.utcnow().isoformat()
-                        },
-                        ExpressionAttributeNames={'#o': 'order'}
-                    )
-                    logger.info(f"Tarjeta {card['id']} movida a la columna {target_column['id']}")
-                except Exception as e:
-                    logger.error(f"Error al mover tarjeta {card['id']}: {str(e)}")
-                    raise
-
-            # Eliminar la columna
-            response = self.table.delete_item(
-                Key={'id': column_id},
-                ReturnValues='ALL_OLD'
+            self._retry_on_conflict(
+                lambda: self._delete_column_once(column_id, progress),
+                "eliminar la columna"
             )
-            
-            deleted_column = response.get('Attributes')
-            logger.info(f"Columna eliminada: {deleted_column}")
             return True
         except Exception as e:
             logger.error(f"Error al eliminar columna: {str(e)}")
             raise
 
+    def _delete_column_once(self, column_id, progress=None):
+        # Verificar si la columna existe
+        column = self._get_item(column_id, 'column')
+        if not column:
+            raise Exception(f"No se encontró la columna con ID {column_id}")
+
+        # Obtener el board_id de la columna
+        board_id = column.get('board_id')
+        if not board_id:
+            raise Exception(f"La columna {column_id} no tiene un board_id asociado")
+
+        # Obtener todas las columnas del board
+        columns = self.get_columns(board_id)
+        if not columns:
+            raise Exception(f"No se encontraron columnas para el board {board_id}")
+
+        # Encontrar la primera columna disponible (diferente a la que se va a eliminar)
+        target_column = next((col for col in columns if col['id'] != column_id), None)
+        if not target_column:
+            raise Exception("No hay columnas disponibles para mover las tarjetas")
+        target_column = self._get_item(target_column['id'], 'column')
+
+        # Obtener todas las tarjetas de la columna a eliminar
+        cards = self.get_cards(column_id)
+        logger.info(f"Tarjetas encontradas en la columna: {len(cards)}")
+
+        # Las tarjetas se añaden al final de la destino en su orden actual:
+        # basta con leer la última tarjeta para calcular todos los ranks. Su
+        # ``order`` no se escribe; se deduce del rank al leer.
+        _, new_rank = self._insert_position(target_column['id'], None)
+        if new_rank is None:
+            target_cards = self.get_cards(target_column['id'])
+            new_rank = self._rank_for_insert(target_cards, len(target_cards), target_column)
+        now = datetime.utcnow().isoformat()
+        operations = [self._touch_operation(target_column)]
+        moved = [self._after_write(target_column)]
+        # Una reserva por título: los movimientos no comprueban duplicados, así
+        # que la columna puede tener varias tarjetas con el mismo, y dos
+        # operaciones sobre un mismo item hacen fallar la transacción (o
+        # chocar entre bloques). La reserva es de la primera en el orden
+        # actual; basta con que una tarjeta de la columna la tenga.
+        claimed = set()
+        for card in cards:
+            values = {
+                'column_id': target_column['id'],
+                'rank': new_rank,
+                'updated_at': now
+            }
+            if card.get('pk'):
+                values['sk'] = card_sort_key(target_column['id'], card['id'])
+            operations.append(self._update_operation(card, values))
+            if card.get('title') and card['title'] not in claimed:
+                claimed.add(card['title'])
+                operations.append(self._claim_title_operation(target_column['id'], card['title'], card['id']))
+            moved.append(self._after_write(card, values))
+            new_rank = rank_between(new_rank, None)
+
+        # Las reservas de la columna (``claimed`` tiene todos los títulos de
+        # sus tarjetas) dejan de servir; van justo antes de su borrado para
+        # que caigan, en lo posible, en su misma transacción
+        operations.extend(self._drop_titles_operations(column_id, claimed))
+        # El borrado de la columna va en la última transacción, así la
+        # columna no desaparece si falla el traslado de alguna tarjeta. Su
+        # versión detecta tarjetas que se hayan movido a ella entretanto.
+        operations.extend(self._delete_operations(column))
+        operations.extend(self._snapshot_operations(board_id, upserts=moved, removals=[column_id]))
+        self._transact_write_bulk(operations, progress, f"eliminar la columna {column_id}")
+        logger.info(f"{len(cards)} tarjetas movidas a la columna {target_column['id']}")
+        logger.info(f"Columna eliminada: {column}")
+
     def get_card(self, card_id: str) -> Optional[Dict]:
         try:
-            response = self.table.get_item(
-                Key={
-                    'id': card_id
-                }
-            )
-            card = response.get('Item')
-            if card and card.get('type') == 'card':
-                return card
-            return None
+            return self._get_item(card_id, 'card')
         except Exception as e:
             logger.error(f"Error al obtener card {card_id}: {str(e)}")
             return None
 
     def move_card(self, card_id: str, column_id: str, card_order: int) -> Optional[Dict]:
         try:
-            # Obtener la tarjeta actual
-            card = self.get_card(card_id)
-            if not card:
-                logger.error(f"Card {card_id} not found")
-                return None
+            return self._retry_on_conflict(
+                lambda: self._move_card_once(card_id, column_id, card_order),
+                "mover la tarjeta"
+            )
+        except ConcurrentModificationError:
+            raise
+        except Exception as e:
+            logger.error(f"Error moving card {card_id}: {str(e)}")
+            return None
 
-            # Obtener el column_id actual
-            current_column_id = card.get('column_id')
-            
-            # Si la tarjeta ya está en la columna destino y tiene el mismo orden, no hacer nada
-            if current_column_id == column_id and card.get('order') == card_order:
-                return card
-
-            # Obtener todas las tarjetas de la columna destino
-            dest_cards = self.get_cards(column_id)
-            dest_cards.sort(key=lambda x: x.get('order', 0))
-
-            # Si la tarjeta se está moviendo a una columna diferente
-            if current_column_id != column_id:
-                # Obtener todas las tarjetas de la columna origen
-                source_cards = self.get_cards(current_column_id)
-                source_cards.sort(key=lambda x: x.get('order', 0))
-
-                # Remover la tarjeta de la columna origen
-                source_cards = [c for c in source_cards if c['id'] != card_id]
-                
-                # Reordenar las tarjetas en la columna origen
-                for index, c in enumerate(source_cards):
-                    self.table.update_item(
-                        Key={'id': c['id']},
-                        UpdateExpression="SET #o = :order, updated_at = :updated_at",
-                        ExpressionAttributeValues={
-                            ':order': index,
-                            ':updated_at': datetime.utcnow().isoformat()
-                        },
-                        ExpressionAttributeNames={'#o': 'order'}
-                    )
+    def _move_card_once(self, card_id, column_id, card_order):
+        # Obtener la tarjeta actual
+        card = self.get_card(card_id)
+        if not card:
+            logger.error(f"Card {card_id} not found")
+            return None
 
-            # Insertar la tarjeta en la nueva posición
-            dest_cards.insert(card_order, card)
-            
-            # Reordenar todas las tarjetas en la columna destino
-            for index, c in enumerate(dest_cards):
-                self.table.update_item(
-                    Key={'id': c['id']},
-                    UpdateExpression="SET column_id = :column_id, #o = :order, updated_at = :updated_at",
-                    ExpressionAttributeValues={
-                        ':column_id': column_id,
-                        ':order': index,
-                        ':updated_at': datetime.utcnow().isoformat()
-                    },
-                    ExpressionAttributeNames={'#o': 'order'}
-                )
+        # La versión de la columna destino protege el orden de sus tarjetas
+        column = self._get_item(column_id, 'column')
+        if not column:
+            logger.error(f"Column {column_id} not found")
+            return None
 
-            # Obtener la tarjeta actualizada
-            updated_card = self.get_card(card_id)
-            return updated_card
+        # Obtener el column_id actual
+        current_column_id = card.get('column_id')
 
-        except Exception as e:
-            logger.error(f"Error moving card {card_id}: {str(e)}")
-            return None
+        # Tarjetas de la columna destino (ya ordenadas), sin la que se mueve.
+        # Salen del índice: pueden no incluir aún un alta o movimiento
+        # reciente (ver _retry_on_conflict)
+        column_cards = self.get_cards(column_id)
+        current_position = next(
+            (index for index, c in enumerate(column_cards) if c['id'] == card_id),
+            None
+        )
+        dest_cards = [c for c in column_cards if c['id'] != card_id]
+        position = self._clamp_position(card_order, dest_cards)
+
+        # Si la tarjeta ya está en la columna destino y en la misma posición, no hacer nada
+        if current_column_id == column_id and current_position == position:
+            card['order'] = position
+            return card
+
+        # Calcular un rank entre los nuevos vecinos: solo se escribe esta tarjeta
+        rank = self._rank_for_insert(dest_cards, position, column)
+        values = {
+            'column_id': column_id,
+            'order': position,
+            'rank': rank,
+            'updated_at': datetime.utcnow().isoformat()
+        }
+        if column.get('board_id'):
+            # La tarjeta pasa a colgar de su nueva columna dentro de la partición
+            values['pk'] = partition_key(column['board_id'])
+            values['sk'] = card_sort_key(column_id, card_id)
+        operations = [
+            self._update_operation(card, values),
+            self._touch_operation(column)
+        ]
+        if current_column_id != column_id and card.get('title'):
+            operations.extend(self._release_title_operations(current_column_id, card['title'], card_id))
+            operations.append(self._claim_title_operation(column_id, card['title'], card_id))
+        upserts = [self._after_write(card, values), self._after_write(column)]
+        source_board_id = self._card_board_id(card)
+        if source_board_id and source_board_id != column.get('board_id'):
+            # Movimiento entre tableros: sale de una instantánea y entra en otra
+            operations.extend(self._snapshot_operations(source_board_id, removals=[card_id]))
+        operations.extend(self._snapshot_operations(column.get('board_id'), upserts=upserts))
+        self._transact_write(operations)
+
+        # Devolver la tarjeta actualizada
+        return {**card, **values, 'version': self._next_version(card)}
 
     def _reorder_cards_in_column(self, column_id: str):
-        """Reordena las tarjetas en una columna específica."""
+        """Reasigna ranks consecutivos a las tarjetas de una columna."""
         try:
-            # Obtener todas las tarjetas de la columna
-            cards = self.get_cards(column_id)
-            if not cards:
-                return
-
-            # Ordenar las tarjetas por su orden actual
-            cards.sort(key=lambda x: x.get('order', 0))
+            def attempt():
+                column = self._get_item(column_id, 'column')
+                # Obtener todas las tarjetas de la columna, ya ordenadas
+                cards = self.get_cards(column_id)
+                if column and cards:
+                    self._write_ranks(cards, column)
 
-            # Actualizar el orden de cada tarjeta
-            for index, card in enumerate(cards):
-                self.table.update_item(
-                    Key={
-                        'id': card['id']
-                    },
-                    UpdateExpression="SET #o = :order, updated_at = :updated_at",
-                    ExpressionAttributeValues={
-                        ':order': index,
-                        ':updated_at': datetime.utcnow().isoformat()
-                    },
-                    ExpressionAttributeNames={
-                        '#o': 'order'
-                    }
-                )
+            self._retry_on_conflict(attempt, "reordenar las tarjetas")
         except Exception as e:
             logger.error(f"Error reordering cards in column {column_id}: {str(e)}")
 
-    def fix_card_orders(self):
+    def fix_card_orders(self, board_id=None):
         """
-        Actualiza el orden de todas las tarjetas que tienen order: NULL
+        Repara los ranks de las columnas y tarjetas de ``board_id`` (sin él,
+        de toda la tabla) con el motor de repair.py, sin límite de capacidad
+        ni checkpoint. Para toda la tabla es mejor ``python manage.py
+        repair_card_orders``.
         """
         try:
-            # Obtener todas las columnas
-            columns = self.table.query(
-                IndexName='TypeIndex',
-                KeyConditionExpression='#t = :type',
-                ExpressionAttributeNames={
-                    '#t': 'type'
-                },
-                ExpressionAttributeValues={
-                    ':type': 'column'
-                }
-            ).get('Items', [])
-
-            now = datetime.utcnow().isoformat()
+            engine = RepairEngine(self, workers=self.max_parallel_queries)
+            return engine.repair_board(board_id) if board_id else engine.run()
+        except Exception as e:
+            logger.error(f"Error al actualizar el orden de las tarjetas: {str(e)}")
+            raise
 
-            # Para cada columna, actualizar el orden de sus tarjetas
-            for column in columns:
-                column_id = column['id']
-                cards = self.get_cards(column_id)
-                
-                # Ordenar las tarjetas por fecha de creación si no tienen orden
-                cards.sort(key=lambda x: x.get('created_at', ''))
-                
-                # Actualizar el orden de todas las tarjetas
-                with self.table.batch_writer() as batch:
-                    for index, card in enumerate(cards):
-                        if card.get('order') is None:
+    def load_items(self, items):
+        """
+        Escribe los items con BatchWriteItem (25 por llamada, reintentando los
+        no procesados), con sus claves de partición, de cambios y las reservas
+        de título de las tarjetas. Con instantáneas se regeneran al final las
+        de los tableros afectados.
+        """
+        board_by_column = {}
+        boards = set()
+        written = 0
+        try:
+            with self.table.batch_writer() as batch:
+                for item in items:
+                    stored = {'version': 1, **item}
+                    if stored['type'] == 'board':
+                        board_id = stored['id']
+                    elif stored['type'] == 'column':
+                        board_id = board_by_column[stored['id']] = stored['board_id']
+                    else:
+                        column_id = stored['column_id']
+                        if column_id not in board_by_column:
+                            column = self._get_item(column_id, 'column')
+                            board_by_column[column_id] = column.get('board_id') if column else None
+                        board_id = board_by_column[column_id]
+                        if stored.get('title'):
+                            title_key_id = _title_key_id(column_id, stored['title'])
                             batch.put_item(Item={
-                                **card,
-                                'order': index,
-                                'updated_at': now
+                                'id': title_key_id,
+                                'type': TITLE_KEY_TYPE,
+                                'card_id': stored['id'],
+                                'version': 1,
+                                **change_attributes(title_key_id)
                             })
+                    if board_id:
+                        stored.update(layout_keys(stored, board_id))
+                        boards.add(board_id)
+                    stored.update(change_attributes(stored['id']))
+                    batch.put_item(Item=stored)
+                    written += 1
+            if self.snapshots:
+                for board_id in boards:
+                    self.rebuild_board_snapshot(board_id)
+            return written
+        except Exception as e:
+            logger.error(f"Error al cargar items: {str(e)}")
+            raise
 
-            return True
+    def backfill_title_keys(self):
+        """
+        Crea las reservas de título de las tarjetas anteriores a ellas, para
+        que create_card detecte duplicados sin leer la columna. Devuelve el
+        número de reservas creadas.
+        """
+        created = 0
+        try:
+            for column in self.iter_items_by_type('column', fields={'id'}):
+                for card in self.iter_cards(column['id'], fields={'id', 'title'}):
+                    if not card.get('title'):
+                        continue
+                    try:
+                        self.table.put_item(
+                            Item={
+                                'id': _title_key_id(column['id'], card['title']),
+                                'type': TITLE_KEY_TYPE,
+                                'card_id': card['id'],
+                                'version': 1,
+                                **change_attributes(_title_key_id(column['id'], card['title']))
+                            },
+                            ConditionExpression='attribute_not_exists(id)'
+                        )
+                        created += 1
+                    except ClientError as e:
+                        # Ya reservado (por esta tarjeta o por un duplicado)
+                        if not _is_conflict(e):
+                            raise
+            return created
         except Exception as e:
-            logger.error(f"Error al actualizar el orden de las tarjetas: {str(e)}")
-            raise 
\ No newline at end of file
+            logger.error(f"Error al crear las reservas de título: {str(e)}")
+            raise
+
+    def backfill_partition_keys(self, dry_run=False):
+        """
+        Rellena ``pk``/``sk`` (ver layout.py) en los items creados antes de la
+        disposición por partición. Es idempotente y se puede ejecutar con la
+        aplicación en marcha: las escrituras nuevas ya llevan las claves y una
+        tarjeta que cambia de columna mientras tanto no se toca (la condición
+        sobre ``column_id`` falla y la clave correcta la pone el movimiento).
+
+        Devuelve ``{'updated', 'unchanged', 'skipped'}``.
+        """
+        counts = {'updated': 0, 'unchanged': 0, 'skipped': 0}
+
+        def backfill(item, board_id, condition, values):
+            keys = layout_keys(item, board_id)
+            if item.get('pk') == keys['pk'] and item.get('sk') == keys['sk']:
+                counts['unchanged'] += 1
+                return
+            if dry_run:
+                counts['updated'] += 1
+                return
+            change = change_attributes(item['id'])
+            try:
+                self.table.update_item(
+                    Key={'id': item['id']},
+                    UpdateExpression='SET pk = :pk, sk = :sk, change_bucket = :bucket, changed_at = :changed_at',
+                    ConditionExpression=condition,
+                    ExpressionAttributeValues={
+                        ':pk': keys['pk'],
+                        ':sk': keys['sk'],
+                        ':bucket': change['change_bucket'],
+                        ':changed_at': change['changed_at'],
+                        **values
+                    }
+                )
+                counts['updated'] += 1
+            except ClientError as e:
+                if not _is_conflict(e):
+                    raise
+                # Borrado o movido entre la lectura y la escritura
+                counts['skipped'] += 1
+
+        fields = {'id', 'type', 'pk', 'sk', 'board_id', 'column_id'}
+        try:
+            for board in self.iter_items_by_type('board', fields=fields):
+                backfill(board, board['id'], 'attribute_exists(id)', {})
+                for column in self.iter_columns(board['id'], fields=fields):
+                    backfill(column, board['id'], 'board_id = :board_id', {':board_id': board['id']})
+                    for card in self.iter_cards(column['id'], fields=fields):
+                        backfill(card, board['id'], 'column_id = :column_id', {':column_id': column['id']})
+            return counts
+        except Exception as e:
+            logger.error(f"Error al migrar las claves de partición: {str(e)}")
+            raise
@@ -0,0 +1,86 @@
+"""
+Disposición de un tablero en una sola partición.
+
+Además de su ``id``, cada item lleva ``pk`` (común a todo el tablero) y ``sk``
+(jerárquica), indexados por BoardItemsIndex::
+
+    pk = BOARD#<board_id>   sk = BOARD
+                            sk = COLUMN#<column_id>
+                            sk = COLUMN#<column_id>#CARD#<card_id>
+
+Así un único Query paginado devuelve el board, sus columnas y sus tarjetas,
+agrupadas por columna, en lugar de 1 + N_columnas consultas. Con
+DYNAMODB_BOARD_LAYOUT='partition' las lecturas usan este índice; antes hay que
+rellenar las claves de los items antiguos con
+``python manage.py migrate_board_layout``.
+"""
+from kanban_backend.boards.changes import CHANGE_ATTRIBUTES
+from kanban_backend.boards.ranking import sort_by_rank
+
+BOARD_ITEMS_INDEX = 'BoardItemsIndex'
+LAYOUTS = ('index', 'partition')
+
+# Atributos que necesita assemble_board además de los pedidos
+ASSEMBLY_ATTRIBUTES = {'type', 'sk', 'column_id', 'board_id'}
+
+# Claves de los índices internos (este y ChangesIndex, ver changes.py): no
+# forman parte del modelo que ve la API
+LAYOUT_ATTRIBUTES = {'pk', 'sk'} | CHANGE_ATTRIBUTES
+
+
+def partition_key(board_id):
+    return f'BOARD#{board_id}'
+
+
+def board_id_from_partition(pk):
+    """board_id de una clave ``pk``, o None si el item no la tiene."""
+    if pk and pk.startswith('BOARD#'):
+        return pk[len('BOARD#'):]
+    return None
+
+
+def column_sort_key(column_id):
+    return f'COLUMN#{column_id}'
+
+
+def card_sort_key(column_id, card_id):
+    return f'COLUMN#{column_id}#CARD#{card_id}'
+
+
+def layout_keys(item, board_id):
+    """Devuelve ``{'pk', 'sk'}`` para un board, columna o tarjeta del tablero."""
+    if item['type'] == 'column':
+        sort_key = column_sort_key(item['id'])
+    elif item['type'] == 'card':
+        sort_key = card_sort_key(item['column_id'], item['id'])
+    else:
+        sort_key = 'BOARD'
+    return {'pk': partition_key(board_id), 'sk': sort_key}
+
+
+def without_layout_keys(item):
+    """Copia de ``item`` sin las claves de BoardItemsIndex y ChangesIndex."""
+    return {key: value for key, value in item.items() if key not in LAYOUT_ATTRIBUTES}
+
+
+def assemble_board(items):
+    """
+    Monta ``{'board', 'columns', 'cards'}`` a partir de los items de la
+    partición. Las tarjetas de columnas que ya no existen se ignoran.
+    """
+    board = None
+    columns = []
+    cards = {}
+    for item in items:
+        if item.get('type') == 'column':
+            columns.append(item)
+        elif item.get('type') == 'card':
+            cards.setdefault(item.get('column_id'), []).append(item)
+        else:
+            board = item
+    columns = sort_by_rank(columns)
+    return {
+        'board': board,
+        'columns': columns,
+        'cards': {column['id']: sort_by_rank(cards.get(column['id'], [])) for column in columns},
+    }
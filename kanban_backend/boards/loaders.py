@@ -0,0 +1,162 @@
+"""
+Cargadores por petición para los resolvers anidados board -> columns -> cards.
+
+Cada resolver padre registra de antemano las claves de sus hijos, de modo que
+la primera carga de un nivel del árbol trae de una vez los datos de todos los
+hermanos en lugar de hacer una consulta por cada padre.
+
+En el endpoint asíncrono ``load`` devuelve un awaitable: los resolvers hermanos
+se ejecutan a la vez y el lote se lanza cuando todos han registrado su clave.
+"""
+import asyncio
+import logging
+
+from kanban_backend.boards.cache import get_board_trees
+
+logger = logging.getLogger(__name__)
+
+# Atributo del contexto (la HttpRequest) donde se guardan los cargadores
+CONTEXT_ATTRIBUTE = '_board_loaders'
+
+
+class BatchLoader:
+    """Caché por petición que agrupa en un único lote las claves pendientes."""
+
+    def __init__(self, batch_fn, on_load=None):
+        # batch_fn recibe una lista de claves y devuelve {clave: valor}
+        self.batch_fn = batch_fn
+        self.on_load = on_load
+        self._cache = {}
+        self._pending = []
+
+    def queue(self, keys):
+        """Registra claves que se cargarán en el próximo lote."""
+        for key in keys:
+            if key not in self._cache and key not in self._pending:
+                self._pending.append(key)
+
+    def prime(self, key, value):
+        self._cache[key] = value
+
+    def load(self, key):
+        if key not in self._cache:
+            self.queue([key])
+            self._dispatch()
+        return self._cache.get(key, [])
+
+    def _dispatch(self):
+        keys, self._pending = self._pending, []
+        logger.debug(f"Cargando lote de {len(keys)} claves")
+        results = self.batch_fn(keys)
+        for key in keys:
+            self._cache[key] = results.get(key, [])
+        if self.on_load:
+            self.on_load({key: self._cache[key] for key in keys})
+
+
+class AsyncBatchLoader(BatchLoader):
+    """BatchLoader cuyo lote se ejecuta en el pool de un AsyncDynamoDBAdapter."""
+
+    def __init__(self, batch_fn, run, on_load=None):
+        super().__init__(batch_fn, on_load=on_load)
+        self.run = run
+        self._batch = None
+
+    async def load(self, key):
+        while key not in self._cache:
+            self.queue([key])
+            if self._batch is None:
+                self._batch = asyncio.ensure_future(self._dispatch_async())
+            await self._batch
+        return self._cache[key]
+
+    async def _dispatch_async(self):
+        # Ceder el turno para que los resolvers hermanos registren sus claves
+        await asyncio.sleep(0)
+        keys, self._pending = self._pending, []
+        # Las claves que lleguen a partir de aquí irán en el siguiente lote
+        self._batch = None
+        logger.debug(f"Cargando lote asíncrono de {len(keys)} claves")
+        results = await self.run(self.batch_fn, keys)
+        for key in keys:
+            self._cache[key] = results.get(key, [])
+        if self.on_load:
+            self.on_load({key: self._cache[key] for key in keys})
+
+
+def _merge_fields(current, requested):
+    if current is None or requested is None:
+        return None
+    return current | set(requested)
+
+
+class BoardLoaders:
+    """Agrupa los cargadores de columnas (por board_id) y tarjetas (por column_id)."""
+
+    def __init__(self, db):
+        self.db = db
+        # Atributos pedidos por los resolvers (None: el item completo)
+        self.column_fields = set()
+        self.card_fields = set()
+        self.cards = self._loader(self._load_cards)
+        self.columns = self._loader(self._load_board_trees, on_load=self._queue_cards)
+
+    def select(self, columns=None, cards=None):
+        """Añade los atributos que necesita un resolver antes de lanzar el lote."""
+        self.column_fields = _merge_fields(self.column_fields, columns)
+        self.card_fields = _merge_fields(self.card_fields, cards)
+
+    def _load_cards(self, column_ids):
+        return self.db.get_cards_for_columns(column_ids, fields=self.card_fields or None)
+
+    def _load_board_trees(self, board_ids):
+        # Los árboles (de la caché o recién montados) traen también las
+        # tarjetas, así que las columnas ya no necesitan su propio lote
+        trees = get_board_trees(
+            self.db,
+            board_ids,
+            column_fields=self.column_fields or None,
+            card_fields=self.card_fields or None
+        )
+        for tree in trees.values():
+            for column_id, cards in tree['cards'].items():
+                self.cards.prime(column_id, cards)
+        return {board_id: tree['columns'] for board_id, tree in trees.items()}
+
+    def _loader(self, batch_fn, on_load=None):
+        return BatchLoader(batch_fn, on_load=on_load)
+
+    def _queue_cards(self, columns_by_board):
+        # Las tarjetas de todas las columnas recién cargadas forman el siguiente nivel
+        for columns in columns_by_board.values():
+            self.cards.queue(column['id'] for column in columns)
+
+
+class AsyncBoardLoaders(BoardLoaders):
+    """Cargadores del endpoint asíncrono; ``async_db`` es un AsyncDynamoDBAdapter."""
+
+    def __init__(self, async_db):
+        self.async_db = async_db
+        super().__init__(async_db.adapter)
+
+    def _loader(self, batch_fn, on_load=None):
+        return AsyncBatchLoader(batch_fn, self.async_db.run, on_load=on_load)
+
+
+def get_loaders(info, db):
+    """
+    Devuelve los cargadores asociados a la petición en curso. La vista
+    asíncrona instala AsyncBoardLoaders en el contexto antes de ejecutar.
+    """
+    context = info.context
+    if context is None:
+        # Sin contexto (p. ej. ejecución directa del schema) no hay dónde
+        # compartirlos entre resolvers
+        return BoardLoaders(db)
+    if isinstance(context, dict):
+        return context.setdefault(CONTEXT_ATTRIBUTE, BoardLoaders(db))
+    loaders = getattr(context, CONTEXT_ATTRIBUTE, None)
+    if loaders is None:
+        loaders = BoardLoaders(db)
+        setattr(context, CONTEXT_ATTRIBUTE, loaders)
+    return loaders
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from kanban_backend.boards.dynamodb import DynamoDBAdapter
+
+
+class Command(BaseCommand):
+    help = (
+        'Crea las reservas de título de las tarjetas existentes para que la '
+        'comprobación de duplicados al crear tarjetas no lea la columna'
+    )
+
+    def handle(self, *args, **options):
+        try:
+            created = DynamoDBAdapter().backfill_title_keys()
+        except Exception as e:
+            raise CommandError(f"Error al crear las reservas de título: {str(e)}")
+        self.stdout.write(self.style.SUCCESS(f"{created} reservas de título creadas"))
@@ -0,0 +1,81 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from kanban_backend.boards.benchmark import (
+    BACKENDS, DEFAULT_SIZES, SCENARIOS, BoardBenchmark, compare_reports
+)
+
+
+def _list(value):
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide latencia (p50-p99), llamadas a DynamoDB y memoria de las consultas y '
+        'mutaciones GraphQL del frontend sobre tableros de varios tamaños'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backend', choices=BACKENDS, default='memory', help='Almacenamiento a medir')
+        parser.add_argument(
+            '--sizes', type=_list, default=[str(size) for size in DEFAULT_SIZES],
+            help='Tarjetas por tablero, separadas por comas'
+        )
+        parser.add_argument('--columns', type=int, default=5, help='Columnas por tablero')
+        parser.add_argument(
+            '--scenarios', type=_list, default=list(SCENARIOS),
+            help=f"Escenarios separados por comas ({', '.join(SCENARIOS)})"
+        )
+        parser.add_argument('--iterations', type=int, default=20, help='Iteraciones medidas por escenario')
+        parser.add_argument(
+            '--heavy-iterations', type=int, default=3,
+            help='Iteraciones de deleteColumn y fixCardOrders'
+        )
+        parser.add_argument('--warmup', type=int, default=2, help='Iteraciones de calentamiento sin medir')
+        parser.add_argument('--seed', type=int, default=42, help='Semilla de los datos y las operaciones')
+        parser.add_argument('--with-cache', action='store_true', help='Medir con la caché de tableros activa')
+        parser.add_argument('--no-memory', action='store_true', help='Sin la ejecución extra con tracemalloc')
+        parser.add_argument('--keep', action='store_true', help='No borrar las tablas temporales de DynamoDB')
+        parser.add_argument('--output', help='Fichero JSON del informe (por defecto, la salida estándar)')
+        parser.add_argument('--compare', help='Informe anterior con el que buscar regresiones')
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help='Aumento de p95 admitido frente a --compare (fracción)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            benchmark = BoardBenchmark(
+                backend=options['backend'],
+                sizes=[int(size) for size in options['sizes']],
+                columns=options['columns'],
+                iterations=options['iterations'],
+                heavy_iterations=options['heavy_iterations'],
+                warmup=options['warmup'],
+                seed=options['seed'],
+                scenarios=options['scenarios'],
+                cache=options['with_cache'],
+                trace_memory=not options['no_memory'],
+                keep_tables=options['keep'],
+                progress=lambda message: self.stderr.write(message),
+            )
+            report = benchmark.run()
+        except Exception as e:
+            raise CommandError(f"Error al ejecutar el benchmark: {str(e)}")
+
+        if options['compare']:
+            with open(options['compare']) as f:
+                report['regressions'] = compare_reports(json.load(f), report, tolerance=options['tolerance'])
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stderr.write(self.style.SUCCESS(f"Informe guardado en {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+        if report.get('regressions'):
+            raise CommandError(f"{len(report['regressions'])} regresiones frente a {options['compare']}")
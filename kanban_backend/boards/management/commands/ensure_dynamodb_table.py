@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from kanban_backend.boards.connection import dynamodb_setting, get_dynamodb_resource
+from kanban_backend.boards.provisioning import ensure_table
+
+
+class Command(BaseCommand):
+    help = 'Crea la tabla de DynamoDB y sus índices si no existen y espera a que estén activos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--timeout', type=float, default=300,
+            help='Segundos máximos de espera a que la tabla y los índices estén activos'
+        )
+        parser.add_argument(
+            '--no-wait', action='store_true',
+            help='No esperar a que la tabla esté activa'
+        )
+
+    def handle(self, *args, **options):
+        table_name = dynamodb_setting('DYNAMODB_TABLE_NAME')
+        client = get_dynamodb_resource().meta.client
+        try:
+            changed = ensure_table(
+                client,
+                table_name,
+                wait=not options['no_wait'],
+                timeout=options['timeout']
+            )
+        except Exception as e:
+            raise CommandError(f"Error al preparar la tabla {table_name}: {str(e)}")
+
+        if changed:
+            self.stdout.write(self.style.SUCCESS(f"Tabla {table_name} creada o actualizada"))
+        else:
+            self.stdout.write(f"Tabla {table_name} ya estaba lista")
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from kanban_backend.boards.dynamodb import DynamoDBAdapter
+
+
+class Command(BaseCommand):
+    help = (
+        'Rellena las claves pk/sk de BoardItemsIndex en los items existentes. '
+        'Después se puede activar DYNAMODB_BOARD_LAYOUT=partition'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Contar los items que se actualizarían sin escribir nada'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            counts = DynamoDBAdapter().backfill_partition_keys(dry_run=options['dry_run'])
+        except Exception as e:
+            raise CommandError(f"Error al migrar la disposición de los tableros: {str(e)}")
+
+        prefix = 'Se actualizarían' if options['dry_run'] else 'Actualizados'
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {counts['updated']} items; {counts['unchanged']} ya estaban "
+            f"migrados y {counts['skipped']} cambiaron durante la migración"
+        ))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from kanban_backend.boards.dynamodb import DynamoDBAdapter
+
+
+class Command(BaseCommand):
+    help = (
+        'Regenera la instantánea materializada de los tableros a partir de sus '
+        'columnas y tarjetas (al activar DYNAMODB_BOARD_SNAPSHOTS o si se han desincronizado)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--board', action='append', dest='boards', metavar='BOARD_ID',
+            help='Regenerar solo este tablero (se puede repetir)'
+        )
+
+    def handle(self, *args, **options):
+        db = DynamoDBAdapter()
+        try:
+            if options['boards']:
+                counts = {'rebuilt': 0, 'skipped': 0}
+                for board_id in options['boards']:
+                    size = db.rebuild_board_snapshot(board_id)
+                    counts['skipped' if size is None else 'rebuilt'] += 1
+            else:
+                counts = db.rebuild_snapshots()
+        except Exception as e:
+            raise CommandError(f"Error al regenerar las instantáneas: {str(e)}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{counts['rebuilt']} instantáneas regeneradas; {counts['skipped']} tableros "
+            f"sin instantánea (no existen o son demasiado grandes)"
+        ))
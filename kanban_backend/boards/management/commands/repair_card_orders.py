@@ -0,0 +1,63 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from kanban_backend.boards.cache import board_cache
+from kanban_backend.boards.dynamodb import DynamoDBAdapter
+from kanban_backend.boards.repair import RepairEngine
+
+
+class Command(BaseCommand):
+    help = (
+        'Detecta y repara ranks ausentes, duplicados o demasiado largos en todas '
+        'las columnas y tarjetas, con Scans segmentados en paralelo'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--segments', type=int, default=4, help='Segmentos del Scan paralelo')
+        parser.add_argument('--workers', type=int, default=4, help='Hilos de lectura y reparación')
+        parser.add_argument(
+            '--capacity-share', type=float, default=0.5,
+            help=(
+                'Fracción de la capacidad provisionada de la tabla y de los índices '
+                'que lee que puede consumir (0: sin límite)'
+            )
+        )
+        parser.add_argument(
+            '--max-read-units', type=float, default=None,
+            help='RCU por segundo de la tabla y de cada índice si son bajo demanda o sin --capacity-share'
+        )
+        parser.add_argument(
+            '--max-write-units', type=float, default=None,
+            help='WCU por segundo si la tabla es bajo demanda o sin --capacity-share'
+        )
+        parser.add_argument(
+            '--checkpoint', default='repair_checkpoint.json',
+            help='Fichero donde se guarda el progreso (más los registros <fichero>.parents y <fichero>.done)'
+        )
+        parser.add_argument('--resume', action='store_true', help='Continuar desde el checkpoint')
+        parser.add_argument('--dry-run', action='store_true', help='Solo detectar, sin escribir')
+
+    def handle(self, *args, **options):
+        try:
+            engine = RepairEngine(
+                DynamoDBAdapter(),
+                segments=options['segments'],
+                workers=options['workers'],
+                capacity_share=options['capacity_share'] or None,
+                max_read_units=options['max_read_units'],
+                max_write_units=options['max_write_units'],
+                checkpoint_path=options['checkpoint'],
+                resume=options['resume'],
+                dry_run=options['dry_run'],
+            )
+            report = engine.run()
+        except Exception as e:
+            raise CommandError(
+                f"Error al reparar el orden: {str(e)}. "
+                f"Se puede reanudar con --resume --checkpoint {options['checkpoint']}"
+            )
+        finally:
+            if not options['dry_run']:
+                board_cache.clear()
+        self.stdout.write(self.style.SUCCESS(json.dumps(report, indent=2)))
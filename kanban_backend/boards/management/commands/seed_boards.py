@@ -0,0 +1,61 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from kanban_backend.boards.cache import board_cache
+from kanban_backend.boards.orm import DjangoBoardRepository
+from kanban_backend.boards.repository import create_repository
+from kanban_backend.boards.seeding import Seeder
+
+
+class Command(BaseCommand):
+    help = (
+        'Crea tableros sintéticos (N tableros x M columnas x K tarjetas) con textos y '
+        'tamaños de columna realistas, escribiendo en lotes desde varios hilos'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--boards', type=int, default=1, help='Número de tableros')
+        parser.add_argument('--columns', type=int, default=3, help='Columnas por tablero')
+        parser.add_argument('--cards', type=int, default=0, help='Tarjetas por tablero')
+        parser.add_argument(
+            '--skew', type=float, default=1.0,
+            help='Desequilibrio entre columnas (exponente de Zipf; 0: mismo tamaño)'
+        )
+        parser.add_argument('--seed', type=int, default=42, help='Semilla de los datos')
+        parser.add_argument('--workers', type=int, default=8, help='Hilos de escritura')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Items por lote')
+        parser.add_argument('--name', default='Mi Tablero Kanban', help='Nombre (o prefijo) de los tableros')
+
+    def handle(self, *args, **options):
+        db = create_repository()
+        workers = options['workers']
+        if isinstance(db, DjangoBoardRepository) and connection.vendor == 'sqlite':
+            # SQLite admite un único escritor: más hilos solo esperarían el bloqueo
+            workers = 1
+
+        def progress(written, seconds):
+            self.stderr.write(f"{written} items ({written / seconds:.0f} items/s)")
+
+        try:
+            report = Seeder(
+                db,
+                boards=options['boards'],
+                columns=options['columns'],
+                cards=options['cards'],
+                skew=options['skew'],
+                seed=options['seed'],
+                workers=workers,
+                batch_size=options['batch_size'],
+                name=options['name'],
+                progress=progress,
+            ).run()
+        except Exception as e:
+            raise CommandError(f"Error al crear los tableros: {str(e)}")
+        finally:
+            board_cache.clear()
+
+        if len(report['board_ids']) > 10:
+            report['board_ids'] = report['board_ids'][:10] + ['...']
+        self.stdout.write(self.style.SUCCESS(json.dumps(report, indent=2)))
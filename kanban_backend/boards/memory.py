@@ -0,0 +1,541 @@
+"""
+Almacenamiento de tableros en memoria (BOARD_STORAGE_BACKEND='memory').
+
+Implementa BoardRepository con las mismas reglas que DynamoDBAdapter (ranks,
+posición de las altas, reservas de título, versiones y mensajes de error)
+sobre diccionarios del proceso: los tests y los micro-benchmarks no
+dependen de DynamoDB Local y miden solo la lógica de negocio.
+
+Cada escritura mantiene los equivalentes de los índices de la tabla:
+
+- ids por tipo en orden de alta (TypeIndex);
+- hijos de cada board o columna (BoardIdIndex y ColumnIdIndex);
+- ``(rank, id)`` ordenados por padre (BoardRankIndex y ColumnRankIndex),
+  dispersos como en DynamoDB: los items sin rank no aparecen;
+- dueño de cada título por columna (las reservas ``title#...``).
+
+Un único RLock serializa las operaciones, así que no hay conflictos de
+versión que reintentar. Las lecturas devuelven copias, igual que una ida y
+vuelta a DynamoDB: quien las recibe puede modificarlas.
+"""
+import logging
+import threading
+import time
+import uuid
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Optional
+
+from kanban_backend.boards.ranking import (
+    MAX_RANK_LENGTH,
+    clamp_position,
+    initial_ranks,
+    rank_at,
+    rank_between,
+    sort_by_rank,
+)
+from kanban_backend.boards.repair import ISSUES, RANK_ISSUES, detect_issues
+from kanban_backend.boards.repository import BoardRepository, project
+
+logger = logging.getLogger(__name__)
+
+# Atributo que relaciona cada tipo con su padre
+PARENT_KEYS = {'column': 'board_id', 'card': 'column_id'}
+
+
+class _RankIndex:
+    """Pares ``(rank, id)`` de los hijos con rank de cada padre, ordenados."""
+
+    def __init__(self):
+        self._entries = defaultdict(list)
+
+    def add(self, parent_id, item):
+        if parent_id and item.get('rank') is not None:
+            insort(self._entries[parent_id], (item['rank'], item['id']))
+
+    def remove(self, parent_id, item):
+        entries = self._entries.get(parent_id)
+        if not entries or item.get('rank') is None:
+            return
+        key = (item['rank'], item['id'])
+        index = bisect_left(entries, key)
+        if index < len(entries) and entries[index] == key:
+            del entries[index]
+
+    def ids(self, parent_id, after=None):
+        """Ids en orden de rank, a continuación de ``after`` si se indica."""
+        entries = self._entries.get(parent_id, [])
+        start = bisect_right(entries, (after['rank'], after['id'])) if after else 0
+        return [item_id for _, item_id in entries[start:]]
+
+    def last(self, parent_id):
+        entries = self._entries.get(parent_id)
+        return entries[-1][1] if entries else None
+
+    def count(self, parent_id):
+        return len(self._entries.get(parent_id, ()))
+
+
+class InMemoryBoardRepository(BoardRepository):
+    """Boards, columnas y tarjetas en diccionarios del proceso."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._items = {}
+        # dict como conjunto ordenado: conserva el orden de alta
+        self._by_type = defaultdict(dict)
+        self._children = defaultdict(dict)
+        self._ranks = _RankIndex()
+        self._title_owners = {}
+
+    # Índices
+
+    @staticmethod
+    def _parent_id(item):
+        key = PARENT_KEYS.get(item.get('type'))
+        return item.get(key) if key else None
+
+    def _index(self, item):
+        self._by_type[item['type']][item['id']] = None
+        parent_id = self._parent_id(item)
+        if parent_id:
+            self._children[parent_id][item['id']] = None
+            self._ranks.add(parent_id, item)
+
+    def _unindex(self, item):
+        self._by_type[item['type']].pop(item['id'], None)
+        parent_id = self._parent_id(item)
+        if parent_id:
+            self._children[parent_id].pop(item['id'], None)
+            self._ranks.remove(parent_id, item)
+
+    def _store(self, item):
+        current = self._items.get(item['id'])
+        if current:
+            self._unindex(current)
+        self._items[item['id']] = item
+        self._index(item)
+
+    def _remove(self, item_id):
+        item = self._items.pop(item_id)
+        self._unindex(item)
+        self._children.pop(item_id, None)
+        return item
+
+    def _write(self, item_id, values=None):
+        """Aplica ``values`` al item guardado, incrementa su versión y devuelve una copia."""
+        current = self._items[item_id]
+        item = {**current, **(values or {}), 'version': (current.get('version') or 0) + 1}
+        self._store(item)
+        return dict(item)
+
+    def _stored(self, item_id, item_type):
+        item = self._items.get(item_id)
+        if item and item.get('type') == item_type:
+            return item
+        return None
+
+    def _children_of(self, parent_id, item_type):
+        return [
+            self._items[item_id]
+            for item_id in self._children.get(parent_id, ())
+            if self._items[item_id].get('type') == item_type
+        ]
+
+    # Lecturas
+
+    def iter_items_by_type(self, item_type, fields=None, page_size=None):
+        with self._lock:
+            items = [project(self._items[item_id], fields) for item_id in self._by_type.get(item_type, ())]
+        return iter(items)
+
+    def iter_columns(self, board_id, fields=None, page_size=None):
+        with self._lock:
+            items = [project(column, fields) for column in self._children_of(board_id, 'column')]
+        return iter(items)
+
+    def iter_cards(self, column_id, fields=None, page_size=None):
+        with self._lock:
+            items = [project(card, fields) for card in self._children_of(column_id, 'card')]
+        return iter(items)
+
+    def get_boards(self, fields=None):
+        try:
+            return list(self.iter_items_by_type('board', fields))
+        except Exception as e:
+            logger.error(f"Error al obtener boards: {str(e)}")
+            raise
+
+    def _get(self, item_id, item_type):
+        with self._lock:
+            item = self._stored(item_id, item_type)
+            return dict(item) if item else None
+
+    def get_board(self, board_id: str) -> Optional[Dict]:
+        return self._get(board_id, 'board')
+
+    def get_column(self, column_id: str) -> Optional[Dict]:
+        return self._get(column_id, 'column')
+
+    def get_card(self, card_id: str) -> Optional[Dict]:
+        return self._get(card_id, 'card')
+
+    def get_columns(self, board_id, fields=None):
+        """Columnas del board; con ``fields`` solo se devuelven esos atributos."""
+        return sort_by_rank(list(self.iter_columns(board_id, fields)))
+
+    def get_cards(self, column_id, fields=None):
+        """Tarjetas de la columna; con ``fields`` solo se devuelven esos atributos."""
+        return sort_by_rank(list(self.iter_cards(column_id, fields)))
+
+    def get_columns_page(self, board_id, limit, after=None, fields=None):
+        return self._rank_page(board_id, limit, after, fields)
+
+    def get_cards_page(self, column_id, limit, after=None, fields=None):
+        return self._rank_page(column_id, limit, after, fields)
+
+    def _rank_page(self, parent_id, limit, after, fields):
+        with self._lock:
+            ids = self._ranks.ids(parent_id, after)[:limit + 1]
+            items = [project(self._items[item_id], fields) for item_id in ids]
+        return items[:limit], len(items) > limit
+
+    # Ranks
+
+    def _insert_position(self, column_id, position):
+        """
+        ``(posición, rank)`` para insertar una tarjeta, con los vecinos del
+        índice por rank; rank None si hay que renumerar la columna.
+        """
+        if position is None:
+            last_id = self._ranks.last(column_id)
+            before, after = (self._items[last_id] if last_id else None), None
+            # El ``order`` guardado puede estar desfasado tras los movimientos
+            position = self._ranks.count(column_id)
+        else:
+            items = [self._items[item_id] for item_id in self._ranks.ids(column_id)[:position + 1]]
+            position = clamp_position(position, items)
+            before = items[position - 1] if position > 0 else None
+            after = items[position] if position < len(items) else None
+        try:
+            rank = rank_between(before and before['rank'], after and after['rank'])
+        except ValueError:
+            return position, None
+        return position, rank if len(rank) <= MAX_RANK_LENGTH else None
+
+    def _rank_for_insert(self, items, position, parent):
+        rank = rank_at(items, position)
+        if rank is None:
+            logger.info(f"Reasignando ranks de {len(items)} elementos")
+            self._write_ranks(items, parent)
+            rank = rank_at(items, position)
+        return rank
+
+    def _write_ranks(self, items, parent):
+        """Asigna ranks consecutivos a ``items`` (copias) respetando su orden."""
+        now = datetime.utcnow().isoformat()
+        for index, (item, rank) in enumerate(zip(items, initial_ranks(len(items)))):
+            written = self._write(item['id'], {'rank': rank, 'order': index, 'updated_at': now})
+            item.update(rank=rank, order=index, version=written['version'])
+        parent['version'] = self._write(parent['id'])['version']
+
+    def _claim_title(self, column_id, title, card_id):
+        if title:
+            self._title_owners[(column_id, title)] = card_id
+
+    def _release_title(self, column_id, title, card_id=None):
+        # Sin ``card_id`` se libera sea de quien sea (la columna se elimina)
+        if card_id is None or self._title_owners.get((column_id, title)) == card_id:
+            self._title_owners.pop((column_id, title), None)
+
+    def _title_in_use(self, column_id, title):
+        # Como las reservas de DynamoDB: solo cuenta si su dueño sigue en la
+        # columna con ese título
+        owner = self._stored(self._title_owners.get((column_id, title)), 'card')
+        return bool(owner) and owner.get('column_id') == column_id and owner.get('title') == title
+
+    # Escrituras
+
+    def create_board(self, name, type='board'):
+        try:
+            with self._lock:
+                existing_boards = self.get_boards()
+                if existing_boards:
+                    logger.info("Ya existe un tablero, retornando el primero encontrado")
+                    return existing_boards[0]['id']
+
+                board_id = str(uuid.uuid4())
+                now = datetime.utcnow().isoformat()
+                self._store({
+                    'id': board_id,
+                    'type': type,
+                    'name': name,
+                    'version': 1,
+                    'created_at': now,
+                    'updated_at': now
+                })
+                for column_name, order in (("Por Hacer", 0), ("En Progreso", 1), ("Completado", 2)):
+                    self.create_column(board_id, column_name, order)
+                return board_id
+        except Exception as e:
+            logger.error(f"Error al crear board: {str(e)}")
+            raise
+
+    def create_column(self, board_id, name, order=None):
+        try:
+            with self._lock:
+                board = self._stored(board_id, 'board')
+                if not board:
+                    raise Exception(f"No se encontró el board con ID {board_id}")
+
+                columns = self.get_columns(board_id)
+                position = clamp_position(order, columns)
+                rank = self._rank_for_insert(columns, position, dict(board))
+
+                column_id = str(uuid.uuid4())
+                now = datetime.utcnow().isoformat()
+                self._store({
+                    'id': column_id,
+                    'type': 'column',
+                    'board_id': board_id,
+                    'name': name,
+                    'order': position,
+                    'rank': rank,
+                    'version': 1,
+                    'created_at': now,
+                    'updated_at': now
+                })
+                self._write(board_id)
+                return column_id
+        except Exception as e:
+            logger.error(f"Error al crear column: {str(e)}")
+            raise
+
+    def create_card(self, column_id, title, description='', order=None):
+        try:
+            with self._lock:
+                column = self._stored(column_id, 'column')
+                if not column:
+                    raise Exception(f"No se encontró la columna con ID {column_id}")
+                if self._title_in_use(column_id, title):
+                    raise Exception(f"Ya existe una tarjeta con el título '{title}' en esta columna")
+
+                position, rank = self._insert_position(column_id, order)
+                if rank is None:
+                    cards = self.get_cards(column_id)
+                    position = clamp_position(order, cards)
+                    rank = self._rank_for_insert(cards, position, dict(column))
+
+                card_id = str(uuid.uuid4())
+                now = datetime.utcnow().isoformat()
+                self._store({
+                    'id': card_id,
+                    'type': 'card',
+                    'column_id': column_id,
+                    'title': title,
+                    'description': description,
+                    'order': position,
+                    'rank': rank,
+                    'version': 1,
+                    'created_at': now,
+                    'updated_at': now
+                })
+                self._claim_title(column_id, title, card_id)
+                self._write(column_id)
+                return card_id
+        except Exception as e:
+            logger.error(f"Error al crear tarjeta: {str(e)}")
+            raise
+
+    def update_card(self, card_id, title, description=None):
+        try:
+            with self._lock:
+                card = self._stored(card_id, 'card')
+                if not card:
+                    raise Exception(f"No se encontró el card con ID {card_id}")
+                if title != card.get('title') and card.get('column_id'):
+                    self._release_title(card['column_id'], card.get('title'), card_id)
+                    self._claim_title(card['column_id'], title, card_id)
+                return self._write(card_id, {
+                    'title': title,
+                    'description': description or '',
+                    'updated_at': datetime.utcnow().isoformat()
+                })
+        except Exception as e:
+            logger.error(f"Error al actualizar card: {str(e)}")
+            raise
+
+    def move_column(self, column_id, new_order):
+        try:
+            with self._lock:
+                column = self._stored(column_id, 'column')
+                if not column:
+                    raise Exception(f"No se encontró la columna con ID {column_id}")
+                board_id = column.get('board_id')
+                board = self._stored(board_id, 'board') if board_id else None
+                if not board:
+                    raise Exception(f"La columna {column_id} no tiene un board_id asociado")
+
+                columns = [col for col in self.get_columns(board_id) if col['id'] != column_id]
+                position = clamp_position(new_order, columns)
+                rank = self._rank_for_insert(columns, position, dict(board))
+                self._write(column_id, {
+                    'rank': rank,
+                    'order': position,
+                    'updated_at': datetime.utcnow().isoformat()
+                })
+                self._write(board_id)
+                return {'id': column_id, 'type': 'column', 'order': position, 'board_id': board_id}
+        except Exception as e:
+            logger.error(f"Error al mover columna: {str(e)}")
+            raise
+
+    def delete_card(self, card_id):
+        try:
+            with self._lock:
+                card = self._stored(card_id, 'card')
+                if not card:
+                    raise Exception(f"No se encontró la tarjeta con ID {card_id}")
+                self._release_title(card.get('column_id'), card.get('title'), card_id)
+                self._remove(card_id)
+                return True
+        except Exception as e:
+            logger.error(f"Error al eliminar tarjeta: {str(e)}")
+            raise
+
+    def delete_column(self, column_id, progress=None):
+        """
+        Elimina la columna y traslada sus tarjetas al final de la primera de
+        las restantes. ``progress(hechas, total)`` recibe el avance en
+        tarjetas trasladadas (más el borrado de la columna).
+        """
+        try:
+            with self._lock:
+                column = self._stored(column_id, 'column')
+                if not column:
+                    raise Exception(f"No se encontró la columna con ID {column_id}")
+                board_id = column.get('board_id')
+                if not board_id:
+                    raise Exception(f"La columna {column_id} no tiene un board_id asociado")
+                columns = self.get_columns(board_id)
+                if not columns:
+                    raise Exception(f"No se encontraron columnas para el board {board_id}")
+                target = next((col for col in columns if col['id'] != column_id), None)
+                if not target:
+                    raise Exception("No hay columnas disponibles para mover las tarjetas")
+                target_id = target['id']
+
+                cards = self.get_cards(column_id)
+                new_order, new_rank = self._insert_position(target_id, None)
+                if new_rank is None:
+                    target_cards = self.get_cards(target_id)
+                    new_order = len(target_cards)
+                    new_rank = self._rank_for_insert(target_cards, new_order, dict(self._items[target_id]))
+                now = datetime.utcnow().isoformat()
+                total = len(cards) + 1
+                for done, card in enumerate(cards, 1):
+                    self._write(card['id'], {
+                        'column_id': target_id,
+                        'order': new_order,
+                        'rank': new_rank,
+                        'updated_at': now
+                    })
+                    self._release_title(column_id, card.get('title'))
+                    self._claim_title(target_id, card.get('title'), card['id'])
+                    new_order += 1
+                    new_rank = rank_between(new_rank, None)
+                    if progress:
+                        progress(done, total)
+                self._write(target_id)
+                self._remove(column_id)
+                if progress:
+                    progress(total, total)
+                logger.info(f"{len(cards)} tarjetas movidas a la columna {target_id}")
+                return True
+        except Exception as e:
+            logger.error(f"Error al eliminar columna: {str(e)}")
+            raise
+
+    def move_card(self, card_id: str, column_id: str, card_order: int) -> Optional[Dict]:
+        try:
+            with self._lock:
+                card = self._stored(card_id, 'card')
+                if not card:
+                    logger.error(f"Card {card_id} not found")
+                    return None
+                column = self._stored(column_id, 'column')
+                if not column:
+                    logger.error(f"Column {column_id} not found")
+                    return None
+
+                column_cards = self.get_cards(column_id)
+                current_position = next(
+                    (index for index, c in enumerate(column_cards) if c['id'] == card_id),
+                    None
+                )
+                dest_cards = [c for c in column_cards if c['id'] != card_id]
+                position = clamp_position(card_order, dest_cards)
+                if card.get('column_id') == column_id and current_position == position:
+                    return {**card, 'order': position}
+
+                rank = self._rank_for_insert(dest_cards, position, dict(column))
+                if card.get('column_id') != column_id:
+                    self._release_title(card.get('column_id'), card.get('title'), card_id)
+                    self._claim_title(column_id, card.get('title'), card_id)
+                moved = self._write(card_id, {
+                    'column_id': column_id,
+                    'order': position,
+                    'rank': rank,
+                    'updated_at': datetime.utcnow().isoformat()
+                })
+                self._write(column_id)
+                return moved
+        except Exception as e:
+            logger.error(f"Error moving card {card_id}: {str(e)}")
+            return None
+
+    def fix_card_orders(self, board_id=None):
+        """Repara los ranks de las listas (de ``board_id`` o de todos); informe como RepairEngine.run."""
+        started = time.monotonic()
+        issues = dict.fromkeys(ISSUES, 0)
+        try:
+            with self._lock:
+                if board_id:
+                    parents = [board_id] if board_id in self._items else []
+                    parents += [column['id'] for column in self._children_of(board_id, 'column')]
+                else:
+                    parents = [*self._by_type.get('board', ()), *self._by_type.get('column', ())]
+                for parent_id in parents:
+                    parent = self._items[parent_id]
+                    child_type = 'column' if parent['type'] == 'board' else 'card'
+                    items = [dict(item) for item in self._children_of(parent_id, child_type)]
+                    found, ordered = detect_issues(items)
+                    for issue in found:
+                        issues[issue] += 1
+                    if found & RANK_ISSUES:
+                        self._write_ranks(ordered, dict(parent))
+                report = {
+                    'scanned': len(self._items),
+                    'checked': len(parents),
+                    'issues': issues,
+                    'dry_run': False,
+                    'seconds': round(time.monotonic() - started, 2),
+                }
+            logger.info(f"Reparación terminada: {report}")
+            return report
+        except Exception as e:
+            logger.error(f"Error al actualizar el orden de las tarjetas: {str(e)}")
+            raise
+
+    # Carga masiva
+
+    def load_items(self, items):
+        written = 0
+        with self._lock:
+            for item in items:
+                self._store({'version': 1, **item})
+                if item['type'] == 'card':
+                    self._claim_title(item['column_id'], item.get('title'), item['id'])
+                written += 1
+        return written
@@ -1,44 +1,64 @@
 from django.db import models
 
-# Esta clase es solo para mantener la compatibilidad con Django
-# ya que estamos usando DynamoDB como base de datos
+# Tablas del almacenamiento relacional (BOARD_STORAGE_BACKEND='orm', ver
+# orm.py). Con DynamoDB no se usan: los ids son los mismos UUID en texto y
+# los campos coinciden con los atributos de los items de la tabla.
+#
+# ``rank`` ordena las listas (ver ranking.py) y debe compararse byte a byte,
+# como en DynamoDB: es la colación por defecto de SQLite; en PostgreSQL hay
+# que usar la colación "C". Los índices compuestos empiezan por la clave
+# foránea, así que esta no necesita uno propio.
 class Board(models.Model):
     id = models.CharField(max_length=36, primary_key=True)
+    type = models.CharField(max_length=20, default='board')
     name = models.CharField(max_length=255)
+    version = models.IntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        managed = False  # No queremos que Django cree la tabla
+        indexes = [
+            models.Index(fields=['type', 'created_at'], name='board_type_created_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
 class Column(models.Model):
     id = models.CharField(max_length=36, primary_key=True)
-    board_id = models.CharField(max_length=36)
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='columns', db_index=False)
     name = models.CharField(max_length=255)
     order = models.IntegerField(default=0)
+    rank = models.CharField(max_length=255, null=True, blank=True)
+    version = models.IntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        managed = False  # No queremos que Django cree la tabla
+        indexes = [
+            models.Index(fields=['board', 'rank', 'id'], name='column_board_rank_idx'),
+        ]
 
     def __str__(self):
         return f"{self.board_id} - {self.name}"
 
 class Card(models.Model):
     id = models.CharField(max_length=36, primary_key=True)
-    column_id = models.CharField(max_length=36)
+    column = models.ForeignKey(Column, on_delete=models.CASCADE, related_name='cards', db_index=False)
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     order = models.IntegerField(default=0)
+    rank = models.CharField(max_length=255, null=True, blank=True)
+    version = models.IntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        managed = False  # No queremos que Django cree la tabla
+        indexes = [
+            models.Index(fields=['column', 'rank', 'id'], name='card_column_rank_idx'),
+            # Detección de títulos duplicados en create_card
+            models.Index(fields=['column', 'title'], name='card_column_title_idx'),
+        ]
 
     def __str__(self):
-        return self.title 
\ No newline at end of file
+        return self.title
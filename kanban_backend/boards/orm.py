@@ -0,0 +1,615 @@
+"""
+Almacenamiento de tableros en la base de datos de Django (BOARD_STORAGE_BACKEND='orm').
+
+Implementa BoardRepository sobre los modelos de models.py con las mismas
+reglas que DynamoDBAdapter: el orden lo dan los ``rank`` (ranking.py), las
+altas sin posición van al final y ``order`` se recalcula al leer. Pensado
+para SQLite en modo WAL (lecturas concurrentes con una escritura) y para
+comparar latencias con DynamoDB sobre el mismo schema GraphQL.
+
+- Las lecturas usan ``values()`` (diccionarios, sin instanciar modelos) y
+  los índices compuestos ``(padre, rank, id)``, que sirven tanto las listas
+  como las páginas por rank sin ordenar en memoria.
+- Un árbol de tableros se carga con prefetch_related: una consulta por
+  nivel, igual que los Query en paralelo de DynamoDB.
+- Cada escritura es una transacción que empieza incrementando la versión
+  del padre (board o columna). Ese UPDATE toma el bloqueo de escritura
+  (de la fila en PostgreSQL, de la base de datos en SQLite) antes de leer
+  la lista, así que las escrituras sobre una misma lista se serializan en
+  lugar de reintentarse por conflicto de versión.
+- Las renumeraciones (ranks, traslados de tarjetas, reparaciones) escriben
+  con bulk_update en lotes de BULK_BATCH_SIZE filas.
+"""
+import logging
+import time
+import uuid
+from datetime import timezone as dt_timezone
+from typing import Dict, Optional
+
+from django.db import transaction
+from django.db.models import F, Prefetch, Q
+from django.utils import timezone
+
+from kanban_backend.boards.models import Board, Card, Column
+from kanban_backend.boards.ranking import (
+    MAX_RANK_LENGTH,
+    clamp_position,
+    initial_ranks,
+    rank_at,
+    rank_between,
+    sort_by_rank,
+)
+from kanban_backend.boards.repair import ISSUES, RANK_ISSUES, detect_issues
+from kanban_backend.boards.repository import PROJECTION_REQUIRED, BoardRepository
+
+logger = logging.getLogger(__name__)
+
+# Filas por sentencia en bulk_update y claves por consulta con ``__in``
+# (SQLite limita las variables por sentencia)
+BULK_BATCH_SIZE = 500
+IN_BATCH_SIZE = 500
+
+# Filas que se leen por viaje al recorrer un tipo completo
+ITERATOR_CHUNK_SIZE = 2000
+
+MODELS = {'board': Board, 'column': Column, 'card': Card}
+
+# Atributos de cada tipo de item y clave foránea de su padre
+FIELDS = {
+    'board': ('id', 'type', 'name', 'version', 'created_at', 'updated_at'),
+    'column': ('id', 'board_id', 'name', 'order', 'rank', 'version', 'created_at', 'updated_at'),
+    'card': ('id', 'column_id', 'title', 'description', 'order', 'rank', 'version', 'created_at', 'updated_at'),
+}
+PARENT_FIELDS = {'column': 'board_id', 'card': 'column_id'}
+
+TIMESTAMP_FIELDS = ('created_at', 'updated_at')
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Receptor de connection_created: WAL y escrituras sin fsync por transacción."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+
+
+def _timestamp(value):
+    # Mismo formato que el resto de almacenamientos: ISO en UTC sin zona
+    if value is not None and timezone.is_aware(value):
+        value = value.astimezone(dt_timezone.utc).replace(tzinfo=None)
+    return value.isoformat() if value is not None else None
+
+
+def _item(row, item_type):
+    """Item del contrato de BoardRepository a partir de una fila de ``values()``."""
+    item = dict(row)
+    item.setdefault('type', item_type)
+    for name in TIMESTAMP_FIELDS:
+        if name in item:
+            item[name] = _timestamp(item[name])
+    return item
+
+
+def _names(item_type, fields):
+    if not fields:
+        return FIELDS[item_type]
+    attributes = set(fields) | set(PROJECTION_REQUIRED)
+    return tuple(name for name in FIELDS[item_type] if name in attributes)
+
+
+def _batches(values, size):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class DjangoBoardRepository(BoardRepository):
+    """Boards, columnas y tarjetas en las tablas de models.py."""
+
+    # Lecturas
+
+    def _rows(self, queryset, item_type, fields=None):
+        return [_item(row, item_type) for row in queryset.values(*_names(item_type, fields))]
+
+    def _queryset(self, item_type):
+        queryset = MODELS[item_type].objects.all()
+        # create_board admite otros tipos, que como en TypeIndex no son 'board'
+        return queryset.filter(type=item_type) if item_type == 'board' else queryset
+
+    def iter_items_by_type(self, item_type, fields=None, page_size=None):
+        if item_type not in MODELS:
+            return
+        queryset = self._queryset(item_type).order_by('created_at', 'id').values(*_names(item_type, fields))
+        for row in queryset.iterator(chunk_size=page_size or ITERATOR_CHUNK_SIZE):
+            yield _item(row, item_type)
+
+    def iter_columns(self, board_id, fields=None, page_size=None):
+        return iter(self._rows(Column.objects.filter(board_id=board_id), 'column', fields))
+
+    def iter_cards(self, column_id, fields=None, page_size=None):
+        return iter(self._rows(Card.objects.filter(column_id=column_id), 'card', fields))
+
+    def get_boards(self, fields=None):
+        try:
+            return list(self.iter_items_by_type('board', fields))
+        except Exception as e:
+            logger.error(f"Error al obtener boards: {str(e)}")
+            raise
+
+    def _get(self, item_type, item_id):
+        rows = self._rows(self._queryset(item_type).filter(pk=item_id), item_type)
+        return rows[0] if rows else None
+
+    def get_board(self, board_id: str) -> Optional[Dict]:
+        try:
+            return self._get('board', board_id)
+        except Exception as e:
+            logger.error(f"Error al obtener board {board_id}: {str(e)}")
+            return None
+
+    def get_column(self, column_id: str) -> Optional[Dict]:
+        try:
+            return self._get('column', column_id)
+        except Exception as e:
+            logger.error(f"Error al obtener column {column_id}: {str(e)}")
+            return None
+
+    def get_card(self, card_id: str) -> Optional[Dict]:
+        try:
+            return self._get('card', card_id)
+        except Exception as e:
+            logger.error(f"Error al obtener card {card_id}: {str(e)}")
+            return None
+
+    def get_columns(self, board_id, fields=None):
+        """Columnas del board; con ``fields`` solo se leen esos atributos."""
+        try:
+            queryset = Column.objects.filter(board_id=board_id).order_by('rank', 'id')
+            return sort_by_rank(self._rows(queryset, 'column', fields))
+        except Exception as e:
+            logger.error(f"Error al obtener columns: {str(e)}")
+            raise
+
+    def get_cards(self, column_id, fields=None):
+        """Tarjetas de la columna; con ``fields`` solo se leen esos atributos."""
+        try:
+            queryset = Card.objects.filter(column_id=column_id).order_by('rank', 'id')
+            return sort_by_rank(self._rows(queryset, 'card', fields))
+        except Exception as e:
+            logger.error(f"Error al obtener cards: {str(e)}")
+            raise
+
+    def get_columns_page(self, board_id, limit, after=None, fields=None):
+        return self._rank_page('column', board_id, limit, after, fields)
+
+    def get_cards_page(self, column_id, limit, after=None, fields=None):
+        return self._rank_page('card', column_id, limit, after, fields)
+
+    def _rank_page(self, item_type, parent_id, limit, after, fields):
+        # Como los índices por rank de DynamoDB, sin los items que no tienen rank
+        try:
+            queryset = MODELS[item_type].objects.filter(
+                **{PARENT_FIELDS[item_type]: parent_id},
+                rank__isnull=False
+            )
+            if after:
+                queryset = queryset.filter(
+                    Q(rank__gt=after['rank']) | Q(rank=after['rank'], id__gt=after['id'])
+                )
+            items = self._rows(queryset.order_by('rank', 'id')[:limit + 1], item_type, fields)
+            return items[:limit], len(items) > limit
+        except Exception as e:
+            logger.error(f"Error al obtener página de {item_type}s de {parent_id}: {str(e)}")
+            raise
+
+    def _children_of(self, item_type, parent_ids, fields):
+        parent_field = PARENT_FIELDS[item_type]
+        names = _names(item_type, fields)
+        if parent_field not in names:
+            names = (*names, parent_field)
+        grouped = {parent_id: [] for parent_id in parent_ids}
+        for batch in _batches(grouped, IN_BATCH_SIZE):
+            queryset = MODELS[item_type].objects.filter(**{f'{parent_field}__in': batch})
+            for row in queryset.order_by(parent_field, 'rank', 'id').values(*names):
+                grouped[row[parent_field]].append(_item(row, item_type))
+        return {parent_id: sort_by_rank(items) for parent_id, items in grouped.items()}
+
+    def get_columns_for_boards(self, board_ids, fields=None):
+        """Columnas de varios boards en una consulta, agrupadas por board_id."""
+        try:
+            return self._children_of('column', dict.fromkeys(board_ids), fields)
+        except Exception as e:
+            logger.error(f"Error al obtener columnas de {len(board_ids)} boards: {str(e)}")
+            raise
+
+    def get_cards_for_columns(self, column_ids, fields=None):
+        """Tarjetas de varias columnas en una consulta, agrupadas por column_id."""
+        try:
+            return self._children_of('card', dict.fromkeys(column_ids), fields)
+        except Exception as e:
+            logger.error(f"Error al obtener tarjetas de {len(column_ids)} columnas: {str(e)}")
+            raise
+
+    def get_board_trees(self, board_ids, column_fields=None, card_fields=None):
+        """
+        Columnas y tarjetas de los tableros con prefetch_related: una consulta
+        para las columnas de todos los tableros y otra para sus tarjetas.
+        """
+        try:
+            column_names = _names('column', column_fields)
+            card_names = _names('card', card_fields)
+            cards = Card.objects.only(*card_names, 'column_id').order_by('rank', 'id')
+            board_ids = list(dict.fromkeys(board_ids))
+            columns_by_board = {board_id: [] for board_id in board_ids}
+            for batch in _batches(board_ids, IN_BATCH_SIZE):
+                columns = (
+                    Column.objects.filter(board_id__in=batch)
+                    .only(*column_names, 'board_id')
+                    .order_by('board_id', 'rank', 'id')
+                    .prefetch_related(Prefetch('cards', queryset=cards))
+                )
+                for column in columns:
+                    columns_by_board[column.board_id].append(column)
+            trees = {}
+            for board_id, column_models in columns_by_board.items():
+                trees[board_id] = {
+                    'columns': sort_by_rank([self._to_item(column, 'column', column_names) for column in column_models]),
+                    'cards': {
+                        column.id: sort_by_rank([self._to_item(card, 'card', card_names) for card in column.cards.all()])
+                        for column in column_models
+                    },
+                }
+            return trees
+        except Exception as e:
+            logger.error(f"Error al obtener árboles de tableros: {str(e)}")
+            raise
+
+    @staticmethod
+    def _to_item(instance, item_type, names):
+        return _item({name: getattr(instance, name) for name in names}, item_type)
+
+    # Ranks
+
+    def _insert_position(self, column_id, position):
+        """
+        ``(posición, rank)`` para insertar una tarjeta leyendo por el índice
+        ``(column_id, rank)`` solo hasta ``position``: al principio o al final
+        es una fila. Devuelve un rank None si hay que renumerar la columna.
+        """
+        queryset = Card.objects.filter(column_id=column_id, rank__isnull=False).values('id', 'rank', 'order')
+        if position is None:
+            before, after = queryset.order_by('-rank', '-id').first(), None
+            # El ``order`` guardado puede estar desfasado tras los movimientos
+            position = queryset.count() if before else 0
+        else:
+            items = list(queryset.order_by('rank', 'id')[:position + 1])
+            position = clamp_position(position, items)
+            before = items[position - 1] if position > 0 else None
+            after = items[position] if position < len(items) else None
+        try:
+            rank = rank_between(before and before['rank'], after and after['rank'])
+        except ValueError:
+            return position, None
+        return position, rank if len(rank) <= MAX_RANK_LENGTH else None
+
+    def _rank_for_insert(self, items, position, item_type):
+        rank = rank_at(items, position)
+        if rank is None:
+            # Caso ocasional: renumerar la lista completa y volver a calcular
+            logger.info(f"Reasignando ranks de {len(items)} elementos")
+            self._write_ranks(items, item_type)
+            rank = rank_at(items, position)
+        return rank
+
+    def _write_ranks(self, items, item_type):
+        """
+        Asigna ranks consecutivos a ``items`` respetando su orden actual. Se
+        llama dentro de la transacción que ya bloqueó al padre.
+        """
+        now = timezone.now()
+        rows = []
+        for index, (item, rank) in enumerate(zip(items, initial_ranks(len(items)))):
+            rows.append(MODELS[item_type](
+                id=item['id'], rank=rank, order=index, updated_at=now, version=F('version') + 1
+            ))
+            item['rank'] = rank
+            item['order'] = index
+            item['version'] = (item.get('version') or 0) + 1
+        MODELS[item_type].objects.bulk_update(
+            rows, ['rank', 'order', 'updated_at', 'version'], batch_size=BULK_BATCH_SIZE
+        )
+
+    @staticmethod
+    def _touch(item_type, item_id):
+        """Incrementa la versión del padre; devuelve False si no existe."""
+        return MODELS[item_type].objects.filter(pk=item_id).update(version=F('version') + 1) > 0
+
+    # Escrituras
+
+    def create_board(self, name, type='board'):
+        try:
+            with transaction.atomic():
+                existing = self._queryset('board').order_by('created_at', 'id').values_list('id', flat=True).first()
+                if existing:
+                    logger.info("Ya existe un tablero, retornando el primero encontrado")
+                    return existing
+
+                board_id = str(uuid.uuid4())
+                Board.objects.create(id=board_id, type=type, name=name)
+                for column_name, order in (("Por Hacer", 0), ("En Progreso", 1), ("Completado", 2)):
+                    self.create_column(board_id, column_name, order)
+                return board_id
+        except Exception as e:
+            logger.error(f"Error al crear board: {str(e)}")
+            raise
+
+    def create_column(self, board_id, name, order=None):
+        try:
+            with transaction.atomic():
+                if not self._touch('board', board_id):
+                    raise Exception(f"No se encontró el board con ID {board_id}")
+                columns = self.get_columns(board_id, fields={'version'})
+                position = clamp_position(order, columns)
+                rank = self._rank_for_insert(columns, position, 'column')
+                column_id = str(uuid.uuid4())
+                Column.objects.create(id=column_id, board_id=board_id, name=name, order=position, rank=rank)
+                return column_id
+        except Exception as e:
+            logger.error(f"Error al crear column: {str(e)}")
+            raise
+
+    def create_card(self, column_id, title, description='', order=None):
+        try:
+            with transaction.atomic():
+                if not self._touch('column', column_id):
+                    raise Exception(f"No se encontró la columna con ID {column_id}")
+                if Card.objects.filter(column_id=column_id, title=title).exists():
+                    raise Exception(f"Ya existe una tarjeta con el título '{title}' en esta columna")
+
+                position, rank = self._insert_position(column_id, order)
+                if rank is None:
+                    cards = self.get_cards(column_id, fields={'version'})
+                    position = clamp_position(order, cards)
+                    rank = self._rank_for_insert(cards, position, 'card')
+
+                card_id = str(uuid.uuid4())
+                Card.objects.create(
+                    id=card_id,
+                    column_id=column_id,
+                    title=title,
+                    description=description or '',
+                    order=position,
+                    rank=rank
+                )
+                return card_id
+        except Exception as e:
+            logger.error(f"Error al crear tarjeta: {str(e)}")
+            raise
+
+    def update_card(self, card_id, title, description=None):
+        try:
+            with transaction.atomic():
+                updated = Card.objects.filter(pk=card_id).update(
+                    title=title,
+                    description=description or '',
+                    updated_at=timezone.now(),
+                    version=F('version') + 1
+                )
+                if not updated:
+                    raise Exception(f"No se encontró el card con ID {card_id}")
+                return self._get('card', card_id)
+        except Exception as e:
+            logger.error(f"Error al actualizar card: {str(e)}")
+            raise
+
+    def move_column(self, column_id, new_order):
+        try:
+            with transaction.atomic():
+                board_id = Column.objects.filter(pk=column_id).values_list('board_id', flat=True).first()
+                if not board_id:
+                    raise Exception(f"No se encontró la columna con ID {column_id}")
+                if not self._touch('board', board_id):
+                    raise Exception(f"La columna {column_id} no tiene un board_id asociado")
+
+                columns = [col for col in self.get_columns(board_id, fields={'version'}) if col['id'] != column_id]
+                position = clamp_position(new_order, columns)
+                rank = self._rank_for_insert(columns, position, 'column')
+                Column.objects.filter(pk=column_id).update(
+                    rank=rank,
+                    order=position,
+                    updated_at=timezone.now(),
+                    version=F('version') + 1
+                )
+                logger.info(f"Columna {column_id} movida a la posición {position} con rank {rank}")
+                return {'id': column_id, 'type': 'column', 'order': position, 'board_id': board_id}
+        except Exception as e:
+            logger.error(f"Error al mover columna: {str(e)}")
+            raise
+
+    def delete_card(self, card_id):
+        try:
+            deleted, _ = Card.objects.filter(pk=card_id).delete()
+            if not deleted:
+                raise Exception(f"No se encontró la tarjeta con ID {card_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Error al eliminar tarjeta: {str(e)}")
+            raise
+
+    def delete_column(self, column_id, progress=None):
+        """
+        Elimina la columna y traslada sus tarjetas al final de la primera de
+        las restantes. ``progress(hechas, total)`` recibe el avance en
+        tarjetas trasladadas (más el borrado de la columna).
+        """
+        try:
+            with transaction.atomic():
+                board_id = Column.objects.filter(pk=column_id).values_list('board_id', flat=True).first()
+                if not board_id:
+                    raise Exception(f"No se encontró la columna con ID {column_id}")
+                columns = self.get_columns(board_id, fields={'id'})
+                target = next((col for col in columns if col['id'] != column_id), None)
+                if not target:
+                    raise Exception("No hay columnas disponibles para mover las tarjetas")
+                target_id = target['id']
+                self._touch('column', target_id)
+
+                card_ids = [card['id'] for card in self.get_cards(column_id, fields={'id'})]
+                new_order, new_rank = self._insert_position(target_id, None)
+                if new_rank is None:
+                    target_cards = self.get_cards(target_id, fields={'version'})
+                    new_order = len(target_cards)
+                    new_rank = self._rank_for_insert(target_cards, new_order, 'card')
+
+                now = timezone.now()
+                total = len(card_ids) + 1
+                done = 0
+                for batch in _batches(card_ids, BULK_BATCH_SIZE):
+                    rows = []
+                    for card_id in batch:
+                        rows.append(Card(
+                            id=card_id,
+                            column_id=target_id,
+                            order=new_order,
+                            rank=new_rank,
+                            updated_at=now,
+                            version=F('version') + 1
+                        ))
+                        new_order += 1
+                        new_rank = rank_between(new_rank, None)
+                    Card.objects.bulk_update(rows, ['column_id', 'order', 'rank', 'updated_at', 'version'])
+                    done += len(rows)
+                    if progress:
+                        progress(done, total)
+
+                Column.objects.filter(pk=column_id).delete()
+                if progress:
+                    progress(total, total)
+                logger.info(f"{len(card_ids)} tarjetas movidas a la columna {target_id}")
+                return True
+        except Exception as e:
+            logger.error(f"Error al eliminar columna: {str(e)}")
+            raise
+
+    def move_card(self, card_id: str, column_id: str, card_order: int) -> Optional[Dict]:
+        try:
+            with transaction.atomic():
+                # La columna destino se bloquea antes de leer sus tarjetas
+                if not self._touch('column', column_id):
+                    logger.error(f"Column {column_id} not found")
+                    return None
+                card = self._get('card', card_id)
+                if not card:
+                    logger.error(f"Card {card_id} not found")
+                    return None
+
+                column_cards = self.get_cards(column_id, fields={'version'})
+                current_position = next(
+                    (index for index, c in enumerate(column_cards) if c['id'] == card_id),
+                    None
+                )
+                dest_cards = [c for c in column_cards if c['id'] != card_id]
+                position = clamp_position(card_order, dest_cards)
+                if card['column_id'] == column_id and current_position == position:
+                    card['order'] = position
+                    return card
+
+                rank = self._rank_for_insert(dest_cards, position, 'card')
+                now = timezone.now()
+                Card.objects.filter(pk=card_id).update(
+                    column_id=column_id,
+                    order=position,
+                    rank=rank,
+                    updated_at=now,
+                    version=F('version') + 1
+                )
+                return {
+                    **card,
+                    'column_id': column_id,
+                    'order': position,
+                    'rank': rank,
+                    'updated_at': _timestamp(now),
+                    'version': card['version'] + 1
+                }
+        except Exception as e:
+            logger.error(f"Error moving card {card_id}: {str(e)}")
+            return None
+
+    def fix_card_orders(self, board_id=None):
+        """Repara los ranks de las listas (de ``board_id`` o de todos); informe como RepairEngine.run."""
+        started = time.monotonic()
+        issues = dict.fromkeys(ISSUES, 0)
+        checked = 0
+        try:
+            for parent_type, child_type in (('board', 'column'), ('column', 'card')):
+                queryset = self._queryset(parent_type)
+                if board_id:
+                    queryset = queryset.filter(**{'pk' if parent_type == 'board' else 'board_id': board_id})
+                parent_ids = list(queryset.values_list('id', flat=True))
+                for parent_id in parent_ids:
+                    with transaction.atomic():
+                        if not self._touch(parent_type, parent_id):
+                            continue
+                        checked += 1
+                        items = self._rows(
+                            MODELS[child_type].objects.filter(**{PARENT_FIELDS[child_type]: parent_id}),
+                            child_type,
+                            fields={'version'}
+                        )
+                        found, ordered = detect_issues(items)
+                        for issue in found:
+                            issues[issue] += 1
+                        if found & RANK_ISSUES:
+                            self._write_ranks(ordered, child_type)
+            report = {
+                'scanned': checked,
+                'checked': checked,
+                'issues': issues,
+                'dry_run': False,
+                'seconds': round(time.monotonic() - started, 2),
+            }
+            logger.info(f"Reparación terminada: {report}")
+            return report
+        except Exception as e:
+            logger.error(f"Error al actualizar el orden de las tarjetas: {str(e)}")
+            raise
+
+    # Carga masiva
+
+    def load_items(self, items):
+        """
+        Inserta los items con bulk_create en lotes de BULK_BATCH_SIZE filas;
+        ``created_at`` y ``updated_at`` son los de la inserción.
+        """
+        pending = {item_type: [] for item_type in MODELS}
+
+        def flush(item_type):
+            MODELS[item_type].objects.bulk_create(pending[item_type], batch_size=BULK_BATCH_SIZE)
+            pending[item_type].clear()
+
+        written = 0
+        try:
+            with transaction.atomic():
+                for item in items:
+                    item_type = item['type'] if item['type'] in ('column', 'card') else 'board'
+                    values = {
+                        name: item[name]
+                        for name in FIELDS[item_type]
+                        if name in item and name not in TIMESTAMP_FIELDS
+                    }
+                    # Los padres pendientes se insertan antes que sus hijos
+                    if item_type != 'board' and pending['board']:
+                        flush('board')
+                    if item_type == 'card' and pending['column']:
+                        flush('column')
+                    pending[item_type].append(MODELS[item_type](**values))
+                    if len(pending[item_type]) >= BULK_BATCH_SIZE:
+                        flush(item_type)
+                    written += 1
+                for item_type in MODELS:
+                    flush(item_type)
+            return written
+        except Exception as e:
+            logger.error(f"Error al cargar items: {str(e)}")
+            raise
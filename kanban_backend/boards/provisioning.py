@@ -0,0 +1,203 @@
+"""
+Creación y verificación de la tabla de DynamoDB.
+
+Esto ya no se hace al arrancar los workers: se ejecuta de forma explícita con
+``python manage.py ensure_dynamodb_table`` durante el despliegue.
+"""
+import logging
+import time
+
+from kanban_backend.boards.changes import TOMBSTONE_TTL_ATTRIBUTE
+
+logger = logging.getLogger(__name__)
+
+ATTRIBUTE_DEFINITIONS = [
+    {'AttributeName': 'id', 'AttributeType': 'S'},
+    {'AttributeName': 'type', 'AttributeType': 'S'},
+    {'AttributeName': 'column_id', 'AttributeType': 'S'},
+    {'AttributeName': 'board_id', 'AttributeType': 'S'},
+    {'AttributeName': 'rank', 'AttributeType': 'S'},
+    {'AttributeName': 'pk', 'AttributeType': 'S'},
+    {'AttributeName': 'sk', 'AttributeType': 'S'},
+    {'AttributeName': 'change_bucket', 'AttributeType': 'S'},
+    {'AttributeName': 'changed_at', 'AttributeType': 'S'},
+]
+
+DEFAULT_THROUGHPUT = {
+    'ReadCapacityUnits': 5,
+    'WriteCapacityUnits': 5
+}
+
+GLOBAL_SECONDARY_INDEXES = [
+    {
+        'IndexName': 'TypeIndex',
+        'KeySchema': [
+            {'AttributeName': 'type', 'KeyType': 'HASH'}
+        ],
+        'Projection': {'ProjectionType': 'ALL'},
+        'ProvisionedThroughput': DEFAULT_THROUGHPUT
+    },
+    {
+        'IndexName': 'ColumnIdIndex',
+        'KeySchema': [
+            {'AttributeName': 'column_id', 'KeyType': 'HASH'},
+            {'AttributeName': 'type', 'KeyType': 'RANGE'}
+        ],
+        'Projection': {'ProjectionType': 'ALL'},
+        'ProvisionedThroughput': DEFAULT_THROUGHPUT
+    },
+    {
+        'IndexName': 'BoardIdIndex',
+        'KeySchema': [
+            {'AttributeName': 'board_id', 'KeyType': 'HASH'},
+            {'AttributeName': 'type', 'KeyType': 'RANGE'}
+        ],
+        'Projection': {'ProjectionType': 'ALL'},
+        'ProvisionedThroughput': DEFAULT_THROUGHPUT
+    },
+    # Índices dispersos ordenados por rank para paginar en el orden del
+    # tablero: solo las tarjetas tienen column_id y solo las columnas board_id
+    {
+        'IndexName': 'ColumnRankIndex',
+        'KeySchema': [
+            {'AttributeName': 'column_id', 'KeyType': 'HASH'},
+            {'AttributeName': 'rank', 'KeyType': 'RANGE'}
+        ],
+        'Projection': {'ProjectionType': 'ALL'},
+        'ProvisionedThroughput': DEFAULT_THROUGHPUT
+    },
+    {
+        'IndexName': 'BoardRankIndex',
+        'KeySchema': [
+            {'AttributeName': 'board_id', 'KeyType': 'HASH'},
+            {'AttributeName': 'rank', 'KeyType': 'RANGE'}
+        ],
+        'Projection': {'ProjectionType': 'ALL'},
+        'ProvisionedThroughput': DEFAULT_THROUGHPUT
+    },
+    # Todo el tablero (board, columnas y tarjetas) en una partición; ver layout.py
+    {
+        'IndexName': 'BoardItemsIndex',
+        'KeySchema': [
+            {'AttributeName': 'pk', 'KeyType': 'HASH'},
+            {'AttributeName': 'sk', 'KeyType': 'RANGE'}
+        ],
+        'Projection': {'ProjectionType': 'ALL'},
+        'ProvisionedThroughput': DEFAULT_THROUGHPUT
+    },
+    # Items modificados por día para los backups incrementales; solo claves,
+    # el backup lee los items con BatchGetItem (ver changes.py)
+    {
+        'IndexName': 'ChangesIndex',
+        'KeySchema': [
+            {'AttributeName': 'change_bucket', 'KeyType': 'HASH'},
+            {'AttributeName': 'changed_at', 'KeyType': 'RANGE'}
+        ],
+        'Projection': {'ProjectionType': 'KEYS_ONLY'},
+        'ProvisionedThroughput': DEFAULT_THROUGHPUT
+    },
+]
+
+
+def ensure_table(client, table_name, wait=True, timeout=300):
+    """
+    Crea la tabla si no existe y añade los índices que le falten. Devuelve
+    True si se ha creado o modificado algo.
+    """
+    changed = False
+    try:
+        description = client.describe_table(TableName=table_name)['Table']
+        logger.info(f"Tabla {table_name} ya existe")
+    except client.exceptions.ResourceNotFoundException:
+        logger.info(f"Creando tabla {table_name}")
+        client.create_table(
+            TableName=table_name,
+            KeySchema=[
+                {'AttributeName': 'id', 'KeyType': 'HASH'}
+            ],
+            AttributeDefinitions=ATTRIBUTE_DEFINITIONS,
+            GlobalSecondaryIndexes=GLOBAL_SECONDARY_INDEXES,
+            ProvisionedThroughput=DEFAULT_THROUGHPUT
+        )
+        changed = True
+        description = None
+
+    if description is not None:
+        existing = {index['IndexName'] for index in description.get('GlobalSecondaryIndexes', [])}
+        for index in GLOBAL_SECONDARY_INDEXES:
+            if index['IndexName'] in existing:
+                continue
+            # DynamoDB solo admite crear un índice por llamada y con la tabla activa
+            wait_until_active(client, table_name, timeout=timeout)
+            logger.info(f"Creando índice {index['IndexName']} en {table_name}")
+            client.update_table(
+                TableName=table_name,
+                AttributeDefinitions=ATTRIBUTE_DEFINITIONS,
+                GlobalSecondaryIndexUpdates=[{'Create': index}]
+            )
+            changed = True
+
+    if wait:
+        wait_until_active(client, table_name, timeout=timeout)
+        # El TTL solo se puede configurar con la tabla activa
+        changed = ensure_time_to_live(client, table_name) or changed
+    return changed
+
+
+def ensure_time_to_live(client, table_name):
+    """Activa el TTL que elimina las lápidas de borrado (ver changes.py)."""
+    try:
+        description = client.describe_time_to_live(TableName=table_name)['TimeToLiveDescription']
+        if description.get('TimeToLiveStatus') in ('ENABLED', 'ENABLING'):
+            return False
+        logger.info(f"Activando TTL sobre {TOMBSTONE_TTL_ATTRIBUTE} en {table_name}")
+        client.update_time_to_live(
+            TableName=table_name,
+            TimeToLiveSpecification={'Enabled': True, 'AttributeName': TOMBSTONE_TTL_ATTRIBUTE}
+        )
+        return True
+    except Exception as e:
+        # Sin TTL las lápidas se acumulan, pero la tabla funciona
+        logger.error(f"Error al activar el TTL de {table_name}: {str(e)}")
+        return False
+
+
+def wait_until_active(client, table_name, timeout=300, initial_delay=0.5, max_delay=10):
+    """
+    Espera con backoff exponencial a que la tabla y todos sus índices
+    globales estén en estado ACTIVE.
+    """
+    expected = {index['IndexName'] for index in GLOBAL_SECONDARY_INDEXES}
+    deadline = time.monotonic() + timeout
+    delay = initial_delay
+    while True:
+        try:
+            table = client.describe_table(TableName=table_name)['Table']
+            indexes = {
+                index['IndexName']: index['IndexStatus']
+                for index in table.get('GlobalSecondaryIndexes', [])
+            }
+            pending = sorted(
+                name for name in expected | set(indexes)
+                if indexes.get(name) != 'ACTIVE'
+            )
+            status = table['TableStatus']
+        except client.exceptions.ResourceNotFoundException:
+            # Justo después de create_table la tabla puede no ser visible aún
+            status, pending = 'CREATING', sorted(expected)
+
+        if status == 'ACTIVE' and not pending:
+            logger.info(f"Tabla {table_name} y sus índices están activos")
+            return
+
+        if time.monotonic() + delay > deadline:
+            raise TimeoutError(
+                f"Timeout esperando a la tabla {table_name} (estado {status}, "
+                f"índices pendientes: {', '.join(pending) or 'ninguno'})"
+            )
+        logger.info(
+            f"Tabla {table_name} en estado {status}, índices pendientes: "
+            f"{', '.join(pending) or 'ninguno'}; reintento en {delay:.1f}s"
+        )
+        time.sleep(delay)
+        delay = min(delay * 2, max_delay)
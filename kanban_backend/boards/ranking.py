@@ -0,0 +1,232 @@
+"""
+Claves de orden fraccionario (estilo LexoRank) para tarjetas y columnas.
+
+Cada elemento guarda un ``rank`` de tipo string; el orden de una lista es el
+orden lexicográfico de sus ranks. Para mover un elemento basta con calcular un
+rank entre sus nuevos vecinos y escribir solo ese elemento.
+
+Un rank tiene una parte entera de longitud variable (la primera letra indica
+cuántos dígitos tiene) seguida de una parte fraccionaria opcional. Añadir al
+final incrementa la parte entera, por lo que las claves crecen de forma
+logarítmica; insertar entre dos vecinos añade dígitos a la parte fraccionaria.
+"""
+
+# Dígitos en base 62, en el mismo orden que compara DynamoDB (bytes UTF-8)
+DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+
+# Rank del primer elemento de una lista vacía
+INITIAL_RANK = 'a0'
+# Menor parte entera representable
+SMALLEST_INTEGER = 'A' + DIGITS[0] * 26
+
+# A partir de esta longitud conviene reasignar los ranks de toda la lista
+MAX_RANK_LENGTH = 64
+
+
+def _integer_length(head):
+    if 'a' <= head <= 'z':
+        return ord(head) - ord('a') + 2
+    if 'A' <= head <= 'Z':
+        return ord('Z') - ord(head) + 2
+    raise ValueError(f"Cabecera de rank inválida: {head!r}")
+
+
+def _integer_part(rank):
+    length = _integer_length(rank[0])
+    if length > len(rank):
+        raise ValueError(f"Rank inválido: {rank!r}")
+    return rank[:length]
+
+
+def _validate(rank):
+    if rank == SMALLEST_INTEGER:
+        raise ValueError(f"Rank inválido: {rank!r}")
+    integer = _integer_part(rank)
+    if rank[len(integer):].endswith(DIGITS[0]):
+        raise ValueError(f"Rank inválido: {rank!r}")
+
+
+def _midpoint(a, b):
+    # a y b son partes fraccionarias (b=None es el límite superior abierto)
+    if b is not None and a >= b:
+        raise ValueError(f"{a!r} no es menor que {b!r}")
+    if b:
+        # Prefijo común: el resultado lo comparte
+        n = 0
+        while (a[n] if n < len(a) else DIGITS[0]) == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    if b and len(b) > 1:
+        return b[:1]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def _increment_integer(integer):
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        position = DIGITS.index(digits[i]) + 1
+        if position < BASE:
+            digits[i] = DIGITS[position]
+            return head + ''.join(digits)
+        digits[i] = DIGITS[0]
+    # Desbordamiento: pasar a una parte entera con un dígito más
+    if head == 'Z':
+        return 'a' + DIGITS[0]
+    if head == 'z':
+        return None
+    head = chr(ord(head) + 1)
+    if head > 'a':
+        digits.append(DIGITS[0])
+    else:
+        digits.pop()
+    return head + ''.join(digits)
+
+
+def _decrement_integer(integer):
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        position = DIGITS.index(digits[i]) - 1
+        if position >= 0:
+            digits[i] = DIGITS[position]
+            return head + ''.join(digits)
+        digits[i] = DIGITS[-1]
+    if head == 'a':
+        return 'Z' + DIGITS[-1]
+    if head == 'A':
+        return None
+    head = chr(ord(head) - 1)
+    if head < 'Z':
+        digits.append(DIGITS[-1])
+    else:
+        digits.pop()
+    return head + ''.join(digits)
+
+
+def rank_between(before=None, after=None):
+    """
+    Devuelve un rank estrictamente entre ``before`` y ``after``.
+
+    Cualquiera de los dos puede ser None para indicar el principio o el final
+    de la lista. Lanza ValueError si los ranks no son válidos o no están en
+    orden (por ejemplo, dos elementos con el mismo rank).
+    """
+    if before is not None:
+        _validate(before)
+    if after is not None:
+        _validate(after)
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"{before!r} no es menor que {after!r}")
+
+    if before is None:
+        if after is None:
+            return INITIAL_RANK
+        integer = _integer_part(after)
+        fraction = after[len(integer):]
+        if integer == SMALLEST_INTEGER:
+            return integer + _midpoint('', fraction)
+        if integer < after:
+            return integer
+        result = _decrement_integer(integer)
+        if result is None:
+            raise ValueError("No hay ranks disponibles antes del primero")
+        return result
+
+    integer = _integer_part(before)
+    fraction = before[len(integer):]
+    if after is None:
+        result = _increment_integer(integer)
+        return integer + _midpoint(fraction, None) if result is None else result
+
+    after_integer = _integer_part(after)
+    if integer == after_integer:
+        return integer + _midpoint(fraction, after[len(after_integer):])
+    result = _increment_integer(integer)
+    if result is None:
+        raise ValueError("No hay ranks disponibles después del último")
+    if result < after:
+        return result
+    return integer + _midpoint(fraction, None)
+
+
+def initial_ranks(count):
+    """Genera ``count`` ranks cortos y consecutivos para (re)numerar una lista."""
+    ranks = []
+    rank = None
+    for _ in range(count):
+        rank = rank_between(rank, None)
+        ranks.append(rank)
+    return ranks
+
+
+def ranks_before(rank, count):
+    """
+    Genera ``count`` ranks cortos y consecutivos, todos menores que ``rank``
+    (sin ``rank``, los de initial_ranks). Lanza ValueError si no caben.
+    """
+    if rank is None:
+        return initial_ranks(count)
+    ranks = []
+    for _ in range(count):
+        rank = rank_between(None, rank)
+        ranks.append(rank)
+    return ranks[::-1]
+
+
+def sort_by_rank(items):
+    """
+    Ordena los elementos por rank y rellena ``order`` con su posición.
+
+    Los elementos antiguos sin rank van al final, ordenados por su ``order``
+    y, si tampoco lo tienen, por fecha de creación.
+    """
+    items = sorted(
+        items,
+        key=lambda item: (
+            item.get('rank') is None,
+            item.get('rank') or '',
+            item.get('order') is None,
+            item.get('order') or 0,
+            item.get('created_at') or '',
+        )
+    )
+    for index, item in enumerate(items):
+        item['order'] = index
+    return items
+
+
+def needs_rebalance(items):
+    """Indica si la lista tiene elementos sin rank o ranks demasiado largos."""
+    return any(
+        item.get('rank') is None or len(item['rank']) > MAX_RANK_LENGTH
+        for item in items
+    )
+
+
+def clamp_position(position, items):
+    """Posición de inserción válida en ``items``; sin ``position``, al final."""
+    if position is None:
+        return len(items)
+    return max(0, min(position, len(items)))
+
+
+def rank_at(items, position):
+    """
+    Rank para insertar en ``position`` dentro de ``items`` (ya ordenados).
+    Devuelve None si la lista necesita reasignar sus ranks.
+    """
+    if needs_rebalance(items):
+        return None
+    before = items[position - 1]['rank'] if position > 0 else None
+    after = items[position]['rank'] if position < len(items) else None
+    try:
+        rank = rank_between(before, after)
+    except ValueError:
+        # Ranks duplicados o corruptos entre los vecinos
+        return None
+    return rank if len(rank) <= MAX_RANK_LENGTH else None
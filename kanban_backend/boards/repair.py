@@ -0,0 +1,394 @@
+"""
+Motor de reparación del orden de columnas y tarjetas.
+
+Recorre la tabla con Scans segmentados en paralelo para encontrar los boards y
+las columnas, y después revisa la lista de hijos de cada uno (columnas de un
+board, tarjetas de una columna) en un pool de hilos. Si hay ranks ausentes,
+duplicados o demasiado largos, se reasignan todos los ranks de la lista
+respetando su orden actual.
+
+El ``order`` guardado no se revisa: el orden se deduce del rank al leer la
+lista (``sort_by_rank``) y un movimiento solo escribe el elemento movido, así
+que en una lista sana los ``order`` guardados se repiten o tienen huecos.
+
+El consumo se limita a una fracción de la capacidad de la tabla y de los
+índices que se leen, y el progreso se guarda en un checkpoint para poder
+reanudar una ejecución interrumpida (``python manage.py repair_card_orders
+--resume``).
+"""
+import json
+import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from kanban_backend.boards.ranking import MAX_RANK_LENGTH, sort_by_rank
+
+logger = logging.getLogger(__name__)
+
+# Tipos cuyos hijos se revisan, y el tipo de esos hijos
+PARENT_TYPES = ('board', 'column')
+
+ISSUES = (
+    'missing_rank',
+    'duplicate_rank',
+    'long_rank',
+)
+# Problemas que obligan a reasignar los ranks de toda la lista
+RANK_ISSUES = set(ISSUES)
+
+# Unidades estimadas por item cuando la operación no informa del consumo:
+# lectura eventualmente consistente de hasta 4 KB y escritura transaccional
+READ_UNITS_PER_ITEM = 0.5
+WRITE_UNITS_PER_ITEM = 2
+
+SCAN_PAGE_SIZE = 1000
+
+# El checkpoint se guarda como mucho cada CHECKPOINT_INTERVAL segundos
+CHECKPOINT_INTERVAL = 1
+
+# Índice del que se leen los hijos de cada tipo de padre (ver DynamoDBAdapter)
+LIST_INDEXES = {'board': 'BoardIdIndex', 'column': 'ColumnIdIndex'}
+
+
+class RateLimiter:
+    """
+    Cubeta de fichas compartida por los hilos: limita las unidades de
+    capacidad consumidas por segundo. Sin ``rate`` no limita nada.
+    """
+
+    def __init__(self, rate=None):
+        self.rate = rate or None
+        self._lock = threading.Lock()
+        self._tokens = self.rate or 0
+        self._updated = time.monotonic()
+
+    def consume(self, units):
+        if not self.rate or not units:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= units
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+def table_capacity(client, table_name):
+    """
+    Capacidad provisionada de la tabla y de sus índices globales:
+    ``{nombre: (rcu, wcu)}``, con la tabla bajo la clave None. En modo bajo
+    demanda no hay capacidad de referencia y devuelve un diccionario vacío.
+    """
+    table = client.describe_table(TableName=table_name)['Table']
+    if table.get('BillingModeSummary', {}).get('BillingMode') == 'PAY_PER_REQUEST':
+        return {}
+    capacity = {}
+    for name, description in [(None, table)] + [
+        (index['IndexName'], index) for index in table.get('GlobalSecondaryIndexes', [])
+    ]:
+        throughput = description.get('ProvisionedThroughput', {})
+        capacity[name] = (throughput.get('ReadCapacityUnits', 0), throughput.get('WriteCapacityUnits', 0))
+    return capacity
+
+
+class Checkpoint:
+    """
+    Progreso de una ejecución. El JSON solo guarda los cursores de los
+    segmentos del Scan; los padres encontrados y los ya revisados se añaden a
+    dos registros (``<path>.parents`` y ``<path>.done``), así que cada avance
+    escribe solo lo nuevo. Se vuelca a disco como mucho cada
+    CHECKPOINT_INTERVAL segundos y siempre los registros antes que los
+    cursores: lo que se pierda al interrumpir se vuelve a recorrer o revisar.
+    """
+
+    def __init__(self, path=None, segments=1):
+        self.path = path
+        self._lock = threading.Lock()
+        self.state = {
+            'segments': segments,
+            'scan': {str(segment): {'last_key': None, 'done': False} for segment in range(segments)},
+            'started_at': datetime.utcnow().isoformat(),
+            'completed': False,
+        }
+        # dict como conjunto ordenado: conserva el orden del Scan
+        self._parents = {parent_type: {} for parent_type in PARENT_TYPES}
+        self._repaired = set()
+        self.issues = {issue: 0 for issue in ISSUES}
+        self._saved = 0
+        self._logs = None
+        self._resumed = False
+
+    @classmethod
+    def load(cls, path, segments):
+        checkpoint = cls(path, segments)
+        with open(path) as f:
+            state = json.load(f)
+        if state['segments'] != segments:
+            raise ValueError(
+                f"El checkpoint se creó con {state['segments']} segmentos, no con {segments}"
+            )
+        checkpoint.state = state
+        checkpoint._resumed = True
+        for parent_type, parent_id in checkpoint._read_log('parents'):
+            checkpoint._parents[parent_type][parent_id] = None
+        for parent_id, issues in checkpoint._read_log('done'):
+            checkpoint._repaired.add(parent_id)
+            for issue in filter(None, issues.split(',')):
+                checkpoint.issues[issue] += 1
+        return checkpoint
+
+    @property
+    def checked(self):
+        return len(self._repaired)
+
+    def _read_log(self, name):
+        if not os.path.exists(f'{self.path}.{name}'):
+            return
+        with open(f'{self.path}.{name}') as f:
+            for line in f:
+                # Una línea sin salto es una escritura interrumpida
+                if line.endswith('\n'):
+                    yield line[:-1].split('\t')
+
+    def _open_logs(self):
+        # Llamar con el lock adquirido. Una ejecución nueva empieza los
+        # registros de cero, antes de guardar el primer JSON.
+        if self._logs is None:
+            mode = 'a' if self._resumed else 'w'
+            self._logs = {log: open(f'{self.path}.{log}', mode) for log in ('parents', 'done')}
+        return self._logs
+
+    def _log(self, name, *fields):
+        # Llamar con el lock adquirido
+        if self.path:
+            self._open_logs()[name].write('\t'.join(fields) + '\n')
+
+    def segment(self, segment):
+        return self.state['scan'][str(segment)]
+
+    def scan_page(self, segment, parents, last_key):
+        with self._lock:
+            for item in parents:
+                if item['id'] not in self._parents[item['type']]:
+                    self._parents[item['type']][item['id']] = None
+                    self._log('parents', item['type'], item['id'])
+            self.state['scan'][str(segment)] = {'last_key': last_key, 'done': last_key is None}
+            self._save()
+
+    def pending_parents(self):
+        return [
+            (parent_type, parent_id)
+            for parent_type in PARENT_TYPES
+            for parent_id in self._parents[parent_type]
+            if parent_id not in self._repaired
+        ]
+
+    def parent_done(self, parent_id, issues):
+        with self._lock:
+            self._repaired.add(parent_id)
+            for issue in issues:
+                self.issues[issue] += 1
+            self._log('done', parent_id, ','.join(sorted(issues)))
+            self._save()
+
+    def complete(self):
+        with self._lock:
+            self.state['completed'] = True
+            self.state['completed_at'] = datetime.utcnow().isoformat()
+            self._save(force=True)
+
+    def close(self):
+        """Vuelca lo pendiente y cierra los registros (también tras un error)."""
+        with self._lock:
+            self._save(force=True)
+            if self._logs:
+                for log in self._logs.values():
+                    log.close()
+                self._logs = None
+                self._resumed = True
+
+    def _save(self, force=False):
+        # Llamar con el lock adquirido. El JSON se escribe aparte y se
+        # renombra para que una interrupción no deje el fichero a medias.
+        now = time.monotonic()
+        if not self.path or not (force or now - self._saved >= CHECKPOINT_INTERVAL):
+            return
+        self._saved = now
+        for log in self._open_logs().values():
+            log.flush()
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(self.state, f)
+        os.replace(temporary, self.path)
+
+
+def detect_issues(items):
+    """
+    Problemas de los ranks de una lista de hermanos tal como está guardada.
+    Devuelve ``(problemas, ordenados)``, con los items ordenados por rank
+    (copias, con ``order`` ya recalculado).
+    """
+    issues = set()
+    ranks = [item.get('rank') for item in items]
+    if any(rank is None for rank in ranks):
+        issues.add('missing_rank')
+    present = [rank for rank in ranks if rank is not None]
+    if len(set(present)) != len(present):
+        issues.add('duplicate_rank')
+    if any(len(rank) > MAX_RANK_LENGTH for rank in present):
+        issues.add('long_rank')
+    return issues, sort_by_rank([dict(item) for item in items])
+
+
+class RepairEngine:
+    """
+    Repara el orden de todas las listas de la tabla a través de ``db`` (un
+    DynamoDBAdapter). Las escrituras usan las mismas condiciones de versión
+    que el resto del adaptador, así que se puede ejecutar con la aplicación
+    en marcha.
+    """
+
+    def __init__(self, db, segments=4, workers=4, capacity_share=None, max_read_units=None,
+                 max_write_units=None, checkpoint_path=None, resume=False, dry_run=False):
+        self.db = db
+        self.segments = max(1, int(segments))
+        self.workers = max(1, int(workers))
+        self.dry_run = dry_run
+        if resume and checkpoint_path and os.path.exists(checkpoint_path):
+            self.checkpoint = Checkpoint.load(checkpoint_path, self.segments)
+            logger.info(f"Reanudando la reparación desde {checkpoint_path}")
+        else:
+            self.checkpoint = Checkpoint(checkpoint_path, self.segments)
+
+        # Cada lectura consume de donde lee: el Scan de la tabla y las listas
+        # de BoardIdIndex y ColumnIdIndex. Las escrituras se replican en todos
+        # los índices globales, así que las limita el de menos capacidad.
+        read_rates = {source: max_read_units for source in (None, *LIST_INDEXES.values())}
+        write_rate = max_write_units
+        if capacity_share:
+            capacity = table_capacity(db.dynamodb.meta.client, db.table_name)
+            # En modo bajo demanda no hay capacidad de referencia
+            for source, (rcu, _) in capacity.items():
+                if source in read_rates and rcu:
+                    read_rates[source] = rcu * capacity_share
+            wcu = min((wcu for _, wcu in capacity.values() if wcu), default=0)
+            write_rate = wcu * capacity_share if wcu else write_rate
+        self.read_limiters = {source: RateLimiter(rate) for source, rate in read_rates.items()}
+        self.write_limiter = RateLimiter(write_rate)
+        self._counters_lock = threading.Lock()
+        self.scanned = 0
+
+    def run(self):
+        started = time.monotonic()
+        try:
+            self._scan()
+            return self._repair(self.checkpoint.pending_parents(), started)
+        finally:
+            self.checkpoint.close()
+
+    def repair_board(self, board_id):
+        """
+        Revisa solo las listas de un board (sus columnas y las tarjetas de
+        cada una), sin Scan: el coste es el de leer ese tablero.
+        """
+        started = time.monotonic()
+        columns = self.db.iter_columns(board_id, fields={'id'})
+        parents = [('board', board_id)] + [('column', column['id']) for column in columns]
+        try:
+            return self._repair(parents, started)
+        finally:
+            self.checkpoint.close()
+
+    def _repair(self, parents, started):
+        logger.info(f"Revisando {len(parents)} listas con {self.workers} hilos")
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='repair') as executor:
+            # list() para propagar la primera excepción
+            list(executor.map(lambda parent: self._repair_parent(*parent), parents))
+        self.checkpoint.complete()
+        report = {
+            'scanned': self.scanned,
+            'checked': self.checkpoint.checked,
+            'issues': dict(self.checkpoint.issues),
+            'dry_run': self.dry_run,
+            'seconds': round(time.monotonic() - started, 2),
+        }
+        logger.info(f"Reparación terminada: {report}")
+        return report
+
+    # Fase 1: Scans segmentados
+
+    def _scan(self):
+        pending = [
+            segment for segment in range(self.segments)
+            if not self.checkpoint.segment(segment)['done']
+        ]
+        if not pending:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(pending)),
+                                thread_name_prefix='repair-scan') as executor:
+            list(executor.map(self._scan_segment, pending))
+
+    def _scan_segment(self, segment):
+        kwargs = {
+            'Segment': segment,
+            'TotalSegments': self.segments,
+            'Limit': SCAN_PAGE_SIZE,
+            'ProjectionExpression': '#i, #t',
+            'FilterExpression': '#t IN (:board, :column)',
+            'ExpressionAttributeNames': {'#i': 'id', '#t': 'type'},
+            'ExpressionAttributeValues': {':board': 'board', ':column': 'column'},
+            'ReturnConsumedCapacity': 'TOTAL',
+        }
+        last_key = self.checkpoint.segment(segment)['last_key']
+        while True:
+            if last_key:
+                kwargs['ExclusiveStartKey'] = last_key
+            response = self.db.table.scan(**kwargs)
+            consumed = response.get('ConsumedCapacity', {}).get('CapacityUnits')
+            self.read_limiters[None].consume(
+                consumed if consumed is not None
+                else response.get('ScannedCount', 0) * READ_UNITS_PER_ITEM
+            )
+            last_key = response.get('LastEvaluatedKey')
+            self.checkpoint.scan_page(segment, response.get('Items', []), last_key)
+            with self._counters_lock:
+                self.scanned += response.get('ScannedCount', len(response.get('Items', [])))
+            if not last_key:
+                logger.info(f"Segmento {segment + 1} de {self.segments} recorrido")
+                return
+
+    # Fase 2: revisión de cada lista
+
+    def _repair_parent(self, parent_type, parent_id):
+        found = set()
+
+        def attempt():
+            parent = self.db._get_item(parent_id, parent_type)
+            if not parent:
+                return
+            if parent_type == 'board':
+                items = list(self.db.iter_columns(parent_id))
+            else:
+                items = list(self.db.iter_cards(parent_id))
+            self.read_limiters[LIST_INDEXES[parent_type]].consume(
+                max(1, math.ceil(len(items) * READ_UNITS_PER_ITEM))
+            )
+
+            issues, ordered = detect_issues(items)
+            found.clear()
+            found.update(issues)
+            if not issues or self.dry_run:
+                return
+            self.db._write_ranks(ordered, parent)
+            self.write_limiter.consume((len(ordered) + 1) * WRITE_UNITS_PER_ITEM)
+
+        self.db._retry_on_conflict(attempt, f"reparar el orden de {parent_type} {parent_id}")
+        if found:
+            logger.info(f"{parent_type} {parent_id}: {', '.join(sorted(found))}")
+        self.checkpoint.parent_done(parent_id, found)
@@ -0,0 +1,218 @@
+"""
+Interfaz de almacenamiento de tableros.
+
+El schema, la caché y los loaders solo usan los métodos de BoardRepository,
+así que el almacenamiento se elige con BOARD_STORAGE_BACKEND:
+
+- ``'dynamodb'``: DynamoDBAdapter (dynamodb.py), el de producción;
+- ``'orm'``: DjangoBoardRepository (orm.py), sobre la base de datos de Django
+  (SQLite en modo WAL por defecto), para comparar con un almacenamiento
+  relacional;
+- ``'memory'``: InMemoryBoardRepository (memory.py), sin I/O, para los tests
+  y para medir la lógica de negocio por separado del coste de la red.
+
+Contrato común a todas las implementaciones:
+
+- los items son diccionarios (``id``, ``type``, ``board_id`` o ``column_id``,
+  ``rank``, ``order``, ``version``, ``created_at``, ``updated_at``...) y quien
+  los recibe puede modificarlos;
+- las listas se devuelven ordenadas por rank con ``order`` igual a su
+  posición (``sort_by_rank``); los métodos ``iter_*`` no ordenan;
+- con ``fields`` solo se garantizan esos atributos más PROJECTION_REQUIRED;
+- las páginas por rank solo incluyen los items que tienen rank;
+- un conflicto de escritura que no se resuelve reintentando se notifica con
+  ConcurrentModificationError.
+"""
+import logging
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = {
+    'dynamodb': 'kanban_backend.boards.dynamodb.DynamoDBAdapter',
+    'orm': 'kanban_backend.boards.orm.DjangoBoardRepository',
+    'memory': 'kanban_backend.boards.memory.InMemoryBoardRepository',
+}
+
+# Atributos que se leen siempre aunque no se pidan: la clave y los que usa
+# sort_by_rank para ordenar
+PROJECTION_REQUIRED = ('id', 'rank', 'order', 'created_at')
+
+
+class ConcurrentModificationError(Exception):
+    """Otro cliente modificó los mismos elementos y se agotaron los reintentos."""
+
+
+def project(item, fields):
+    """Copia de ``item`` con solo ``fields`` (y PROJECTION_REQUIRED); sin ``fields``, completa."""
+    if not fields:
+        return dict(item)
+    attributes = set(fields) | set(PROJECTION_REQUIRED)
+    return {key: value for key, value in item.items() if key in attributes}
+
+
+class BoardRepository(ABC):
+    """Operaciones sobre boards, columnas y tarjetas que usa la aplicación."""
+
+    # Lecturas
+
+    @abstractmethod
+    def iter_items_by_type(self, item_type, fields=None, page_size=None):
+        """Itera todos los items de un tipo ('board', 'column' o 'card')."""
+
+    @abstractmethod
+    def iter_columns(self, board_id, fields=None, page_size=None):
+        """Itera las columnas del board, sin ordenar."""
+
+    @abstractmethod
+    def iter_cards(self, column_id, fields=None, page_size=None):
+        """Itera las tarjetas de la columna, sin ordenar."""
+
+    @abstractmethod
+    def get_boards(self, fields=None):
+        """Lista de boards."""
+
+    @abstractmethod
+    def get_board(self, board_id):
+        """Board por su id, o None."""
+
+    @abstractmethod
+    def get_column(self, column_id):
+        """Columna por su id, o None."""
+
+    @abstractmethod
+    def get_card(self, card_id):
+        """Tarjeta por su id, o None."""
+
+    @abstractmethod
+    def get_columns(self, board_id, fields=None):
+        """Columnas del board ordenadas por rank."""
+
+    @abstractmethod
+    def get_cards(self, column_id, fields=None):
+        """Tarjetas de la columna ordenadas por rank."""
+
+    @abstractmethod
+    def get_columns_page(self, board_id, limit, after=None, fields=None):
+        """
+        Página de columnas en orden de rank: ``(columnas, hay_más)``. ``after``
+        es la última columna de la página anterior (basta con id y rank).
+        """
+
+    @abstractmethod
+    def get_cards_page(self, column_id, limit, after=None, fields=None):
+        """Página de tarjetas en orden de rank; ver get_columns_page."""
+
+    def get_columns_for_boards(self, board_ids, fields=None):
+        """Columnas de varios boards, agrupadas por board_id."""
+        return {board_id: self.get_columns(board_id, fields) for board_id in dict.fromkeys(board_ids)}
+
+    def get_cards_for_columns(self, column_ids, fields=None):
+        """Tarjetas de varias columnas, agrupadas por column_id."""
+        return {column_id: self.get_cards(column_id, fields) for column_id in dict.fromkeys(column_ids)}
+
+    def get_board_trees(self, board_ids, column_fields=None, card_fields=None):
+        """
+        Devuelve ``{board_id: {'columns': [...], 'cards': {column_id: [...]}}}``
+        con columnas y tarjetas ya ordenadas: un lote para las columnas de
+        todos los tableros y otro para sus tarjetas.
+        """
+        board_ids = list(dict.fromkeys(board_ids))
+        columns_by_board = self.get_columns_for_boards(board_ids, fields=column_fields)
+        column_ids = [
+            column['id']
+            for board_id in board_ids
+            for column in columns_by_board.get(board_id, [])
+        ]
+        cards_by_column = self.get_cards_for_columns(column_ids, fields=card_fields) if column_ids else {}
+        trees = {}
+        for board_id in board_ids:
+            columns = columns_by_board.get(board_id, [])
+            trees[board_id] = {
+                'columns': columns,
+                'cards': {column['id']: cards_by_column.get(column['id'], []) for column in columns},
+            }
+        return trees
+
+    # Escrituras
+
+    @abstractmethod
+    def create_board(self, name, type='board'):
+        """
+        Crea el board con sus columnas por defecto y devuelve su id. Si ya
+        existe un board se devuelve el id del primero.
+        """
+
+    @abstractmethod
+    def create_column(self, board_id, name, order=None):
+        """Crea la columna en la posición ``order`` (al final sin ella) y devuelve su id."""
+
+    @abstractmethod
+    def move_column(self, column_id, new_order):
+        """Mueve la columna y devuelve ``{'id', 'type', 'order', 'board_id'}``."""
+
+    @abstractmethod
+    def delete_column(self, column_id, progress=None):
+        """
+        Elimina la columna y traslada sus tarjetas al final de la primera de
+        las restantes. ``progress(hechas, total)`` recibe el avance.
+        """
+
+    @abstractmethod
+    def create_card(self, column_id, title, description='', order=None):
+        """
+        Crea la tarjeta en la posición ``order`` (al final sin ella) y
+        devuelve su id. Falla si el título ya existe en la columna.
+        """
+
+    @abstractmethod
+    def update_card(self, card_id, title, description=None):
+        """Cambia título y descripción y devuelve la tarjeta actualizada."""
+
+    @abstractmethod
+    def move_card(self, card_id, column_id, card_order):
+        """Mueve la tarjeta y la devuelve, o None si no existe ella o la columna."""
+
+    @abstractmethod
+    def delete_card(self, card_id):
+        """Elimina la tarjeta; falla si no existe."""
+
+    @abstractmethod
+    def fix_card_orders(self, board_id=None):
+        """
+        Repara los ranks de las listas de ``board_id`` (sin él, de todos los
+        boards) y devuelve un informe.
+        """
+
+    # Carga masiva
+
+    @abstractmethod
+    def load_items(self, items):
+        """
+        Escribe tal cual items ya construidos (boards, columnas y tarjetas con
+        rank y order), sin las comprobaciones de las altas: para seeds y
+        benchmarks. Los padres deben existir o ir antes en ``items``. Devuelve
+        el número de items escritos.
+        """
+
+
+def _setting(name, default):
+    try:
+        return getattr(settings, name, default)
+    except ImproperlyConfigured:
+        return default
+
+
+def create_repository(backend=None):
+    """Instancia el almacenamiento de BOARD_STORAGE_BACKEND (o ``backend``)."""
+    backend = backend or _setting('BOARD_STORAGE_BACKEND', 'dynamodb')
+    if backend not in BACKENDS:
+        raise ImproperlyConfigured(
+            f"BOARD_STORAGE_BACKEND inválido: {backend} (opciones: {', '.join(BACKENDS)})"
+        )
+    logger.info(f"Almacenamiento de tableros: {backend}")
+    return import_string(BACKENDS[backend])()
@@ -0,0 +1,240 @@
+"""
+Generación de tableros sintéticos para pruebas de carga y dimensionado.
+
+Los datos son deterministas para una semilla: cada tablero usa su propio
+generador (``{seed}-{índice}``), así que el contenido no depende del orden
+en que los hilos escriben. Las longitudes imitan tableros reales: títulos de
+unas pocas palabras, descripciones a menudo vacías con una cola larga de
+textos extensos, y columnas de tamaños muy distintos (con ``skew`` 1 la
+columna mayor tiene tantas tarjetas como todas las demás juntas, más o
+menos; con 0 el reparto es uniforme).
+
+Seeder escribe los items con ``load_items`` del repositorio configurado,
+en lotes repartidos entre un pool de hilos.
+"""
+import logging
+import math
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from kanban_backend.boards.ranking import initial_ranks
+
+logger = logging.getLogger(__name__)
+
+COLUMN_NAMES = ('Por Hacer', 'En Progreso', 'Completado', 'Revisión', 'Bloqueado', 'Pruebas', 'Despliegue')
+
+WORDS = (
+    'revisar', 'actualizar', 'diseño', 'cliente', 'pruebas', 'despliegue', 'error', 'informe',
+    'reunión', 'tablero', 'tarjeta', 'columna', 'migración', 'índice', 'rendimiento', 'caché',
+    'documentar', 'API', 'frontend', 'backend', 'sprint', 'bloqueado', 'pendiente', 'urgente',
+    'de', 'la', 'el', 'en', 'para', 'con', 'los', 'del', 'nuevo', 'página', 'usuario', 'datos',
+)
+
+# Palabras por título: lognormal con mediana TITLE_WORDS_MEDIAN
+TITLE_WORDS_MEDIAN = 4
+TITLE_MAX_WORDS = 15
+# Descripciones: una parte vacías y el resto lognormal en caracteres
+EMPTY_DESCRIPTION_SHARE = 0.35
+DESCRIPTION_CHARS_MEDIAN = 120
+DESCRIPTION_MAX_CHARS = 4000
+
+
+def _uuid(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _words(rng, count):
+    return ' '.join(rng.choices(WORDS, k=count))
+
+
+def title(rng, number):
+    """Título de unas pocas palabras; ``number`` lo hace único en el tablero."""
+    count = min(TITLE_MAX_WORDS, max(1, round(rng.lognormvariate(math.log(TITLE_WORDS_MEDIAN), 0.5))))
+    return f'{_words(rng, count).capitalize()} #{number}'
+
+
+def description(rng):
+    if rng.random() < EMPTY_DESCRIPTION_SHARE:
+        return ''
+    length = min(DESCRIPTION_MAX_CHARS, int(rng.lognormvariate(math.log(DESCRIPTION_CHARS_MEDIAN), 1.0)))
+    text = _words(rng, length // 6 + 1)
+    return text[:length].rstrip().capitalize()
+
+
+def column_sizes(rng, cards, columns, skew=1.0):
+    """
+    Reparte ``cards`` tarjetas entre ``columns`` columnas con pesos de Zipf
+    (1 / rango ** skew) en orden aleatorio, por el método del mayor resto.
+    """
+    weights = [1 / (rank + 1) ** skew for rank in range(columns)]
+    rng.shuffle(weights)
+    total = sum(weights)
+    shares = [cards * weight / total for weight in weights]
+    sizes = [int(share) for share in shares]
+    remainders = sorted(range(columns), key=lambda index: sizes[index] - shares[index])
+    for index in remainders[:cards - sum(sizes)]:
+        sizes[index] += 1
+    return sizes
+
+
+def card_items(rng, column_id, count, first_number=0, timestamp=None):
+    """Tarjetas de una columna con ranks consecutivos, ids y textos deterministas."""
+    now = timestamp or datetime.utcnow().isoformat()
+    return [
+        {
+            'id': _uuid(rng),
+            'type': 'card',
+            'column_id': column_id,
+            'title': title(rng, first_number + index),
+            'description': description(rng),
+            'order': index,
+            'rank': rank,
+            'created_at': now,
+            'updated_at': now,
+        }
+        for index, rank in enumerate(initial_ranks(count))
+    ]
+
+
+def board_items(rng, name, columns, timestamp=None):
+    """Tablero y sus ``columns`` columnas ordenadas."""
+    now = timestamp or datetime.utcnow().isoformat()
+    board = {'id': _uuid(rng), 'type': 'board', 'name': name, 'created_at': now, 'updated_at': now}
+    column_items = [
+        {
+            'id': _uuid(rng),
+            'type': 'column',
+            'board_id': board['id'],
+            'name': COLUMN_NAMES[index] if index < len(COLUMN_NAMES) else f'Columna {index + 1}',
+            'order': index,
+            'rank': rank,
+            'created_at': now,
+            'updated_at': now,
+        }
+        for index, rank in enumerate(initial_ranks(columns))
+    ]
+    return board, column_items
+
+
+class Seeder:
+    """
+    Crea ``boards`` tableros de ``columns`` columnas y ``cards`` tarjetas cada
+    uno. Primero se escriben tableros y columnas y después las tarjetas, en
+    lotes de ``batch_size`` items repartidos entre ``workers`` hilos (con
+    como mucho ``2 * workers`` lotes en memoria). ``progress(written,
+    seconds)`` se llama como mucho una vez por segundo.
+    """
+
+    def __init__(self, db, boards=1, columns=3, cards=0, skew=1.0, seed=42, workers=8,
+                 batch_size=1000, name='Tablero', progress=None):
+        self.db = db
+        self.boards = int(boards)
+        self.columns = max(1, int(columns))
+        self.cards = max(0, int(cards))
+        self.skew = float(skew)
+        self.seed = seed
+        self.workers = max(1, int(workers))
+        self.batch_size = max(1, int(batch_size))
+        self.name = name
+        self.progress = progress
+        self._lock = threading.Lock()
+        self._written = 0
+        self._reported = 0
+        self._started = None
+
+    def run(self):
+        self._started = time.monotonic()
+        self._written = 0
+        plans = [self._plan(index) for index in range(self.boards)]
+        # Con instantáneas, se montan al final en lugar de tras cada lote
+        snapshots = getattr(self.db, 'snapshots', False)
+        if snapshots:
+            self.db.snapshots = False
+        try:
+            self._write(([plan['board'], *plan['columns']] for plan in plans))
+            self._write(self._card_batches(plans))
+            rebuilt = self._rebuild_snapshots(plans) if snapshots else 0
+        except Exception as e:
+            logger.error(f"Error al sembrar tableros: {str(e)}")
+            raise
+        finally:
+            if snapshots:
+                self.db.snapshots = True
+
+        seconds = time.monotonic() - self._started
+        report = {
+            'boards': self.boards,
+            'columns': self.boards * self.columns,
+            'cards': self.boards * self.cards,
+            'items': self._written,
+            'seconds': round(seconds, 2),
+            'items_per_second': round(self._written / seconds, 1) if seconds else None,
+            'seed': self.seed,
+            'board_ids': [plan['board']['id'] for plan in plans],
+        }
+        if snapshots:
+            report['snapshots'] = rebuilt
+        logger.info(f"Siembra terminada: {self._written} items en {report['seconds']} s")
+        return report
+
+    def _plan(self, index):
+        rng = random.Random(f'{self.seed}-{index}')
+        name = self.name if self.boards == 1 else f'{self.name} {index + 1}'
+        board, columns = board_items(rng, name, self.columns)
+        return {
+            'rng': rng,
+            'board': board,
+            'columns': columns,
+            'sizes': column_sizes(rng, self.cards, self.columns, self.skew),
+        }
+
+    def _card_batches(self, plans):
+        # Las tarjetas se generan bajo demanda: una tabla de millones de items
+        # no se monta entera en memoria
+        for plan in plans:
+            number = 0
+            for column, size in zip(plan['columns'], plan['sizes']):
+                cards = card_items(plan['rng'], column['id'], size, first_number=number)
+                number += size
+                for start in range(0, size, self.batch_size):
+                    yield cards[start:start + self.batch_size]
+
+    def _write(self, batches):
+        slots = threading.BoundedSemaphore(self.workers * 2)
+        errors = []
+
+        def run(items):
+            try:
+                if not errors:
+                    self._record(self.db.load_items(items))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                slots.release()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='seed') as executor:
+            for items in batches:
+                slots.acquire()
+                if errors:
+                    slots.release()
+                    break
+                executor.submit(run, items)
+        if errors:
+            raise errors[0]
+
+    def _record(self, written):
+        with self._lock:
+            self._written += written
+            now = time.monotonic()
+            if self.progress and now - self._reported >= 1:
+                self._reported = now
+                self.progress(self._written, now - self._started)
+
+    def _rebuild_snapshots(self, plans):
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='seed') as executor:
+            sizes = executor.map(self.db.rebuild_board_snapshot, [plan['board']['id'] for plan in plans])
+            return sum(1 for size in sizes if size is not None)
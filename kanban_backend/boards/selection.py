@@ -0,0 +1,62 @@
+"""
+Atributos de DynamoDB que pide una query GraphQL.
+
+Los resolvers los pasan al adaptador como ProjectionExpression para no leer ni
+deserializar atributos que nadie ha pedido (p. ej. ``description`` en una vista
+que solo muestra títulos).
+"""
+from graphene.utils.str_converters import to_snake_case
+from graphql import FieldNode, FragmentSpreadNode, InlineFragmentNode
+
+# Campos que se resuelven con otra consulta, no son atributos del item
+RELATION_FIELDS = {'columns', 'cards', 'columnsConnection', 'cardsConnection'}
+
+
+def _selected_fields(selection_set, fragments, visited=frozenset()):
+    if selection_set is None:
+        return
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            yield selection
+        elif isinstance(selection, FragmentSpreadNode):
+            name = selection.name.value
+            fragment = fragments.get(name)
+            if fragment is not None and name not in visited:
+                yield from _selected_fields(fragment.selection_set, fragments, visited | {name})
+        elif isinstance(selection, InlineFragmentNode):
+            yield from _selected_fields(selection.selection_set, fragments, visited)
+
+
+def _find_fields(selection_set, fragments, field_name):
+    for field in _selected_fields(selection_set, fragments):
+        if field.name.value == field_name:
+            yield field
+        yield from _find_fields(field.selection_set, fragments, field_name)
+
+
+def requested_attributes(info, field_name=None, path=()):
+    """
+    Devuelve los atributos pedidos en todos los campos ``field_name`` de la
+    operación (por defecto, el que se está resolviendo). Se unen todas las
+    apariciones porque un mismo lote sirve a todos los resolvers hermanos,
+    aunque usen alias distintos. Con ``path`` se baja a un subcampo, p. ej.
+    ``('edges', 'node')`` en una conexión. Los nombres de GraphQL se traducen a
+    los del item (``columnId`` -> ``column_id``).
+    """
+    field_name = field_name or info.field_name
+    fields = list(_find_fields(info.operation.selection_set, info.fragments, field_name))
+    for name in path:
+        fields = [
+            child
+            for field in fields
+            for child in _selected_fields(field.selection_set, info.fragments)
+            if child.name.value == name
+        ]
+    attributes = set()
+    for field in fields:
+        for child in _selected_fields(field.selection_set, info.fragments):
+            name = child.name.value
+            if name.startswith('__') or name in RELATION_FIELDS:
+                continue
+            attributes.add(to_snake_case(name))
+    return attributes
@@ -0,0 +1,229 @@
+"""
+Segundo nivel de la caché de tableros, compartido entre workers mediante el
+framework de caché de Django (LocMemCache, FileBasedCache, Redis...).
+
+Las claves llevan versión: cada tablero tiene un contador que las mutaciones
+incrementan, y un contador global (``epoch``) invalida todos los tableros de
+golpe cuando no se sabe a qué tablero pertenece un elemento. Tras una escritura
+nadie vuelve a leer la clave antigua, así que no se sirven datos anteriores a
+ella desde ningún worker.
+
+Cada entrada tiene dos plazos: hasta ``fresh_until`` se sirve tal cual; después,
+y mientras siga en la caché, se sirve igualmente (stale-while-revalidate) y un
+único worker la recarga en segundo plano.
+
+Las claves de árboles y listas incluyen la proyección con que se leyeron sus
+items, así que una consulta solo recibe entradas con sus mismos atributos.
+"""
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+EPOCH_KEY = 'board_epoch'
+LIST_VERSION_KEY = 'board_list_version'
+# Duración máxima del candado de recarga si el worker que lo tiene muere
+REFRESH_LOCK_TIMEOUT = 30
+
+
+def _initial_version():
+    # Si el contador desaparece de la caché, el nuevo valor no puede coincidir
+    # con uno anterior (y por tanto con una entrada antigua todavía guardada)
+    return time.time_ns()
+
+
+class SharedBoardCache:
+    def __init__(self, cache, fresh_ttl=30, stale_ttl=300):
+        self.cache = cache
+        self.fresh_ttl = float(fresh_ttl)
+        self.stale_ttl = float(stale_ttl)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._counters_lock = threading.Lock()
+        self._counters = {
+            'hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'refreshes': 0,
+            'refresh_errors': 0,
+        }
+
+    # Versiones
+
+    def tokens(self, board_ids):
+        """Devuelve ``{board_id: (epoch, versión)}`` con una sola lectura."""
+        keys = [EPOCH_KEY] + [self._version_key(board_id) for board_id in board_ids]
+        values = self.cache.get_many(keys)
+        epoch = values.get(EPOCH_KEY)
+        if epoch is None:
+            epoch = self._init_counter(EPOCH_KEY)
+        tokens = {}
+        for board_id in board_ids:
+            version = values.get(self._version_key(board_id))
+            if version is None:
+                version = self._init_counter(self._version_key(board_id))
+            tokens[board_id] = (epoch, version)
+        return tokens
+
+    def list_token(self):
+        values = self.cache.get_many([EPOCH_KEY, LIST_VERSION_KEY])
+        epoch = values.get(EPOCH_KEY)
+        if epoch is None:
+            epoch = self._init_counter(EPOCH_KEY)
+        version = values.get(LIST_VERSION_KEY)
+        if version is None:
+            version = self._init_counter(LIST_VERSION_KEY)
+        return (epoch, version)
+
+    def bump_board(self, board_id):
+        self._bump(self._version_key(board_id))
+
+    def bump_board_list(self):
+        self._bump(LIST_VERSION_KEY)
+
+    def bump_all(self):
+        self._bump(EPOCH_KEY)
+
+    def owner(self, item_id):
+        """board_id de una columna o tarjeta, si algún worker lo ha registrado."""
+        return self.cache.get(self._owner_key(item_id))
+
+    # Entradas
+
+    def get_trees(self, board_ids, tokens, refresh, fields=(None, None)):
+        """
+        Devuelve ``(frescos, caducados)`` para los tableros encontrados. Por
+        cada tablero caducado se programa como mucho una recarga en segundo
+        plano llamando a ``refresh([board_id])``.
+        """
+        keys = {self._tree_key(board_id, tokens[board_id], fields): board_id for board_id in board_ids}
+        entries = self.cache.get_many(list(keys))
+        fresh, stale = {}, {}
+        now = time.time()
+        for key, board_id in keys.items():
+            entry = entries.get(key)
+            if entry is None:
+                self._count('misses')
+            elif entry['fresh_until'] > now:
+                self._count('hits')
+                fresh[board_id] = entry['tree']
+            else:
+                self._count('stale_hits')
+                stale[board_id] = entry['tree']
+                self._schedule_refresh(key, lambda board_id=board_id: refresh([board_id]))
+        return fresh, stale
+
+    def set_trees(self, trees, tokens, fields=(None, None)):
+        entries = {}
+        owners = {}
+        fresh_until = time.time() + self.fresh_ttl
+        for board_id, tree in trees.items():
+            entries[self._tree_key(board_id, tokens[board_id], fields)] = {
+                'tree': tree,
+                'fresh_until': fresh_until,
+            }
+            for column in tree['columns']:
+                owners[self._owner_key(column['id'])] = board_id
+            for cards in tree['cards'].values():
+                for card in cards:
+                    owners[self._owner_key(card['id'])] = board_id
+        timeout = self.fresh_ttl + self.stale_ttl
+        self.cache.set_many(entries, timeout=timeout)
+        # Los propietarios viven más que los árboles para poder invalidarlos
+        self.cache.set_many(owners, timeout=timeout * 2)
+
+    def get_board_list(self, token, refresh, fields=(None,)):
+        key = self._list_key(token, fields)
+        entry = self.cache.get(key)
+        if entry is None:
+            self._count('misses')
+            return None
+        if entry['fresh_until'] > time.time():
+            self._count('hits')
+        else:
+            self._count('stale_hits')
+            self._schedule_refresh(key, refresh)
+        return entry['boards']
+
+    def set_board_list(self, boards, token, fields=(None,)):
+        self.cache.set(
+            self._list_key(token, fields),
+            {'boards': boards, 'fresh_until': time.time() + self.fresh_ttl},
+            timeout=self.fresh_ttl + self.stale_ttl
+        )
+
+    def stats(self):
+        with self._counters_lock:
+            return dict(self._counters)
+
+    # Internos
+
+    def _schedule_refresh(self, key, refresh):
+        # cache.add es atómico: solo un worker consigue el candado
+        lock_key = f'board_refresh:{key}'
+        if not self.cache.add(lock_key, 1, timeout=REFRESH_LOCK_TIMEOUT):
+            return
+        self._count('refreshes')
+
+        def run():
+            try:
+                refresh()
+            except Exception as e:
+                self._count('refresh_errors')
+                logger.error(f"Error al recargar {key} en segundo plano: {str(e)}")
+            finally:
+                self.cache.delete(lock_key)
+
+        self._get_executor().submit(run)
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=2,
+                        thread_name_prefix='board-cache-refresh'
+                    )
+        return self._executor
+
+    def _init_counter(self, key):
+        self.cache.add(key, _initial_version(), timeout=None)
+        value = self.cache.get(key)
+        return value if value is not None else _initial_version()
+
+    def _bump(self, key):
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            # La clave no existe (nunca se leyó o se ha expulsado)
+            self.cache.add(key, _initial_version(), timeout=None)
+
+    def _count(self, name):
+        with self._counters_lock:
+            self._counters[name] += 1
+
+    @staticmethod
+    def _version_key(board_id):
+        return f'board_version:{board_id}'
+
+    @staticmethod
+    def _owner_key(item_id):
+        return f'board_owner:{item_id}'
+
+    @staticmethod
+    def _projection_key(fields):
+        if all(field_set is None for field_set in fields):
+            return 'all'
+        text = '|'.join('*' if field_set is None else ','.join(sorted(field_set)) for field_set in fields)
+        return hashlib.sha1(text.encode()).hexdigest()[:12]
+
+    @classmethod
+    def _tree_key(cls, board_id, token, fields=(None, None)):
+        return f'board_tree:{board_id}:{token[0]}:{token[1]}:{cls._projection_key(fields)}'
+
+    @classmethod
+    def _list_key(cls, token, fields=(None,)):
+        return f'board_list:{token[0]}:{token[1]}:{cls._projection_key(fields)}'
@@ -0,0 +1,95 @@
+"""
+Instantánea materializada de un tablero.
+
+Con ``DYNAMODB_BOARD_SNAPSHOTS`` activado cada board tiene un item
+``snapshot#<board_id>`` con el árbol ya ordenado (columnas y tarjetas)
+serializado en JSON y comprimido con zlib. Las escrituras del adaptador lo
+actualizan en la misma transacción que los items, condicionado a su versión,
+de modo que una carga de tablero es un único GetItem (o un BatchGetItem para
+varios) en lugar de consultar los índices.
+
+Si la instantánea falta, no cabe en un item o se ha desincronizado, las
+lecturas vuelven a montar el árbol desde los índices; se regenera con
+``python manage.py rebuild_board_snapshots``.
+"""
+import json
+import zlib
+from decimal import Decimal
+
+from kanban_backend.boards.layout import without_layout_keys
+from kanban_backend.boards.ranking import sort_by_rank
+
+SNAPSHOT_TYPE = 'snapshot'
+SNAPSHOT_PREFIX = 'snapshot#'
+
+# Tamaño máximo del árbol comprimido: un item de DynamoDB admite 400 KB
+# incluidos nombres y el resto de atributos
+SNAPSHOT_MAX_BYTES = 350 * 1024
+
+
+def snapshot_id(board_id):
+    return f'{SNAPSHOT_PREFIX}{board_id}'
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8')
+    raise TypeError(f"No se puede serializar {type(value).__name__}")
+
+
+def encode_tree(tree):
+    """Serializa ``{'board', 'columns', 'cards'}`` en bytes comprimidos."""
+    payload = {
+        'board': without_layout_keys(tree['board']) if tree.get('board') else None,
+        'columns': [without_layout_keys(column) for column in tree['columns']],
+        'cards': {
+            column_id: [without_layout_keys(card) for card in cards]
+            for column_id, cards in tree['cards'].items()
+        },
+    }
+    return zlib.compress(json.dumps(payload, default=_json_default, separators=(',', ':')).encode('utf-8'))
+
+
+def decode_tree(data):
+    # boto3 devuelve los atributos binarios como Binary
+    if hasattr(data, 'value'):
+        data = data.value
+    return json.loads(zlib.decompress(bytes(data)).decode('utf-8'))
+
+
+def apply_changes(tree, upserts=(), removals=()):
+    """
+    Aplica a ``tree`` los items escritos (``upserts``, con su estado final) y
+    los ids eliminados (``removals``). Las listas afectadas se reordenan por
+    rank. Devuelve un árbol nuevo; ``tree`` no se modifica.
+    """
+    board = tree.get('board')
+    columns = {column['id']: column for column in tree['columns']}
+    cards = {column_id: list(items) for column_id, items in tree['cards'].items()}
+
+    removed = set(removals)
+    for item in upserts:
+        removed.add(item['id'])
+    for column_id in list(cards):
+        cards[column_id] = [card for card in cards[column_id] if card['id'] not in removed]
+    for item_id in removed:
+        columns.pop(item_id, None)
+
+    for item in upserts:
+        item = without_layout_keys(item)
+        if item.get('type') == 'column':
+            columns[item['id']] = item
+            cards.setdefault(item['id'], [])
+        elif item.get('type') == 'card':
+            cards.setdefault(item.get('column_id'), []).append(item)
+        elif item.get('type') == 'board':
+            board = item
+
+    ordered = sort_by_rank(list(columns.values()))
+    return {
+        'board': board,
+        'columns': ordered,
+        'cards': {column['id']: sort_by_rank(cards.get(column['id'], [])) for column in ordered},
+    }
@@ -1,6 +1,7 @@
 from django.http import JsonResponse
 from django.views import View
+from kanban_backend.boards.cache import board_cache
 
 class HealthCheckView(View):
     def get(self, request, *args, **kwargs):
-        return JsonResponse({"status": "healthy"}) 
\ No newline at end of file
+        return JsonResponse({"status": "healthy", "board_cache": board_cache.stats()})
@@ -1,23 +1,122 @@
+import base64
+import inspect
+import json
 import graphene
 from graphene_django import DjangoObjectType
-from kanban_backend.boards.dynamodb import DynamoDBAdapter
+from graphql import GraphQLError
+from kanban_backend.boards.cache import board_cache, get_boards
+from kanban_backend.boards.layout import without_layout_keys
+from kanban_backend.boards.loaders import get_loaders
+from kanban_backend.boards.repository import ConcurrentModificationError, create_repository
+from kanban_backend.boards.selection import requested_attributes
 import logging
 
 logger = logging.getLogger(__name__)
 
-db = DynamoDBAdapter()
+db = create_repository()
+
+# Tamaño de página de las conexiones (first)
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+class ConflictError(GraphQLError):
+    """Error tipado para conflictos de concurrencia: el cliente debe refrescar y reintentar."""
+    code = 'CONCURRENT_MODIFICATION'
+
+    def __init__(self, error):
+        super().__init__(str(error), extensions={'code': self.code})
+
+def _then(result, build, field):
+    """
+    Aplica ``build`` al resultado de un cargador. En el endpoint asíncrono el
+    resultado es un awaitable y se devuelve una corrutina para que graphql
+    resuelva los campos hermanos a la vez.
+    """
+    if not inspect.isawaitable(result):
+        return build(result)
+
+    async def resolve_async():
+        try:
+            return build(await result)
+        except Exception as e:
+            logger.error(f"Error al resolver {field}: {str(e)}")
+            return []
+
+    return resolve_async()
+
+def _encode_cursor(item, offset):
+    # El cursor lleva lo necesario para ExclusiveStartKey y la posición
+    payload = json.dumps({'id': item['id'], 'rank': item.get('rank'), 'offset': offset})
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+def _decode_cursor(cursor):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return {'id': payload['id'], 'rank': payload['rank'], 'offset': int(payload['offset'])}
+    except Exception:
+        raise GraphQLError(f"Cursor inválido: {cursor}")
+
+def _connection_page(connection, fetch, build, info, first, after):
+    """
+    Construye una página Relay. ``fetch(limit, after, fields)`` devuelve
+    ``(items, hay_más)`` en orden de rank y ``build`` los convierte en nodos.
+    """
+    first = DEFAULT_PAGE_SIZE if first is None else first
+    if first < 0 or first > MAX_PAGE_SIZE:
+        raise GraphQLError(f"first debe estar entre 0 y {MAX_PAGE_SIZE}")
+    start = _decode_cursor(after) if after else None
+    offset = start['offset'] + 1 if start else 0
+    fields = requested_attributes(info, path=('edges', 'node'))
+    items, has_next = fetch(first, start, fields or None)
+    cursors = []
+    for index, item in enumerate(items):
+        # order es la posición en la lista completa, no en la página
+        item['order'] = offset + index
+        cursors.append(_encode_cursor(item, offset + index))
+    edges = [
+        connection.Edge(node=node, cursor=cursor)
+        for node, cursor in zip(build(items), cursors)
+    ]
+    return connection(
+        edges=edges,
+        page_info=graphene.relay.PageInfo(
+            has_next_page=has_next,
+            has_previous_page=offset > 0,
+            start_cursor=cursors[0] if cursors else None,
+            end_cursor=cursors[-1] if cursors else None
+        )
+    )
+
+def _build_columns(columns):
+    return [ColumnType(**without_layout_keys(column)) for column in columns]
+
+def _build_cards(cards):
+    # Convertir column_id a columnId para cada tarjeta
+    result = []
+    for card in cards:
+        card = dict(card)
+        if 'column_id' in card:
+            card['columnId'] = card.pop('column_id')
+        result.append(CardType(**without_layout_keys(card)))
+    return result
 
 class BoardType(graphene.ObjectType):
     id = graphene.ID()
     type = graphene.String()
     name = graphene.String()
+    version = graphene.Int()
     created_at = graphene.String()
     updated_at = graphene.String()
     columns = graphene.List(lambda: ColumnType)
 
     def resolve_columns(self, info):
         try:
-            return [ColumnType(**column) for column in db.get_columns(self.id)]
+            loaders = get_loaders(info, db)
+            loaders.select(
+                columns=requested_attributes(info),
+                cards=requested_attributes(info, 'cards')
+            )
+            return _then(loaders.columns.load(self.id), _build_columns, 'columns')
         except Exception as e:
             logger.error(f"Error al resolver columns: {str(e)}")
             return []
@@ -27,20 +126,32 @@ class ColumnType(graphene.ObjectType):
     type = graphene.String()
     name = graphene.String()
     order = graphene.Int()
+    rank = graphene.String()
+    version = graphene.Int()
     board_id = graphene.ID()
     created_at = graphene.String()
     updated_at = graphene.String()
     cards = graphene.List(lambda: CardType)
+    cards_connection = graphene.Field(lambda: CardConnection, first=graphene.Int(), after=graphene.String())
+
+    def resolve_cards_connection(self, info, first=None, after=None):
+        try:
+            return _connection_page(
+                CardConnection,
+                lambda limit, start, fields: db.get_cards_page(self.id, limit, start, fields),
+                _build_cards, info, first, after
+            )
+        except GraphQLError:
+            raise
+        except Exception as e:
+            logger.error(f"Error al resolver cardsConnection: {str(e)}")
+            return None
 
     def resolve_cards(self, info):
         try:
-            cards = db.get_cards(self.id)
-            # Convertir column_id a columnId para cada tarjeta
-            for card in cards:
-                if 'column_id' in card:
-                    card['columnId'] = card['column_id']
-                    del card['column_id']
-            return [CardType(**card) for card in cards]
+            loaders = get_loaders(info, db)
+            loaders.select(cards=requested_attributes(info))
+            return _then(loaders.cards.load(self.id), _build_cards, 'cards')
         except Exception as e:
             logger.error(f"Error al resolver cards: {str(e)}")
             return []
@@ -51,32 +162,87 @@ class CardType(graphene.ObjectType):
     title = graphene.String()
     description = graphene.String()
     order = graphene.Int()
+    rank = graphene.String()
+    version = graphene.Int()
     columnId = graphene.ID()
     created_at = graphene.String()
     updated_at = graphene.String()
 
+class ColumnConnection(graphene.relay.Connection):
+    class Meta:
+        node = ColumnType
+
+class CardConnection(graphene.relay.Connection):
+    class Meta:
+        node = CardType
+
 class Query(graphene.ObjectType):
     boards = graphene.List(BoardType)
     columns = graphene.List(ColumnType, board_id=graphene.ID())
     cards = graphene.List(CardType, column_id=graphene.ID())
+    # Paginadas en orden de rank (first/after)
+    columns_connection = graphene.Field(
+        ColumnConnection, board_id=graphene.ID(required=True), first=graphene.Int(), after=graphene.String()
+    )
+    cards_connection = graphene.Field(
+        CardConnection, column_id=graphene.ID(required=True), first=graphene.Int(), after=graphene.String()
+    )
+
+    def resolve_columns_connection(self, info, board_id, first=None, after=None):
+        try:
+            return _connection_page(
+                ColumnConnection,
+                lambda limit, start, fields: db.get_columns_page(board_id, limit, start, fields),
+                _build_columns, info, first, after
+            )
+        except GraphQLError:
+            raise
+        except Exception as e:
+            logger.error(f"Error al resolver columnsConnection: {str(e)}")
+            return None
+
+    def resolve_cards_connection(self, info, column_id, first=None, after=None):
+        try:
+            return _connection_page(
+                CardConnection,
+                lambda limit, start, fields: db.get_cards_page(column_id, limit, start, fields),
+                _build_cards, info, first, after
+            )
+        except GraphQLError:
+            raise
+        except Exception as e:
+            logger.error(f"Error al resolver cardsConnection: {str(e)}")
+            return None
 
     def resolve_boards(self, info):
         try:
-            return [BoardType(**board) for board in db.get_boards()]
+            boards = get_boards(db, fields=requested_attributes(info))
+            # Registrar todos los boards para cargar sus columnas en un solo lote
+            get_loaders(info, db).columns.queue(board['id'] for board in boards)
+            return [BoardType(**without_layout_keys(board)) for board in boards]
         except Exception as e:
             logger.error(f"Error al resolver boards: {str(e)}")
             return []
 
     def resolve_columns(self, info, board_id):
         try:
-            return [ColumnType(**column) for column in db.get_columns(board_id)]
+            loaders = get_loaders(info, db)
+            loaders.select(
+                columns=requested_attributes(info),
+                cards=requested_attributes(info, 'cards')
+            )
+            return _then(loaders.columns.load(board_id), _build_columns, 'columns')
         except Exception as e:
             logger.error(f"Error al resolver columns: {str(e)}")
             return []
 
     def resolve_cards(self, info, column_id):
         try:
-            return [CardType(**card) for card in db.get_cards(column_id)]
+            cards = db.get_cards(column_id, fields=requested_attributes(info))
+            for card in cards:
+                if 'column_id' in card:
+                    card['columnId'] = card.pop('column_id')
+            return [CardType(**without_layout_keys(card)) for card in cards]
         except Exception as e:
             logger.error(f"Error al resolver cards: {str(e)}")
             return []
@@ -93,15 +259,11 @@ class CreateBoard(graphene.Mutation):
         try:
             logger.info(f"Intentando crear board con name={name}, type={type}")
             board_id = db.create_board(name, type)
+            board_cache.invalidate_board_list()
             logger.info(f"Board creado con ID: {board_id}")
             
             # Obtener el tablero específico que acabamos de crear
-            response = db.table.get_item(
-                Key={
-                    'id': board_id
-                }
-            )
-            board_data = response.get('Item')
+            board_data = db.get_board(board_id)
             
             if not board_data:
                 error_msg = f"No se pudo encontrar el board con ID {board_id}"
@@ -117,7 +279,7 @@ class CreateBoard(graphene.Mutation):
                 'created_at': board_data['created_at'],
                 'updated_at': board_data['updated_at']
             }
-            return CreateBoard(board=BoardType(**board))
+            return CreateBoard(board=BoardType(**without_layout_keys(board)))
         except Exception as e:
             error_msg = f"Error al crear board: {str(e)}"
             logger.error(error_msg)
@@ -133,8 +295,10 @@ class UpdateBoard(graphene.Mutation):
 
     def mutate(self, info, id, name):
         try:
+            board_cache.invalidate_board(id)
+            board_cache.invalidate_board_list()
             board = db.get_boards()[0]
-            return UpdateBoard(board=BoardType(**board))
+            return UpdateBoard(board=BoardType(**without_layout_keys(board)))
         except Exception as e:
             logger.error(f"Error al actualizar board: {str(e)}")
             return UpdateBoard(error=str(e))
@@ -148,6 +312,8 @@ class DeleteBoard(graphene.Mutation):
 
     def mutate(self, info, id):
         try:
+            board_cache.invalidate_board(id)
+            board_cache.invalidate_board_list()
             return DeleteBoard(success=True)
         except Exception as e:
             logger.error(f"Error al eliminar board: {str(e)}")
@@ -165,8 +331,12 @@ class CreateColumn(graphene.Mutation):
     def mutate(self, info, boardId, name, order=None):
         try:
             column_id = db.create_column(boardId, name, order)
-            column = db.get_columns(boardId)[-1]
-            return CreateColumn(column=ColumnType(**column))
+            board_cache.invalidate_board(boardId)
+            board_cache.invalidate_board_list()
+            column = next(col for col in db.get_columns(boardId) if col['id'] == column_id)
+            return CreateColumn(column=ColumnType(**without_layout_keys(column)))
+        except ConcurrentModificationError as e:
+            raise ConflictError(e)
         except Exception as e:
             logger.error(f"Error al crear column: {str(e)}")
             return CreateColumn(error=str(e))
@@ -182,8 +352,9 @@ class UpdateColumn(graphene.Mutation):
 
     def mutate(self, info, id, name, order=None):
         try:
+            board_cache.invalidate_column(id)
             column = db.get_columns(id)[0]
-            return UpdateColumn(column=ColumnType(**column))
+            return UpdateColumn(column=ColumnType(**without_layout_keys(column)))
         except Exception as e:
             logger.error(f"Error al actualizar column: {str(e)}")
             return UpdateColumn(error=str(e))
@@ -198,10 +369,17 @@ class DeleteColumn(graphene.Mutation):
 
     def mutate(self, info, columnId):
         try:
-            success = db.delete_column(columnId)
+            try:
+                success = db.delete_column(columnId)
+            finally:
+                # Puede haber escrito parte de los lotes aunque falle
+                board_cache.invalidate_column(columnId)
+                board_cache.invalidate_board_list()
             if not success:
                 return DeleteColumn(success=False, error="No se pudo eliminar la columna")
             return DeleteColumn(success=True, columnId=columnId)
+        except ConcurrentModificationError as e:
+            raise ConflictError(e)
         except Exception as e:
             logger.error(f"Error al eliminar columna: {str(e)}")
             return DeleteColumn(success=False, error=str(e))
@@ -219,19 +397,14 @@ class CreateCard(graphene.Mutation):
     def mutate(self, info, columnId, title, description=None, order=None):
         try:
             card_id = db.create_card(columnId, title, description, order)
+            board_cache.invalidate_column(columnId)
             if not card_id:
                 error_msg = "No se pudo crear la tarjeta"
                 logger.error(error_msg)
                 return CreateCard(error=error_msg)
             
             # Obtener la tarjeta recién creada
-            response = db.table.get_item(
-                Key={
-                    'id': card_id,
-                    'type': 'card'
-                }
-            )
-            card_data = response.get('Item')
+            card_data = db.get_card(card_id)
             
             if not card_data:
                 error_msg = f"No se pudo encontrar la tarjeta con ID {card_id}"
@@ -243,7 +416,9 @@ class CreateCard(graphene.Mutation):
             if 'column_id' in card_data:
                 card_data['columnId'] = card_data['column_id']
                 del card_data['column_id']
-            return CreateCard(card=CardType(**card_data))
+            return CreateCard(card=CardType(**without_layout_keys(card_data)))
+        except ConcurrentModificationError as e:
+            raise ConflictError(e)
         except Exception as e:
             error_msg = f"Error al crear tarjeta: {str(e)}"
             logger.error(error_msg)
@@ -261,13 +436,16 @@ class UpdateCard(graphene.Mutation):
     def mutate(self, info, id, title, description=None):
         try:
             updated_card = db.update_card(id, title, description)
+            board_cache.invalidate_card(id)
             if not updated_card:
                 return UpdateCard(error="No se pudo actualizar la tarjeta")
             # Convertir column_id a columnId
             if 'column_id' in updated_card:
                 updated_card['columnId'] = updated_card['column_id']
                 del updated_card['column_id']
-            return UpdateCard(card=CardType(**updated_card))
+            return UpdateCard(card=CardType(**without_layout_keys(updated_card)))
+        except ConcurrentModificationError as e:
+            raise ConflictError(e)
         except Exception as e:
             logger.error(f"Error al actualizar card: {str(e)}")
             return UpdateCard(error=str(e))
@@ -282,7 +460,10 @@ class DeleteCard(graphene.Mutation):
     def mutate(self, info, id):
         try:
             success = db.delete_card(id)
+            board_cache.invalidate_card(id)
             return DeleteCard(success=success)
+        except ConcurrentModificationError as e:
+            raise ConflictError(e)
         except Exception as e:
             logger.error(f"Error al eliminar card: {str(e)}")
             return DeleteCard(success=False, error=str(e))
@@ -301,6 +482,9 @@ class MoveCard(graphene.Mutation):
         try:
             logger.info(f"Intentando mover tarjeta: cardId={cardId}, columnId={columnId}, cardOrder={cardOrder}")
             updated_card = db.move_card(str(cardId), str(columnId), int(cardOrder))
+            # Tablero de origen y de destino
+            board_cache.invalidate_card(cardId)
+            board_cache.invalidate_column(columnId)
             
             if not updated_card:
                 return MoveCard(success=False, message="No se pudo mover la tarjeta")
@@ -317,10 +501,12 @@ class MoveCard(graphene.Mutation):
             }
             
             return MoveCard(
-                card=CardType(**card_data),
+                card=CardType(**without_layout_keys(card_data)),
                 success=True,
                 message="Tarjeta movida exitosamente"
             )
+        except ConcurrentModificationError as e:
+            raise ConflictError(e)
         except Exception as e:
             logger.error(f"Error en mutación MoveCard: {str(e)}")
             return MoveCard(success=False, message=str(e))
@@ -336,6 +522,8 @@ class MoveColumn(graphene.Mutation):
     def mutate(self, info, columnId, order):
         try:
             updated_column = db.move_column(columnId, order)
+            board_cache.invalidate_column(columnId)
+            board_cache.invalidate_board_list()
             if not updated_column:
                 error_msg = f"No se pudo mover la columna con ID {columnId}"
                 logger.error(error_msg)
@@ -343,19 +531,31 @@ class MoveColumn(graphene.Mutation):
             
             logger.info(f"Columna movida: {updated_column}")
             return MoveColumn(success=True)
+        except ConcurrentModificationError as e:
+            raise ConflictError(e)
         except Exception as e:
             error_msg = f"Error al mover columna: {str(e)}"
             logger.error(error_msg)
             return MoveColumn(success=False, error=error_msg)
 
 class FixCardOrders(graphene.Mutation):
+    # Solo un tablero por petición; la tabla completa se repara fuera de la
+    # API con `python manage.py repair_card_orders`
+    class Arguments:
+        boardId = graphene.ID(required=True)
+
     success = graphene.Boolean()
     error = graphene.String()
 
-    def mutate(self, info):
+    def mutate(self, info, boardId):
         try:
-            db.fix_card_orders()
+            try:
+                db.fix_card_orders(boardId)
+            finally:
+                board_cache.invalidate_board(boardId)
             return FixCardOrders(success=True)
+        except ConcurrentModificationError as e:
+            raise ConflictError(e)
         except Exception as e:
             error_msg = f"Error al arreglar el orden de las tarjetas: {str(e)}"
             logger.error(error_msg)
@@ -41,7 +41,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'graphene_django',
     'corsheaders',
-    'boards',
+    'kanban_backend.boards',
 ]
 
 MIDDLEWARE = [
@@ -73,24 +73,113 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'kanban_backend.wsgi.application'
+ASGI_APPLICATION = 'kanban_backend.asgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.dummy',
+# Almacenamiento de tableros: 'dynamodb', 'orm' (la base de datos de Django,
+# SQLite en modo WAL por defecto) o 'memory' (en proceso, sin I/O; para tests y
+# micro-benchmarks). Ver kanban_backend/boards/repository.py
+BOARD_STORAGE_BACKEND = os.getenv('BOARD_STORAGE_BACKEND', 'dynamodb')
+
+if BOARD_STORAGE_BACKEND == 'orm':
+    # Las tablas se crean con ``python manage.py migrate``
+    BOARD_DATABASE_ENGINE = os.getenv('BOARD_DATABASE_ENGINE', 'django.db.backends.sqlite3')
+    DATABASES = {
+        'default': {
+            'ENGINE': BOARD_DATABASE_ENGINE,
+            'NAME': os.getenv('BOARD_DATABASE_NAME', str(BASE_DIR / 'kanban.sqlite3')),
+            'USER': os.getenv('BOARD_DATABASE_USER', ''),
+            'PASSWORD': os.getenv('BOARD_DATABASE_PASSWORD', ''),
+            'HOST': os.getenv('BOARD_DATABASE_HOST', ''),
+            'PORT': os.getenv('BOARD_DATABASE_PORT', ''),
+            'CONN_MAX_AGE': int(os.getenv('BOARD_DATABASE_CONN_MAX_AGE', '60')),
+            # SQLite: segundos de espera si otra escritura tiene la base de datos bloqueada
+            'OPTIONS': {'timeout': 20} if BOARD_DATABASE_ENGINE.endswith('sqlite3') else {},
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.dummy',
+        }
     }
-}
 
 # DynamoDB settings
-DYNAMODB_TABLE_NAME = 'kanban_board'
+DYNAMODB_TABLE_NAME = os.getenv('DYNAMODB_TABLE_NAME', 'kanban_board')
 DYNAMODB_REGION = os.getenv('AWS_DEFAULT_REGION', 'us-west-2')
 DYNAMODB_ENDPOINT_URL = os.getenv('DYNAMODB_ENDPOINT', 'http://localhost:8002')
 DYNAMODB_ACCESS_KEY_ID = os.getenv('AWS_ACCESS_KEY_ID', 'local')
 DYNAMODB_SECRET_ACCESS_KEY = os.getenv('AWS_SECRET_ACCESS_KEY', 'local')
 
+# Cliente de DynamoDB compartido por proceso (kanban_backend/boards/connection.py)
+DYNAMODB_MAX_POOL_CONNECTIONS = int(os.getenv('DYNAMODB_MAX_POOL_CONNECTIONS', '50'))
+DYNAMODB_CONNECT_TIMEOUT = float(os.getenv('DYNAMODB_CONNECT_TIMEOUT', '2'))
+DYNAMODB_READ_TIMEOUT = float(os.getenv('DYNAMODB_READ_TIMEOUT', '5'))
+DYNAMODB_TCP_KEEPALIVE = os.getenv('DYNAMODB_TCP_KEEPALIVE', 'True') == 'True'
+# 'standard' o 'adaptive' (este último limita la tasa en el cliente ante throttling)
+DYNAMODB_RETRY_MODE = os.getenv('DYNAMODB_RETRY_MODE', 'standard')
+DYNAMODB_MAX_ATTEMPTS = int(os.getenv('DYNAMODB_MAX_ATTEMPTS', '5'))
+# Queries concurrentes por nivel del árbol y reintentos por conflicto de versión
+DYNAMODB_MAX_PARALLEL_QUERIES = int(os.getenv('DYNAMODB_MAX_PARALLEL_QUERIES', '10'))
+DYNAMODB_CONFLICT_RETRIES = int(os.getenv('DYNAMODB_CONFLICT_RETRIES', '3'))
+# Items por página al recorrer un Query (0: lo que quepa en 1 MB)
+DYNAMODB_PAGE_SIZE = int(os.getenv('DYNAMODB_PAGE_SIZE', '1000'))
+# Lectura de tableros: 'index' (un Query por nivel) o 'partition' (un Query por
+# tablero sobre BoardItemsIndex; requiere ``manage.py migrate_board_layout``)
+DYNAMODB_BOARD_LAYOUT = os.getenv('DYNAMODB_BOARD_LAYOUT', 'index')
+# Instantánea comprimida de cada tablero, mantenida en cada escritura y leída
+# con un solo GetItem (``manage.py rebuild_board_snapshots`` la genera)
+DYNAMODB_BOARD_SNAPSHOTS = os.getenv('DYNAMODB_BOARD_SNAPSHOTS', 'False') == 'True'
+# Días que se conservan las lápidas de borrado para los backups incrementales
+# (deben cubrir el intervalo entre dos backups completos)
+DYNAMODB_TOMBSTONE_TTL_DAYS = int(os.getenv('DYNAMODB_TOMBSTONE_TTL_DAYS', '35'))
+# Hilos del endpoint GraphQL asíncrono (llamadas a DynamoDB en vuelo por proceso)
+DYNAMODB_ASYNC_WORKERS = int(os.getenv('DYNAMODB_ASYNC_WORKERS', '50'))
+# Las peticiones GraphQL con esta cabecera reciben en ``extensions.dynamodb`` las
+# llamadas a DynamoDB que han hecho; las demás las registran en una línea de log
+# (kanban_backend.boards.accounting). Vacía: nunca se devuelven en la respuesta
+DYNAMODB_ACCOUNTING_HEADER = os.getenv('DYNAMODB_ACCOUNTING_HEADER', 'X-Debug-DynamoDB')
+
+# Sirve /graphql/ con la vista asíncrona (pensado para ASGI); /graphql/async/
+# está siempre disponible
+GRAPHQL_ASYNC_VIEW = os.getenv('GRAPHQL_ASYNC_VIEW', 'False') == 'True'
+
+# Segundo nivel compartido entre workers (kanban_backend/boards/shared_cache.py).
+# Necesita un backend que vean todos los procesos (Redis, Memcached o, con
+# varios procesos en una máquina, FileBasedCache con una ruta en
+# BOARD_SHARED_CACHE_LOCATION): está desactivado salvo que se indique
+# BOARD_SHARED_CACHE_BACKEND o BOARD_SHARED_CACHE_ALIAS. Con LocMemCache cada
+# proceso tendría el suyo y `manage.py check` lo avisa (boards.W001).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'boards': {
+        'BACKEND': os.getenv('BOARD_SHARED_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('BOARD_SHARED_CACHE_LOCATION', 'kanban-boards'),
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+BOARD_SHARED_CACHE_ALIAS = os.getenv(
+    'BOARD_SHARED_CACHE_ALIAS', 'boards' if os.getenv('BOARD_SHARED_CACHE_BACKEND') else ''
+)
+# Segundos en los que una entrada es fresca y, después, en los que aún puede
+# servirse mientras un único worker la recarga en segundo plano
+BOARD_SHARED_CACHE_TTL = float(os.getenv('BOARD_SHARED_CACHE_TTL', '30'))
+BOARD_SHARED_CACHE_STALE_TTL = float(os.getenv('BOARD_SHARED_CACHE_STALE_TTL', '300'))
+
+# Caché en proceso de tableros montados (kanban_backend/boards/cache.py);
+# BOARD_CACHE_TTL=0 la desactiva. Cada worker solo ve sus propias
+# invalidaciones: sin el nivel compartido, con varios workers la recarga del
+# frontend tras una mutación podría servir el tablero anterior durante todo el
+# TTL. Por eso solo está activa por defecto con el nivel compartido, y
+# `manage.py check` avisa si se activa sin él (boards.W002).
+BOARD_CACHE_MAX_ENTRIES = int(os.getenv('BOARD_CACHE_MAX_ENTRIES', '256'))
+BOARD_CACHE_TTL = float(os.getenv('BOARD_CACHE_TTL', '30' if BOARD_SHARED_CACHE_ALIAS else '0'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
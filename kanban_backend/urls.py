@@ -21,10 +21,13 @@ from graphene_django.views import GraphQLView
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.http import JsonResponse
+from django.conf import settings
 import logging
 import json
+from .boards import accounting
 from .schema import schema
 from .health.views import HealthCheckView
+from .async_graphql import AsyncGraphQLView
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +62,17 @@ class LoggingGraphQLView(GraphQLView):
                 'errors': [{'message': str(e)}]
             }, status=400)
 
+    def get_response(self, request, data, show_graphiql=False):
+        # Llamadas a DynamoDB de la operación: en extensions con la cabecera
+        # de depuración, o en una línea de log
+        with accounting.track() as calls:
+            response = super().get_response(request, data, show_graphiql)
+        accounting.log_request(request, calls, data.get('operationName') if isinstance(data, dict) else None)
+        return response
+
+    def json_encode(self, request, d, pretty=False):
+        return super().json_encode(request, accounting.extend_response(request, d), pretty)
+
 @require_http_methods(["GET", "POST"])
 def graphql_view(request):
     try:
@@ -82,9 +96,15 @@ def graphql_view(request):
 def redirect_to_graphql(request):
     return redirect('/graphql/')
 
+if settings.GRAPHQL_ASYNC_VIEW:
+    graphql_endpoint = csrf_exempt(AsyncGraphQLView.as_view())
+else:
+    graphql_endpoint = csrf_exempt(LoggingGraphQLView.as_view(graphiql=True, schema=schema))
+
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('graphql', csrf_exempt(LoggingGraphQLView.as_view(graphiql=True, schema=schema))),
-    path('graphql/', csrf_exempt(LoggingGraphQLView.as_view(graphiql=True, schema=schema))),
+    path('graphql', graphql_endpoint),
+    path('graphql/', graphql_endpoint),
+    path('graphql/async/', csrf_exempt(AsyncGraphQLView.as_view())),
     path('health/', HealthCheckView.as_view(), name='health_check'),
 ]
@@ -1,94 +1,428 @@
 import boto3
 from botocore.config import Config
+import argparse
+import base64
+import gzip
+import hashlib
 import json
-from datetime import datetime
 import os
-from decimal import Decimal
+import queue
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super(DecimalEncoder, self).default(obj)
+TABLE_NAME = os.getenv('DYNAMODB_TABLE_NAME', 'kanban_board')
+BACKUP_DIR = 'backups'
+BACKUP_PREFIX = 'dynamodb_backup_'
+FORMAT = 'dynamodb-json-lines+gzip'
 
-def backup_dynamodb():
-    # Configurar el cliente de DynamoDB
-    dynamodb = boto3.resource(
+# Páginas en vuelo entre los Scans y el escritor: la memoria queda acotada a
+# QUEUE_PAGES * page_size elementos sea cual sea el tamaño de la tabla
+QUEUE_PAGES = 16
+
+# Backups incrementales (ver kanban_backend/boards/changes.py; estos valores
+# deben coincidir con los de allí)
+CHANGES_INDEX = 'ChangesIndex'
+CHANGE_SHARDS = 8
+TOMBSTONE_TYPE = 'tombstone'
+
+# Solape con el backup anterior: cubre la diferencia de reloj entre los
+# servidores y el retraso del índice. Repetir un cambio no tiene efecto.
+OVERLAP = timedelta(minutes=5)
+
+# Límite de claves por llamada a BatchGetItem
+BATCH_GET_MAX_KEYS = 100
+
+
+def get_client():
+    # Configurar el cliente de DynamoDB (los valores por defecto son los de DynamoDB Local)
+    return boto3.client(
         'dynamodb',
-        endpoint_url='http://localhost:8002',
-        region_name='us-west-2',
-        aws_access_key_id='fakeMyKeyId',
-        aws_secret_access_key='fakeSecretAccessKey',
+        endpoint_url=os.getenv('DYNAMODB_ENDPOINT', 'http://localhost:8002'),
+        region_name=os.getenv('AWS_DEFAULT_REGION', 'us-west-2'),
+        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', 'fakeMyKeyId'),
+        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', 'fakeSecretAccessKey'),
         config=Config(
             retries=dict(
-                max_attempts=10
-            )
+                max_attempts=10,
+                mode='adaptive'
+            ),
+            max_pool_connections=64
         )
     )
-    
-    # Obtener la tabla
-    table = dynamodb.Table('kanban_board')
-    
-    # Escanear todos los elementos
-    response = table.scan()
-    items = response.get('Items', [])
-    
+
+
+def encode_item(item):
+    """
+    Convierte un item en formato DynamoDB JSON (el del cliente de bajo nivel)
+    en algo serializable: los binarios van en base64, como en las
+    exportaciones de DynamoDB. Así se conservan tipos y precisión.
+    """
+    encoded = {}
+    for name, value in item.items():
+        (kind, data), = value.items()
+        if kind == 'B':
+            data = base64.b64encode(data).decode('ascii')
+        elif kind == 'BS':
+            data = [base64.b64encode(entry).decode('ascii') for entry in data]
+        elif kind == 'M':
+            data = encode_item(data)
+        elif kind == 'L':
+            data = [encode_item({'_': entry})['_'] for entry in data]
+        encoded[name] = {kind: data}
+    return encoded
+
+
+def decode_item(item):
+    """Inverso de encode_item: listo para PutItem / BatchWriteItem."""
+    decoded = {}
+    for name, value in item.items():
+        (kind, data), = value.items()
+        if kind == 'B':
+            data = base64.b64decode(data)
+        elif kind == 'BS':
+            data = [base64.b64decode(entry) for entry in data]
+        elif kind == 'M':
+            data = decode_item(data)
+        elif kind == 'L':
+            data = [decode_item({'_': entry})['_'] for entry in data]
+        decoded[name] = {kind: data}
+    return decoded
+
+
+def item_type(item):
+    return item.get('type', {}).get('S', 'desconocido')
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def manifest_path(data_file):
+    return data_file[:-len('.ndjson.gz')] + '.manifest.json'
+
+
+def list_manifests(backup_dir=BACKUP_DIR):
+    """Manifiestos de los backups de ``backup_dir``, del más antiguo al más reciente."""
+    if not os.path.exists(backup_dir):
+        return []
+    manifests = []
+    for name in os.listdir(backup_dir):
+        if name.startswith(BACKUP_PREFIX) and name.endswith('.manifest.json'):
+            with open(os.path.join(backup_dir, name)) as f:
+                manifests.append(json.load(f))
+    return sorted(manifests, key=lambda manifest: manifest['started_at'])
+
+
+def read_manifest(data_file):
+    path = manifest_path(data_file)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_manifest(data_file, manifest):
+    with open(manifest_path(data_file), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+
+class Progress:
+    """Contador compartido que se imprime como mucho una vez por segundo."""
+
+    def __init__(self, label):
+        self.label = label
+        self.count = 0
+        self._printed = 0
+        self._lock = threading.Lock()
+
+    def add(self, count):
+        with self._lock:
+            self.count += count
+            now = time.monotonic()
+            if now - self._printed >= 1:
+                self._printed = now
+                print(f"\r{self.label}: {self.count}", end='', file=sys.stderr, flush=True)
+
+    def finish(self):
+        print(f"\r{self.label}: {self.count}", file=sys.stderr, flush=True)
+
+
+def scan_pages(client, segments, page_size, scan_kwargs=None):
+    """
+    Genera las páginas de un Scan segmentado en paralelo (un hilo por
+    segmento). Los hilos se detienen si el consumidor se retrasa.
+    """
+    pages = queue.Queue(maxsize=QUEUE_PAGES)
+    finished = object()
+    errors = []
+    stop = threading.Event()
+
+    def put(page):
+        # Si el consumidor ha terminado (p. ej. por un error) no esperar más
+        while not stop.is_set():
+            try:
+                pages.put(page, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def scan_segment(segment):
+        kwargs = {
+            'TableName': TABLE_NAME,
+            'Segment': segment,
+            'TotalSegments': segments,
+            'Limit': page_size,
+            **(scan_kwargs or {})
+        }
+        try:
+            while not errors:
+                response = client.scan(**kwargs)
+                if not put((segment, response.get('Items', []))):
+                    return
+                last_key = response.get('LastEvaluatedKey')
+                if not last_key:
+                    return
+                kwargs['ExclusiveStartKey'] = last_key
+        except Exception as e:
+            errors.append(e)
+        finally:
+            put(finished)
+
+    with ThreadPoolExecutor(max_workers=segments, thread_name_prefix='backup-scan') as executor:
+        for segment in range(segments):
+            executor.submit(scan_segment, segment)
+        try:
+            pending = segments
+            while pending:
+                page = pages.get()
+                if page is finished:
+                    pending -= 1
+                elif not errors:
+                    yield page
+        finally:
+            stop.set()
+    if errors:
+        raise errors[0]
+
+
+def write_backup(client, data_file, segments, page_size, scan_kwargs=None):
+    """
+    Escribe el resultado del Scan en ``data_file`` (una línea ``{"Item": ...}``
+    por elemento, comprimido con gzip). Devuelve el resumen para el manifiesto.
+    """
+    counts = Counter()
+    segment_counts = Counter()
+    content_digest = hashlib.sha256()
+    progress = Progress('Elementos respaldados')
+    try:
+        with gzip.open(data_file, 'wt', encoding='utf-8') as f:
+            for segment, items in scan_pages(client, segments, page_size, scan_kwargs):
+                for item in items:
+                    line = json.dumps({'Item': encode_item(item)}, separators=(',', ':')) + '\n'
+                    f.write(line)
+                    content_digest.update(line.encode('utf-8'))
+                    counts[item_type(item)] += 1
+                segment_counts[segment] += len(items)
+                progress.add(len(items))
+    except BaseException:
+        # No dejar un backup incompleto que parezca válido
+        if os.path.exists(data_file):
+            os.remove(data_file)
+        raise
+    progress.finish()
+    return {
+        'file': os.path.basename(data_file),
+        'format': FORMAT,
+        'item_count': sum(counts.values()),
+        'counts_by_type': dict(counts),
+        'segments': segments,
+        'counts_by_segment': {str(segment): count for segment, count in sorted(segment_counts.items())},
+        'sha256': file_sha256(data_file),
+        'content_sha256': content_digest.hexdigest(),
+        'size_bytes': os.path.getsize(data_file),
+    }
+
+
+def change_buckets(since, until):
+    """Buckets de ChangesIndex (día#shard) entre dos instantes ISO."""
+    day = datetime.fromisoformat(since[:10])
+    last = datetime.fromisoformat(until[:10])
+    buckets = []
+    while day <= last:
+        buckets.extend(f'{day.date().isoformat()}#{shard}' for shard in range(CHANGE_SHARDS))
+        day += timedelta(days=1)
+    return buckets
+
+
+def changed_ids(client, since, until, workers):
+    """
+    Ids de los items escritos desde ``since``, consultando ChangesIndex (solo
+    claves) con un Query por bucket en paralelo. Un item aparece una vez
+    aunque haya cambiado varias veces.
+    """
+    def query_bucket(bucket):
+        ids = []
+        kwargs = {
+            'TableName': TABLE_NAME,
+            'IndexName': CHANGES_INDEX,
+            'KeyConditionExpression': 'change_bucket = :bucket AND changed_at >= :since',
+            'ExpressionAttributeValues': {':bucket': {'S': bucket}, ':since': {'S': since}},
+        }
+        while True:
+            response = client.query(**kwargs)
+            ids.extend(item['id']['S'] for item in response.get('Items', []))
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return ids
+            kwargs['ExclusiveStartKey'] = last_key
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='backup-changes') as executor:
+        buckets = executor.map(query_bucket, change_buckets(since, until))
+        return list(dict.fromkeys(item_id for ids in buckets for item_id in ids))
+
+
+def batch_get(client, ids):
+    """Items de ``ids`` (como mucho BATCH_GET_MAX_KEYS), reintentando las claves no procesadas."""
+    items = []
+    keys = [{'id': {'S': item_id}} for item_id in ids]
+    delay = 0.05
+    while keys:
+        response = client.batch_get_item(RequestItems={TABLE_NAME: {'Keys': keys}})
+        items.extend(response.get('Responses', {}).get(TABLE_NAME, []))
+        keys = response.get('UnprocessedKeys', {}).get(TABLE_NAME, {}).get('Keys', [])
+        if keys:
+            time.sleep(delay)
+            delay = min(delay * 2, 5)
+    return items
+
+
+def write_incremental(client, data_file, since, workers):
+    """
+    Escribe los cambios desde ``since``: una línea ``{"Item": ...}`` por item
+    escrito y ``{"Key": ...}`` por cada lápida (item borrado). Devuelve el
+    resumen para el manifiesto.
+    """
+    ids = changed_ids(client, since, datetime.utcnow().isoformat(), workers)
+    chunks = [ids[start:start + BATCH_GET_MAX_KEYS] for start in range(0, len(ids), BATCH_GET_MAX_KEYS)]
+    counts = Counter()
+    deleted = 0
+    content_digest = hashlib.sha256()
+    progress = Progress('Cambios respaldados')
+    try:
+        with gzip.open(data_file, 'wt', encoding='utf-8') as f, \
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix='backup-get') as executor:
+            # Como mucho ``workers`` lotes leídos por delante del escritor
+            for start in range(0, len(chunks), workers):
+                for items in executor.map(lambda chunk: batch_get(client, chunk), chunks[start:start + workers]):
+                    for item in items:
+                        if item_type(item) == TOMBSTONE_TYPE:
+                            entry = {'Key': {'id': item['item_id']}}
+                            deleted += 1
+                        else:
+                            entry = {'Item': encode_item(item)}
+                            counts[item_type(item)] += 1
+                        line = json.dumps(entry, separators=(',', ':')) + '\n'
+                        f.write(line)
+                        content_digest.update(line.encode('utf-8'))
+                    progress.add(len(items))
+    except BaseException:
+        if os.path.exists(data_file):
+            os.remove(data_file)
+        raise
+    progress.finish()
+    return {
+        'file': os.path.basename(data_file),
+        'format': FORMAT,
+        'item_count': sum(counts.values()),
+        'deleted_count': deleted,
+        'counts_by_type': dict(counts),
+        'sha256': file_sha256(data_file),
+        'content_sha256': content_digest.hexdigest(),
+        'size_bytes': os.path.getsize(data_file),
+    }
+
+
+def backup_dynamodb(segments=4, page_size=1000, backup_dir=BACKUP_DIR, incremental=False):
+    """
+    Backup completo con Scans segmentados en paralelo, escrito en streaming
+    como NDJSON comprimido más un manifiesto con recuentos y checksums.
+
+    Con ``incremental`` solo se guardan los items cambiados (y los borrados)
+    desde el backup más reciente de ``backup_dir``, leídos por ChangesIndex.
+    """
+    client = get_client()
+
     # Crear directorio de backup si no existe
-    backup_dir = 'backups'
     if not os.path.exists(backup_dir):
         os.makedirs(backup_dir)
-    
+
     # Generar nombre de archivo con timestamp
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    backup_file = f'{backup_dir}/dynamodb_backup_{timestamp}.json'
-    
-    # Guardar los datos en un archivo JSON usando el encoder personalizado
-    with open(backup_file, 'w') as f:
-        json.dump(items, f, indent=2, cls=DecimalEncoder)
-    
-    print(f"\nBackup creado exitosamente en: {backup_file}")
-    print(f"Total de elementos respaldados: {len(items)}")
-
-def restore_dynamodb(backup_file):
-    # Configurar el cliente de DynamoDB
-    dynamodb = boto3.resource(
-        'dynamodb',
-        endpoint_url='http://localhost:8002',
-        region_name='us-west-2',
-        aws_access_key_id='fakeMyKeyId',
-        aws_secret_access_key='fakeSecretAccessKey',
-        config=Config(
-            retries=dict(
-                max_attempts=10
-            )
-        )
-    )
-    
-    # Obtener la tabla
-    table = dynamodb.Table('kanban_board')
-    
-    # Leer el archivo de backup
-    with open(backup_file, 'r') as f:
-        items = json.load(f)
-    
-    # Restaurar los elementos
-    for item in items:
-        # Convertir los números float a Decimal para DynamoDB
-        for key, value in item.items():
-            if isinstance(value, float):
-                item[key] = Decimal(str(value))
-        table.put_item(Item=item)
-    
-    print(f"\nRestauración completada desde: {backup_file}")
-    print(f"Total de elementos restaurados: {len(items)}")
+    started = datetime.utcnow()
+    timestamp = started.strftime('%Y%m%d_%H%M%S')
+
+    if incremental:
+        manifests = list_manifests(backup_dir)
+        if not manifests:
+            raise ValueError(f"No hay ningún backup en {backup_dir}: el primero debe ser completo")
+        base = manifests[-1]
+        since = (datetime.fromisoformat(base['started_at']) - OVERLAP).isoformat()
+        data_file = f'{backup_dir}/{BACKUP_PREFIX}{timestamp}.incremental.ndjson.gz'
+        summary = write_incremental(client, data_file, since, segments)
+        chain = {
+            'base': base['file'],
+            'full': base['file'] if base['kind'] == 'full' else base['full'],
+            'since': since,
+        }
+    else:
+        data_file = f'{backup_dir}/{BACKUP_PREFIX}{timestamp}.ndjson.gz'
+        summary = write_backup(client, data_file, segments, page_size)
+        chain = {}
+
+    manifest = {
+        'table': TABLE_NAME,
+        'kind': 'incremental' if incremental else 'full',
+        'started_at': started.isoformat(),
+        'finished_at': datetime.utcnow().isoformat(),
+        **chain,
+        **summary
+    }
+    write_manifest(data_file, manifest)
+
+    print(f"\nBackup {'incremental' if incremental else 'completo'} creado exitosamente en: {data_file}")
+    print(f"Total de elementos respaldados: {manifest['item_count']}")
+    for kind, count in sorted(manifest['counts_by_type'].items()):
+        print(f"- {kind}: {count}")
+    if incremental:
+        print(f"Elementos eliminados: {manifest['deleted_count']}")
+    return data_file
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Backup de la tabla de DynamoDB')
+    parser.add_argument('--restore', metavar='ARCHIVO', help='Restaurar un backup')
+    parser.add_argument('--segments', type=int, default=4,
+                        help='Segmentos (hilos) del Scan paralelo, o hilos de lectura del incremental')
+    parser.add_argument('--page-size', type=int, default=1000, help='Elementos por página de Scan')
+    parser.add_argument('--dir', default=BACKUP_DIR, help='Directorio de los backups')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Guardar solo los cambios desde el último backup del directorio')
+    return parser.parse_args(argv)
+
 
 if __name__ == '__main__':
-    import sys
-    if len(sys.argv) > 1 and sys.argv[1] == '--restore':
-        if len(sys.argv) > 2:
-            restore_dynamodb(sys.argv[2])
-        else:
-            print("Error: Debes especificar el archivo de backup a restaurar")
-            print("Uso: python backup_dynamodb.py --restore <archivo_backup>")
+    args = parse_args(sys.argv[1:])
+    if args.restore:
+        # Misma restauración en paralelo que scripts/restore_dynamodb.py
+        from restore_dynamodb import main as restore_main
+        restore_main([args.restore, '--segments', str(args.segments)])
     else:
-        backup_dynamodb() 
\ No newline at end of file
+        backup_dynamodb(args.segments, args.page_size, args.dir, args.incremental)
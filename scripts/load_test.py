@@ -0,0 +1,604 @@
+"""
+Generador de carga contra el endpoint GraphQL (/graphql/).
+
+Reproduce el tráfico del frontend (frontend/src/components/Board.jsx): cada
+sesión abre el tablero (GET_BOARD) y después hace acciones separadas por un
+tiempo de reflexión; arrastrar una tarjeta es MOVE_CARD seguido de un
+GET_BOARD completo, igual que el refetch de Apollo.
+
+- Bucle abierto (``--rate``): las sesiones llegan a un ritmo fijo o de
+  Poisson, respondan o no las anteriores, así que una saturación del
+  servidor aparece como latencia y cola en lugar de frenar la carga.
+- Bucle cerrado (``--users``): N usuarios que repiten acciones sin parar.
+
+Las peticiones las hacen ``--concurrency`` hilos con conexiones keep-alive;
+un planificador les entrega cada paso cuando toca. La latencia se mide desde
+que se envía la petición y la espera en cola (``queue``) desde el instante
+previsto, para no ocultar la saturación del propio generador. Los
+histogramas son logarítmicos (40 cubetas por década, error < 6%) y de
+tamaño fijo.
+
+Uso:
+    python scripts/load_test.py --rate 20 --duration 300 --think exponential --think-mean 5
+    python scripts/load_test.py --users 200 --duration 120 --output load.json
+"""
+import argparse
+import heapq
+import http.client
+import json
+import math
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from urllib.parse import urlsplit
+
+# Documentos del frontend (frontend/src/graphql/queries.js)
+GET_BOARD = '''
+query GetBoard {
+  boards {
+    id type name
+    columns {
+      id type name order
+      cards { id type title description order columnId }
+    }
+  }
+}
+'''
+MOVE_CARD = '''
+mutation MoveCard($cardId: String!, $columnId: String!, $cardOrder: Int!) {
+  moveCard(cardId: $cardId, columnId: $columnId, cardOrder: $cardOrder) { success message }
+}
+'''
+CREATE_CARD = '''
+mutation CreateCard($columnId: ID!, $title: String!, $description: String, $order: Int) {
+  createCard(columnId: $columnId, title: $title, description: $description, order: $order) {
+    card { id type title description order columnId }
+  }
+}
+'''
+UPDATE_CARD = '''
+mutation UpdateCard($id: ID!, $title: String!, $description: String) {
+  updateCard(id: $id, title: $title, description: $description) {
+    card { id type title description order columnId }
+  }
+}
+'''
+DELETE_CARD = '''
+mutation DeleteCard($id: ID!) {
+  deleteCard(id: $id) { success }
+}
+'''
+
+# Acción -> (operación, documento, campo de la respuesta, refetch de GET_BOARD)
+ACTIONS = {
+    'move_card': ('moveCard', MOVE_CARD, 'moveCard', True),
+    'create_card': ('createCard', CREATE_CARD, 'createCard', False),
+    'update_card': ('updateCard', UPDATE_CARD, 'updateCard', True),
+    'delete_card': ('deleteCard', DELETE_CARD, 'deleteCard', True),
+}
+DEFAULT_MIX = 'move_card=85,update_card=7,create_card=5,delete_card=3'
+THINK_MODELS = ('none', 'constant', 'exponential', 'lognormal')
+PERCENTILES = (50, 90, 95, 99, 99.9)
+
+# Histograma: HISTOGRAM_STEPS cubetas por década entre 10 µs y 1000 s
+HISTOGRAM_MIN_MS = 0.01
+HISTOGRAM_STEPS = 40
+HISTOGRAM_BUCKETS = HISTOGRAM_STEPS * 8
+
+# Granularidad del planificador y del informe de progreso
+SCHEDULER_TICK = 0.005
+PROGRESS_INTERVAL = 5
+
+
+class Histogram:
+    """Histograma logarítmico de latencias en milisegundos, seguro entre hilos."""
+
+    def __init__(self):
+        self.counts = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _bucket(value):
+        if value <= HISTOGRAM_MIN_MS:
+            return 0
+        index = int(math.log10(value / HISTOGRAM_MIN_MS) * HISTOGRAM_STEPS)
+        return min(HISTOGRAM_BUCKETS - 1, index)
+
+    @staticmethod
+    def _upper(index):
+        return HISTOGRAM_MIN_MS * 10 ** ((index + 1) / HISTOGRAM_STEPS)
+
+    def record(self, value):
+        with self._lock:
+            self.counts[self._bucket(value)] += 1
+            self.count += 1
+            self.total += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, p):
+        target = math.ceil(self.count * p / 100)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                return min(self._upper(index), self.max)
+        return self.max
+
+    def summary(self):
+        with self._lock:
+            if not self.count:
+                return {'count': 0}
+            summary = {
+                'count': self.count,
+                'min': round(self.min, 3),
+                'mean': round(self.total / self.count, 3),
+                'max': round(self.max, 3),
+            }
+            summary.update({f'p{p:g}': round(self.percentile(p), 3) for p in PERCENTILES})
+            summary['histogram'] = [
+                [round(self._upper(index), 3), count] for index, count in enumerate(self.counts) if count
+            ]
+            return summary
+
+
+class Metrics:
+    def __init__(self):
+        self.latency = {}
+        self.errors = Counter()
+        self.statuses = Counter()
+        self.error_samples = []
+        self._lock = threading.Lock()
+
+    def histogram(self, name):
+        with self._lock:
+            if name not in self.latency:
+                self.latency[name] = Histogram()
+            return self.latency[name]
+
+    def record(self, name, milliseconds, error=None, status=None):
+        self.histogram(name).record(milliseconds)
+        with self._lock:
+            if status is not None:
+                self.statuses[str(status)] += 1
+            if error:
+                self.errors[name] += 1
+                if len(self.error_samples) < 20:
+                    self.error_samples.append({'operation': name, 'error': error[:300]})
+
+    def requests(self):
+        with self._lock:
+            return sum(self.statuses.values())
+
+
+class Session:
+    """Un usuario con el tablero abierto; ``remaining`` es None en bucle cerrado."""
+
+    def __init__(self, number, board_id, remaining, seed):
+        self.number = number
+        self.board_id = board_id
+        self.remaining = remaining
+        self.rng = random.Random(seed)
+        self.loaded = False
+
+
+class GraphQLClient:
+    """Conexión keep-alive de un hilo al endpoint GraphQL."""
+
+    def __init__(self, url, timeout, headers):
+        parts = urlsplit(url)
+        self.https = parts.scheme == 'https'
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = parts.path or '/'
+        self.timeout = timeout
+        self.headers = {'Content-Type': 'application/json', 'Accept': 'application/json', **headers}
+        self.connection = None
+
+    def _connect(self):
+        connection_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def execute(self, query, variables=None):
+        """Devuelve (estado HTTP, JSON de la respuesta o None)."""
+        body = json.dumps({'query': query, 'variables': variables or {}})
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = self._connect()
+            try:
+                self.connection.request('POST', self.path, body=body, headers=self.headers)
+                response = self.connection.getresponse()
+                content = response.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # Conexión keep-alive cerrada por el servidor: se reintenta una vez
+                self.close()
+                if attempt:
+                    raise
+            except Exception:
+                self.close()
+                raise
+        try:
+            return response.status, json.loads(content)
+        except ValueError:
+            return response.status, None
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ACTIONS:
+            raise ValueError(f"Acción desconocida en --mix: {name} (opciones: {', '.join(ACTIONS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def parse_headers(values):
+    headers = {}
+    for value in values or []:
+        name, _, content = value.partition(':')
+        headers[name.strip()] = content.strip()
+    return headers
+
+
+def board_state(board):
+    """Columnas y tarjetas de un tablero de GET_BOARD (solo ids)."""
+    columns = [column for column in board.get('columns') or [] if column]
+    return {
+        'columns': [column['id'] for column in columns],
+        'cards': {column['id']: [card['id'] for card in column.get('cards') or [] if card] for column in columns},
+    }
+
+
+class LoadTest:
+    def __init__(self, url, rate=None, users=None, duration=60, ramp_up=0, arrivals='poisson',
+                 actions=5, think='exponential', think_mean=3.0, mix=DEFAULT_MIX, concurrency=64,
+                 timeout=30, seed=42, headers=None):
+        if bool(rate) == bool(users):
+            raise ValueError("Indica --rate (bucle abierto) o --users (bucle cerrado)")
+        if think not in THINK_MODELS:
+            raise ValueError(f"Modelo de reflexión inválido: {think} (opciones: {', '.join(THINK_MODELS)})")
+        self.url = url
+        self.rate = rate
+        self.users = users
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.arrivals = arrivals
+        self.actions = max(1, actions)
+        self.think = think
+        self.think_mean = think_mean
+        self.mix = parse_mix(mix) if isinstance(mix, str) else dict(mix)
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.seed = seed
+        self.headers = headers or {}
+        self.rng = random.Random(seed)
+        self.metrics = Metrics()
+        self.boards = {}
+        self.sessions = Counter()
+        self._sessions_lock = threading.Lock()
+        self._heap = []
+        self._heap_lock = threading.Lock()
+        self._ready = queue.Queue()
+        self._stop = threading.Event()
+        self._sequence = 0
+
+    # Tablero
+
+    def discover(self):
+        client = GraphQLClient(self.url, self.timeout, self.headers)
+        try:
+            status, payload = client.execute(GET_BOARD)
+        finally:
+            client.close()
+        if status != 200 or not payload or payload.get('errors'):
+            raise RuntimeError(f"No se pudo leer el tablero (HTTP {status}): {payload and payload.get('errors')}")
+        self.boards = {board['id']: board_state(board) for board in payload['data']['boards'] or []}
+        if not self.boards:
+            raise RuntimeError("No hay tableros: créalos antes con python manage.py seed_boards")
+
+    # Planificación
+
+    def _schedule(self, due, session):
+        with self._heap_lock:
+            self._sequence += 1
+            heapq.heappush(self._heap, (due, self._sequence, session))
+
+    def _think_time(self, rng):
+        if self.think == 'none' or not self.think_mean:
+            return 0
+        if self.think == 'constant':
+            return self.think_mean
+        if self.think == 'exponential':
+            return rng.expovariate(1 / self.think_mean)
+        # Lognormal con sigma 1 y la media pedida: cola larga de pausas
+        return rng.lognormvariate(math.log(self.think_mean) - 0.5, 1.0)
+
+    def _new_session(self, due, remaining):
+        number = self.sessions['started']
+        self.sessions['started'] += 1
+        session = Session(number, self.rng.choice(sorted(self.boards)), remaining, self.rng.getrandbits(64))
+        self._schedule(due, session)
+
+    def _interarrival(self, elapsed):
+        rate = self.rate
+        if self.ramp_up and elapsed < self.ramp_up:
+            rate = self.rate * max(elapsed / self.ramp_up, 0.01)
+        if self.arrivals == 'poisson':
+            return self.rng.expovariate(rate)
+        return 1 / rate
+
+    def run(self):
+        self.discover()
+        workers = [
+            threading.Thread(target=self._worker, name=f'load-{index}', daemon=True)
+            for index in range(self.concurrency)
+        ]
+        for worker in workers:
+            worker.start()
+
+        started = time.monotonic()
+        started_at = datetime.utcnow().isoformat()
+        end = started + self.duration
+        next_arrival = started
+        if self.users:
+            # Bucle cerrado: los usuarios entran repartidos durante la rampa
+            for index in range(self.users):
+                self._new_session(started + self.ramp_up * index / self.users, None)
+            next_arrival = None
+        next_progress = started + PROGRESS_INTERVAL
+
+        while True:
+            now = time.monotonic()
+            if now >= end:
+                break
+            while next_arrival is not None and next_arrival <= now:
+                self._new_session(next_arrival, self.actions)
+                next_arrival += self._interarrival(next_arrival - started)
+            with self._heap_lock:
+                while self._heap and self._heap[0][0] <= now:
+                    due, _, session = heapq.heappop(self._heap)
+                    self._ready.put((due, session))
+            if now >= next_progress:
+                next_progress += PROGRESS_INTERVAL
+                self._print_progress(now - started)
+            time.sleep(SCHEDULER_TICK)
+
+        # Sin más pasos: se esperan las peticiones en curso
+        self._stop.set()
+        for _ in workers:
+            self._ready.put(None)
+        for worker in workers:
+            worker.join(self.timeout + 5)
+        elapsed = time.monotonic() - started
+        return self._report(started_at, elapsed)
+
+    def _print_progress(self, elapsed):
+        requests = self.metrics.requests()
+        errors = sum(self.metrics.errors.values())
+        print(
+            f"{elapsed:.0f} s: {requests} peticiones ({requests / elapsed:.1f}/s), {errors} errores, "
+            f"{self._ready.qsize()} en cola, {self.sessions['started'] - self.sessions['finished']} sesiones activas",
+            file=sys.stderr, flush=True
+        )
+
+    # Ejecución
+
+    def _worker(self):
+        client = GraphQLClient(self.url, self.timeout, self.headers)
+        try:
+            while True:
+                entry = self._ready.get()
+                if entry is None:
+                    return
+                due, session = entry
+                self.metrics.record('queue', (time.monotonic() - due) * 1000)
+                self._step(client, session)
+                if self._stop.is_set():
+                    continue
+                if session.remaining is not None and session.remaining <= 0:
+                    with self._sessions_lock:
+                        self.sessions['finished'] += 1
+                    continue
+                self._schedule(time.monotonic() + self._think_time(session.rng), session)
+        finally:
+            client.close()
+
+    def _step(self, client, session):
+        if not session.loaded:
+            # Al abrir la página el frontend carga todos los tableros
+            session.loaded = self._request(client, 'getBoard', GET_BOARD, 'boards', session) is not None
+            return
+        name = session.rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+        operation, document, field, refetch = ACTIONS[name]
+        variables = self._variables(name, session)
+        if session.remaining is not None:
+            session.remaining -= 1
+        if variables is None:
+            return
+        started = time.perf_counter()
+        payload = self._request(client, operation, document, field, session, variables)
+        ok = payload is not None
+        if ok and refetch:
+            ok = self._request(client, 'getBoard:refetch', GET_BOARD, 'boards', session) is not None
+        self.metrics.record(
+            f'action:{name}', (time.perf_counter() - started) * 1000,
+            error=None if ok else 'acción fallida'
+        )
+        if ok and name == 'create_card':
+            card = payload['card']
+            self.boards[session.board_id]['cards'].setdefault(card['columnId'], []).append(card['id'])
+
+    def _request(self, client, operation, document, field, session, variables=None):
+        """Ejecuta una operación y devuelve su payload, o None si ha fallado."""
+        started = time.perf_counter()
+        status, error, payload = None, None, None
+        try:
+            status, response = client.execute(document, variables)
+            if status != 200 or response is None:
+                error = f'HTTP {status}'
+            elif response.get('errors'):
+                error = str(response['errors'][0].get('message'))
+            else:
+                payload = (response.get('data') or {}).get(field)
+                if payload is None or (isinstance(payload, dict) and (
+                    payload.get('success') is False or payload.get('error')
+                )):
+                    error = str((payload or {}).get('message') or (payload or {}).get('error') or 'sin resultado')
+                    payload = None
+        except Exception as e:
+            error = f'{type(e).__name__}: {e}'
+        self.metrics.record(operation, (time.perf_counter() - started) * 1000, error=error, status=status or 'error')
+        if payload is not None and field == 'boards':
+            # Cada refetch actualiza la vista que usan las siguientes acciones
+            for board in payload:
+                if board and board['id'] == session.board_id:
+                    self.boards[board['id']] = board_state(board)
+        return payload
+
+    def _variables(self, name, session):
+        rng = session.rng
+        board = self.boards.get(session.board_id)
+        if not board or not board['columns']:
+            return None
+        column_id = rng.choice(board['columns'])
+        if name == 'create_card':
+            # Como el frontend: la tarjeta nueva se pide en la posición 0
+            return {
+                'columnId': column_id,
+                'title': f'Carga {uuid.UUID(int=rng.getrandbits(128)).hex[:12]}',
+                'description': '',
+                'order': 0,
+            }
+        filled = [column for column in board['columns'] if board['cards'].get(column)]
+        if not filled:
+            return None
+        source = board['cards'][rng.choice(filled)]
+        card_id = rng.choice(source)
+        if name == 'move_card':
+            return {
+                'cardId': card_id,
+                'columnId': column_id,
+                'cardOrder': rng.randint(0, len(board['cards'].get(column_id, []))),
+            }
+        if name == 'update_card':
+            return {'id': card_id, 'title': f'Editada {uuid.UUID(int=rng.getrandbits(128)).hex[:12]}'}
+        try:
+            source.remove(card_id)
+        except ValueError:
+            pass
+        return {'id': card_id}
+
+    def _report(self, started_at, elapsed):
+        requests = self.metrics.requests()
+        latency = {name: histogram.summary() for name, histogram in sorted(self.metrics.latency.items())}
+        return {
+            'load_test': 'graphql',
+            'url': self.url,
+            'started_at': started_at,
+            'seconds': round(elapsed, 2),
+            'parameters': {
+                'mode': 'closed' if self.users else 'open',
+                'rate': self.rate,
+                'users': self.users,
+                'arrivals': self.arrivals,
+                'duration': self.duration,
+                'ramp_up': self.ramp_up,
+                'actions': self.actions if self.rate else None,
+                'think': self.think,
+                'think_mean': self.think_mean,
+                'mix': self.mix,
+                'concurrency': self.concurrency,
+                'seed': self.seed,
+            },
+            'boards': len(self.boards),
+            'sessions': dict(self.sessions),
+            'requests': requests,
+            'requests_per_second': round(requests / elapsed, 2) if elapsed else None,
+            'errors': dict(self.metrics.errors),
+            'statuses': dict(self.metrics.statuses),
+            'error_samples': self.metrics.error_samples,
+            'latency_ms': latency,
+        }
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Prueba de carga del endpoint GraphQL con tráfico del frontend')
+    parser.add_argument('--url', default='http://localhost:8000/graphql/', help='Endpoint GraphQL')
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--rate', type=float, help='Sesiones nuevas por segundo (bucle abierto)')
+    mode.add_argument('--users', type=int, help='Usuarios simultáneos (bucle cerrado)')
+    parser.add_argument('--duration', type=float, default=60, help='Segundos de carga')
+    parser.add_argument('--ramp-up', type=float, default=0, help='Segundos hasta alcanzar --rate o --users')
+    parser.add_argument('--arrivals', choices=('poisson', 'uniform'), default='poisson',
+                        help='Llegadas de sesiones en bucle abierto')
+    parser.add_argument('--actions', type=int, default=5, help='Acciones por sesión en bucle abierto')
+    parser.add_argument('--think', choices=THINK_MODELS, default='exponential',
+                        help='Modelo del tiempo de reflexión entre acciones')
+    parser.add_argument('--think-mean', type=float, default=3.0, help='Tiempo de reflexión medio (s)')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'Peso de cada acción (por defecto {DEFAULT_MIX})')
+    parser.add_argument('--concurrency', type=int, default=64, help='Peticiones simultáneas como máximo (hilos)')
+    parser.add_argument('--timeout', type=float, default=30, help='Timeout de cada petición (s)')
+    parser.add_argument('--seed', type=int, default=42, help='Semilla de llegadas y acciones')
+    parser.add_argument('--header', action='append', metavar='NOMBRE: VALOR',
+                        help='Cabecera extra en todas las peticiones (se puede repetir)')
+    parser.add_argument('--output', help='Fichero JSON del informe (por defecto, la salida estándar)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    try:
+        report = LoadTest(
+            args.url,
+            rate=args.rate,
+            users=args.users,
+            duration=args.duration,
+            ramp_up=args.ramp_up,
+            arrivals=args.arrivals,
+            actions=args.actions,
+            think=args.think,
+            think_mean=args.think_mean,
+            mix=args.mix,
+            concurrency=args.concurrency,
+            timeout=args.timeout,
+            seed=args.seed,
+            headers=parse_headers(args.header),
+        ).run()
+    except ValueError as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\nPrueba cancelada por el usuario")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error durante la prueba de carga: {str(e)}")
+        sys.exit(1)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+        print(f"Informe guardado en {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
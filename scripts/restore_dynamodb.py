@@ -1,121 +1,504 @@
-import boto3
-from botocore.config import Config
+from boto3.dynamodb.types import TypeSerializer
+import argparse
+import gzip
 import json
-from decimal import Decimal
 import os
+import random
 import sys
-from datetime import datetime
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from backup_dynamodb import (
+    BACKUP_DIR, BACKUP_PREFIX, TABLE_NAME, Progress, decode_item, file_sha256,
+    get_client, list_manifests, read_manifest, scan_pages
+)
+
+# Límite de BatchWriteItem
+BATCH_SIZE = 25
+
+# Reintentos de los elementos no procesados (throttling) antes de abandonar
+MAX_RETRIES = 10
+BASE_BACKOFF = 0.05
+MAX_BACKOFF = 5
+
+# El checkpoint se guarda como mucho cada CHECKPOINT_INTERVAL segundos
+CHECKPOINT_INTERVAL = 1
 
-def list_backups():
+
+def list_backups(backup_dir=BACKUP_DIR):
     """Lista todos los backups disponibles"""
-    backup_dir = 'backups'
     if not os.path.exists(backup_dir):
         print("No existe el directorio de backups")
         return []
-    
-    backups = [f for f in os.listdir(backup_dir) if f.startswith('dynamodb_backup_') and f.endswith('.json')]
+
+    backups = [
+        f for f in os.listdir(backup_dir)
+        if f.startswith(BACKUP_PREFIX) and (f.endswith('.ndjson.gz') or f.endswith('.json'))
+        and not f.endswith('.manifest.json')
+    ]
     backups.sort(reverse=True)  # Ordenar del más reciente al más antiguo
-    
+
     if not backups:
         print("No se encontraron backups")
         return []
-    
+
     print("\nBackups disponibles:")
     for i, backup in enumerate(backups, 1):
         print(f"{i}. {backup}")
     return backups
 
-def restore_backup(backup_file):
-    """Restaura un backup específico"""
-    try:
-        # Configurar el cliente de DynamoDB
-        dynamodb = boto3.resource(
-            'dynamodb',
-            endpoint_url='http://localhost:8002',
-            region_name='us-west-2',
-            aws_access_key_id='fakeMyKeyId',
-            aws_secret_access_key='fakeSecretAccessKey',
-            config=Config(
-                retries=dict(
-                    max_attempts=10
-                )
+
+def iter_backup_requests(backup_file, deletes=False):
+    """
+    Peticiones de BatchWriteItem del backup: las escrituras (``PutRequest``)
+    o, con ``deletes``, los borrados que registra un incremental
+    (``DeleteRequest``). Los backups NDJSON se leen en streaming; los
+    antiguos (un array JSON) se cargan enteros.
+    """
+    if backup_file.endswith('.ndjson.gz'):
+        with gzip.open(backup_file, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if deletes and 'Key' in entry:
+                    yield {'DeleteRequest': {'Key': entry['Key']}}
+                elif not deletes and 'Item' in entry:
+                    yield {'PutRequest': {'Item': decode_item(entry['Item'])}}
+        return
+    if deletes:
+        return
+
+    serializer = TypeSerializer()
+    with open(backup_file, 'r') as f:
+        items = json.load(f, parse_float=Decimal)
+    for item in items:
+        yield {'PutRequest': {'Item': {key: serializer.serialize(value) for key, value in item.items()}}}
+
+
+def verify_backup(backup_file):
+    """Comprueba el checksum del manifiesto, si lo hay."""
+    if not backup_file.endswith('.ndjson.gz'):
+        return None
+    manifest = read_manifest(backup_file)
+    if manifest is None:
+        print("Aviso: el backup no tiene manifiesto, no se puede verificar")
+        return None
+    if file_sha256(backup_file) != manifest['sha256']:
+        raise ValueError(f"El checksum de {backup_file} no coincide con el del manifiesto")
+    return manifest
+
+
+def backup_chain(backup_file):
+    """
+    Backups que hay que aplicar para restaurar ``backup_file``: el completo
+    del que parte y, en orden, los incrementales hasta él.
+    """
+    chain = [backup_file]
+    manifest = read_manifest(backup_file) if backup_file.endswith('.ndjson.gz') else None
+    while manifest is not None and manifest['kind'] == 'incremental':
+        base = os.path.join(os.path.dirname(backup_file), manifest['base'])
+        if not os.path.exists(base):
+            raise ValueError(f"Falta el backup {manifest['base']} de la cadena de {os.path.basename(backup_file)}")
+        chain.insert(0, base)
+        manifest = read_manifest(base)
+    return chain
+
+
+def backup_at(until, backup_dir=BACKUP_DIR):
+    """Último backup (completo o incremental) terminado antes de ``until`` (ISO, UTC)."""
+    manifests = [manifest for manifest in list_manifests(backup_dir) if manifest['finished_at'] <= until]
+    if not manifests:
+        raise ValueError(f"No hay ningún backup en {backup_dir} terminado antes de {until}")
+    return os.path.join(backup_dir, manifests[-1]['file'])
+
+
+class RateLimiter:
+    """
+    Cubeta de fichas compartida por los hilos: limita las unidades de
+    escritura consumidas por segundo. Sin ``rate`` no limita nada.
+    """
+
+    def __init__(self, rate=None):
+        self.rate = rate or None
+        self._lock = threading.Lock()
+        self._tokens = self.rate or 0
+        self._updated = time.monotonic()
+
+    def consume(self, units):
+        if not self.rate or not units:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= units
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+def write_capacity(client):
+    """WCU provisionadas de la tabla, o 0 en modo bajo demanda."""
+    table = client.describe_table(TableName=TABLE_NAME)['Table']
+    if table.get('BillingModeSummary', {}).get('BillingMode') == 'PAY_PER_REQUEST':
+        return 0
+    return table.get('ProvisionedThroughput', {}).get('WriteCapacityUnits', 0)
+
+
+class Checkpoint:
+    """
+    Progreso de una restauración: si la tabla se ha vaciado, qué backup de la
+    cadena se está aplicando (``file``) y cuántas peticiones suyas están ya
+    escritas (todas las anteriores a ``done``).
+    """
+
+    def __init__(self, path, backup_file):
+        self.path = path
+        self.state = {
+            'backup': os.path.basename(backup_file),
+            'cleared': False,
+            'file': 0,
+            'done': 0,
+            'completed': False
+        }
+        self._saved = 0
+
+    @classmethod
+    def load(cls, path, backup_file):
+        checkpoint = cls(path, backup_file)
+        with open(path) as f:
+            state = json.load(f)
+        if state['backup'] != checkpoint.state['backup']:
+            raise ValueError(f"El checkpoint corresponde a {state['backup']}, no a {checkpoint.state['backup']}")
+        checkpoint.state.update(state)
+        return checkpoint
+
+    def update(self, force=False, **values):
+        self.state.update(values)
+        now = time.monotonic()
+        if self.path and (force or now - self._saved >= CHECKPOINT_INTERVAL):
+            self._saved = now
+            # Se escribe aparte y se renombra para no dejar el fichero a medias
+            temporary = f'{self.path}.tmp'
+            with open(temporary, 'w') as f:
+                json.dump(self.state, f)
+            os.replace(temporary, self.path)
+
+
+class BatchWriter:
+    """
+    Reparte peticiones de BatchWriteItem entre un pool de hilos. Los
+    elementos no procesados se reintentan con backoff exponencial y el
+    consumo se limita con ``limiter``.
+    """
+
+    def __init__(self, client, workers=8, limiter=None):
+        self.client = client
+        self.workers = max(1, int(workers))
+        self.limiter = limiter or RateLimiter()
+        self.retries = 0
+
+    def write_all(self, batches, on_done=None):
+        """
+        Escribe los lotes (listas de peticiones) de ``batches`` en paralelo,
+        con como mucho ``2 * workers`` lotes en memoria. ``on_done(n)``
+        recibe el número de lotes consecutivos terminados desde el principio.
+        """
+        slots = threading.BoundedSemaphore(self.workers * 2)
+        lock = threading.Lock()
+        finished = set()
+        errors = []
+        watermark = 0
+
+        def run(index, requests):
+            nonlocal watermark
+            try:
+                if not errors:
+                    self._write_batch(requests)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                slots.release()
+            if errors:
+                return
+            with lock:
+                finished.add(index)
+                advanced = watermark
+                while advanced in finished:
+                    finished.discard(advanced)
+                    advanced += 1
+                if advanced != watermark:
+                    watermark = advanced
+                    if on_done:
+                        on_done(watermark)
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='restore') as executor:
+            for index, requests in enumerate(batches):
+                slots.acquire()
+                if errors:
+                    slots.release()
+                    break
+                executor.submit(run, index, requests)
+        if errors:
+            raise errors[0]
+
+    def _write_batch(self, requests):
+        attempt = 0
+        while requests:
+            response = self.client.batch_write_item(
+                RequestItems={TABLE_NAME: requests},
+                ReturnConsumedCapacity='TOTAL'
             )
+            consumed = sum(entry.get('CapacityUnits', 0) for entry in response.get('ConsumedCapacity', []))
+            self.limiter.consume(consumed or len(requests))
+            requests = response.get('UnprocessedItems', {}).get(TABLE_NAME, [])
+            if not requests:
+                return
+            attempt += 1
+            if attempt > MAX_RETRIES:
+                raise RuntimeError(f"{len(requests)} elementos sin procesar tras {MAX_RETRIES} reintentos")
+            self.retries += 1
+            # Backoff exponencial con jitter: la tabla está limitando escrituras
+            time.sleep(random.uniform(0, min(MAX_BACKOFF, BASE_BACKOFF * 2 ** attempt)))
+
+
+def batched(iterable, size=BATCH_SIZE):
+    batch = []
+    for entry in iterable:
+        batch.append(entry)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def clear_table(client, writer, segments=4):
+    """Borra todos los elementos con un Scan segmentado y paginado."""
+    keys = (
+        {'DeleteRequest': {'Key': {'id': item['id']}}}
+        for _, items in scan_pages(client, segments, 1000, {
+            'ProjectionExpression': '#i',
+            'ExpressionAttributeNames': {'#i': 'id'},
+        })
+        for item in items
+    )
+    progress = Progress('Elementos borrados')
+
+    def count(batch):
+        progress.add(len(batch))
+        return batch
+
+    writer.write_all(count(batch) for batch in batched(keys))
+    progress.finish()
+    return progress.count
+
+
+def restore_file(writer, backup_file, skip=0, on_progress=None):
+    """
+    Aplica un backup: primero todas sus escrituras y después sus borrados,
+    para que un item borrado durante un incremental quede borrado. Las
+    primeras ``skip`` peticiones ya se aplicaron en una ejecución anterior.
+    Devuelve ``(recuentos por tipo, borrados)``.
+    """
+    counts = Counter()
+    deleted = 0
+    progress = Progress(f'Elementos aplicados de {os.path.basename(backup_file)}')
+
+    def report(done):
+        progress.add(done - skip - progress.count)
+        if on_progress:
+            on_progress(done)
+
+    yielded = 0
+
+    def puts():
+        nonlocal yielded
+        for position, request in enumerate(iter_backup_requests(backup_file)):
+            counts[request['PutRequest']['Item'].get('type', {}).get('S', 'desconocido')] += 1
+            if position >= skip:
+                yielded += 1
+                yield request
+
+    # Todos los lotes salvo el último están completos; el último suele ser
+    # parcial, así que el progreso no puede pasar de lo ya generado (si no,
+    # al reanudar se saltarían borrados que nunca se aplicaron)
+    writer.write_all(
+        batched(puts()),
+        lambda batches: report(skip + min(batches * BATCH_SIZE, yielded))
+    )
+    written = sum(counts.values())
+
+    delete_skip = max(0, skip - written)
+    yielded = 0
+
+    def deletes():
+        nonlocal deleted, yielded
+        for position, request in enumerate(iter_backup_requests(backup_file, deletes=True)):
+            deleted += 1
+            if position >= delete_skip:
+                yielded += 1
+                yield request
+
+    writer.write_all(
+        batched(deletes()),
+        lambda batches: report(written + delete_skip + min(batches * BATCH_SIZE, yielded))
+    )
+    progress.add(max(0, written + deleted - skip) - progress.count)
+    progress.finish()
+    return counts, deleted
+
+
+def restore_backup(backup_file, workers=8, segments=4, max_write_units=None, capacity_share=None,
+                   checkpoint_path=None, resume=False, clear=True):
+    """
+    Restaura un backup específico. Si es incremental se aplica antes el
+    backup completo del que parte y los incrementales intermedios.
+    """
+    client = get_client()
+    chain = backup_chain(backup_file)
+    manifests = [verify_backup(path) for path in chain]
+
+    if resume and checkpoint_path and os.path.exists(checkpoint_path):
+        checkpoint = Checkpoint.load(checkpoint_path, backup_file)
+        print(
+            f"Reanudando desde el backup {checkpoint.state['file'] + 1} de {len(chain)}, "
+            f"elemento {checkpoint.state['done']}"
         )
-        
-        # Obtener la tabla
-        table = dynamodb.Table('kanban_board')
-        
-        # Leer el archivo de backup
-        with open(backup_file, 'r') as f:
-            items = json.load(f)
-        
-        # Limpiar la tabla actual
+    else:
+        checkpoint = Checkpoint(checkpoint_path, backup_file)
+
+    rate = max_write_units
+    if capacity_share:
+        wcu = write_capacity(client)
+        rate = wcu * capacity_share if wcu else rate
+    writer = BatchWriter(client, workers, RateLimiter(rate))
+
+    # Limpiar la tabla actual
+    if clear and not checkpoint.state['cleared']:
         print("\nLimpiando tabla actual...")
-        scan = table.scan()
-        with table.batch_writer() as batch:
-            for item in scan['Items']:
-                batch.delete_item(
-                    Key={
-                        'id': item['id'],
-                        'type': item['type']
-                    }
-                )
-        
-        # Restaurar los elementos
-        print("Restaurando elementos...")
-        with table.batch_writer() as batch:
-            for item in items:
-                # Convertir los números float a Decimal para DynamoDB
-                for key, value in item.items():
-                    if isinstance(value, float):
-                        item[key] = Decimal(str(value))
-                batch.put_item(Item=item)
-        
-        print(f"\nRestauración completada exitosamente desde: {backup_file}")
-        print(f"Total de elementos restaurados: {len(items)}")
-        
-        # Mostrar resumen de lo restaurado
-        boards = [item for item in items if item['type'] == 'board']
-        columns = [item for item in items if item['type'] == 'column']
-        cards = [item for item in items if item['type'] == 'card']
-        
-        print("\nResumen de la restauración:")
-        print(f"- Tableros: {len(boards)}")
-        print(f"- Columnas: {len(columns)}")
-        print(f"- Tarjetas: {len(cards)}")
-        
-    except Exception as e:
-        print(f"\nError durante la restauración: {str(e)}")
-        sys.exit(1)
+        clear_table(client, writer, segments)
+        checkpoint.update(force=True, cleared=True)
 
-def main():
-    backups = list_backups()
-    if not backups:
-        return
-    
+    # Restaurar los elementos, saltando los que ya estaban escritos
+    print("Restaurando elementos...")
+    counts = Counter()
+    deleted = 0
+    for index, (path, manifest) in enumerate(zip(chain, manifests)):
+        if index < checkpoint.state['file']:
+            continue
+        if len(chain) > 1:
+            print(f"Aplicando {os.path.basename(path)} ({index + 1} de {len(chain)})")
+        skip = checkpoint.state['done'] if index == checkpoint.state['file'] else 0
+        file_counts, file_deleted = restore_file(
+            writer, path, skip, lambda done: checkpoint.update(done=done)
+        )
+        checkpoint.update(force=True, file=index + 1, done=0)
+
+        written = sum(file_counts.values())
+        if manifest is not None and (
+            manifest['item_count'] != written or manifest.get('deleted_count', 0) != file_deleted
+        ):
+            raise ValueError(
+                f"{os.path.basename(path)}: se leyeron {written} elementos y {file_deleted} borrados, "
+                f"el manifiesto indica {manifest['item_count']} y {manifest.get('deleted_count', 0)}"
+            )
+        counts.update(file_counts)
+        deleted += file_deleted
+
+    checkpoint.update(force=True, completed=True)
+    total = sum(counts.values())
+
+    print(f"\nRestauración completada exitosamente desde: {backup_file}")
+    print(f"Total de elementos restaurados: {total}")
+    if deleted:
+        print(f"Elementos eliminados por los incrementales: {deleted}")
+    if writer.retries:
+        print(f"Reintentos por throttling: {writer.retries}")
+
+    # Mostrar resumen de lo restaurado
+    print("\nResumen de la restauración:")
+    print(f"- Tableros: {counts['board']}")
+    print(f"- Columnas: {counts['column']}")
+    print(f"- Tarjetas: {counts['card']}")
+    return total
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Restaurar un backup de la tabla de DynamoDB')
+    parser.add_argument('backup', nargs='?', help='Backup a restaurar (si no se indica, se pregunta)')
+    parser.add_argument('--until', metavar='FECHA',
+                        help='Restaurar el estado en esa fecha (ISO, UTC): último backup completo '
+                             'o incremental terminado antes')
+    parser.add_argument('--dir', default=BACKUP_DIR, help='Directorio de los backups')
+    parser.add_argument('--workers', type=int, default=8, help='Hilos de escritura')
+    parser.add_argument('--segments', type=int, default=4, help='Segmentos del Scan que vacía la tabla')
+    parser.add_argument('--max-write-units', type=float, help='Máximo de WCU por segundo')
+    parser.add_argument('--capacity-share', type=float,
+                        help='Fracción de las WCU provisionadas a usar (p. ej. 0.5)')
+    parser.add_argument('--checkpoint', default='restore_checkpoint.json', help='Fichero de checkpoint')
+    parser.add_argument('--resume', action='store_true', help='Reanudar desde el checkpoint')
+    parser.add_argument('--keep-existing', action='store_true', help='No vaciar la tabla antes de restaurar')
+    parser.add_argument('--yes', action='store_true', help='No pedir confirmación')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
     try:
-        choice = input("\nSelecciona el número del backup a restaurar (o 'q' para salir): ")
-        if choice.lower() == 'q':
-            return
-        
-        index = int(choice) - 1
-        if index < 0 or index >= len(backups):
-            print("Selección inválida")
-            return
-        
-        backup_file = os.path.join('backups', backups[index])
+        backup_file = args.backup
+        if backup_file is None and args.until:
+            backup_file = backup_at(args.until, args.dir)
+        if backup_file is None:
+            backups = list_backups(args.dir)
+            if not backups:
+                return
+
+            choice = input("\nSelecciona el número del backup a restaurar (o 'q' para salir): ")
+            if choice.lower() == 'q':
+                return
+
+            try:
+                index = int(choice) - 1
+            except ValueError:
+                print("Por favor, ingresa un número válido")
+                return
+            if index < 0 or index >= len(backups):
+                print("Selección inválida")
+                return
+            backup_file = os.path.join(args.dir, backups[index])
+
         print(f"\nRestaurando backup: {backup_file}")
-        
-        confirm = input("¿Estás seguro de que quieres restaurar este backup? (s/n): ")
-        if confirm.lower() == 's':
-            restore_backup(backup_file)
-        else:
-            print("Restauración cancelada")
-    
-    except ValueError:
-        print("Por favor, ingresa un número válido")
+        if not args.yes:
+            confirm = input("¿Estás seguro de que quieres restaurar este backup? (s/n): ")
+            if confirm.lower() != 's':
+                print("Restauración cancelada")
+                return
+
+        restore_backup(
+            backup_file,
+            workers=args.workers,
+            segments=args.segments,
+            max_write_units=args.max_write_units,
+            capacity_share=args.capacity_share,
+            checkpoint_path=args.checkpoint,
+            resume=args.resume,
+            clear=not args.keep_existing
+        )
+
+    except ValueError as e:
+        print(f"\nError: {str(e)}")
+        sys.exit(1)
     except KeyboardInterrupt:
         print("\nOperación cancelada por el usuario")
+    except Exception as e:
+        print(f"\nError durante la restauración: {str(e)}")
+        sys.exit(1)
+
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()